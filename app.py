@@ -1,13 +1,31 @@
 import os
 import logging
 import time
-from flask import Flask, render_template, request, jsonify, flash, redirect, url_for
+from flask import Flask, render_template, request, jsonify, flash, redirect, url_for, Response, stream_with_context
+from flask import current_app, Request
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import DeclarativeBase, joinedload, load_only
 import utils
 import traceback
+import hashlib
+import json
+import base64
+import zipfile
+import tempfile
+import atexit
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from functools import partial
+from audit_log import AuditLogWriter
+from cache import create_cache
+from capture_sessions import (CaptureSessionError, CaptureSessionStore, DatabaseCaptureBackend,
+                              InMemoryCaptureBackend)
+from ocr import OcrCache
+from persistence import save_documents
+from jobs import JobQueue, InMemoryJobBackend, DatabaseJobBackend, serialize_job
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -15,8 +33,41 @@ logging.basicConfig(level=logging.DEBUG)
 class Base(DeclarativeBase):
     pass
 
+class UploadRequest(Request):
+    """Request that keeps uploaded files in memory up to IN_MEMORY_UPLOAD_LIMIT
+    and allows BATCH_MAX_CONTENT_LENGTH bodies on /api/batch-upload
+
+    Werkzeug spools every multipart part over 500KB to a temporary file, so
+    uploads meant to be extracted from memory would be written to disk and
+    read back first.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=current_app.config['IN_MEMORY_UPLOAD_LIMIT'], mode='rb+')
+
+    # set by a view whose streamed response reads the uploaded files after the
+    # view returns (the request is closed then) and closes them itself
+    keep_files = False
+
+    def close(self):
+        if not self.keep_files:
+            super().close()
+
+    @property
+    def max_content_length(self):
+        # applied here rather than in the view: CSRFProtect parses the form in
+        # before_request, so a limit set by the view would come too late
+        if self._max_content_length is None and self.endpoint == 'batch_upload':
+            return current_app.config['BATCH_MAX_CONTENT_LENGTH']
+        return super().max_content_length
+
+    @max_content_length.setter
+    def max_content_length(self, value):
+        self._max_content_length = value
+
 # Create Flask app
 app = Flask(__name__)
+app.request_class = UploadRequest
 
 # Secret must be provided via environment for security
 SESSION_SECRET = os.environ.get("SESSION_SECRET")
@@ -75,10 +126,12 @@ MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
 # security / privacy config
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
+# uploads up to this size are extracted from memory; larger ones are spilled to UPLOAD_FOLDER
+app.config['IN_MEMORY_UPLOAD_LIMIT'] = int(os.environ.get("IN_MEMORY_UPLOAD_LIMIT", str(8 * 1024 * 1024)))
 
 # control storage of original document text
 # if true, text is encrypted using a Fernet key, otherwise original_text is purged
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 app.config['ENCRYPT_ORIGINAL_TEXT'] = os.environ.get("ENCRYPT_ORIGINAL_TEXT", "false").lower() == "true"
 app.config['ORIGINAL_TEXT_KEY'] = os.environ.get("ORIGINAL_TEXT_KEY")
 
@@ -87,6 +140,77 @@ app.config['SESSION_TIMEOUT_MINUTES'] = int(os.environ.get("SESSION_TIMEOUT_MINU
 app.permanent_session_lifetime = timedelta(minutes=app.config['SESSION_TIMEOUT_MINUTES'])
 login_manager.session_protection = "strong"
 
+# gunicorn worker processes (gunicorn reads the same variable); state that clients come back
+# for (async upload jobs, capture sessions) must live in the database when there is more than one
+app.config['WEB_CONCURRENCY'] = int(os.environ.get("WEB_CONCURRENCY", "1"))
+
+# asynchronous upload processing (opt-in)
+# ASYNC_UPLOADS makes /upload queue a job by default; clients can also send async=true per request
+app.config['ASYNC_UPLOADS'] = os.environ.get("ASYNC_UPLOADS", "false").lower() == "true"
+# 'memory' keeps job state per process, 'database' shares it across gunicorn workers and is the
+# default when WEB_CONCURRENCY is above 1; async uploads are refused with 'memory' and several workers
+app.config['JOB_BACKEND'] = os.environ.get(
+    "JOB_BACKEND", "database" if app.config['WEB_CONCURRENCY'] > 1 else "memory").lower()
+app.config['JOB_WORKERS'] = int(os.environ.get("JOB_WORKERS", "2"))
+# finished jobs (and their results) are kept this long by the memory backend, at most JOB_MAX_RECORDS of them
+app.config['JOB_RESULT_TTL'] = int(os.environ.get("JOB_RESULT_TTL", "3600"))  # seconds
+app.config['JOB_MAX_RECORDS'] = int(os.environ.get("JOB_MAX_RECORDS", "1000"))
+# running jobs are marked alive this often; pending/running jobs not updated for JOB_STALE_AFTER
+# are reported as failed (their worker died)
+app.config['JOB_HEARTBEAT_INTERVAL'] = float(os.environ.get("JOB_HEARTBEAT_INTERVAL", "60"))  # seconds
+app.config['JOB_STALE_AFTER'] = int(os.environ.get("JOB_STALE_AFTER", "600"))  # seconds
+
+# batch uploads (/api/batch-upload)
+app.config['BATCH_MAX_FILES'] = int(os.environ.get("BATCH_MAX_FILES", "50"))
+app.config['BATCH_MAX_CONTENT_LENGTH'] = int(os.environ.get("BATCH_MAX_CONTENT_LENGTH", str(100 * 1024 * 1024)))
+app.config['BATCH_WORKERS'] = int(os.environ.get("BATCH_WORKERS", "4"))
+
+# evaluation dashboard lists this many recent evaluations next to the aggregate stats
+app.config['EVALUATION_DASHBOARD_SIZE'] = int(os.environ.get("EVALUATION_DASHBOARD_SIZE", "50"))
+
+# /api/history page size (?limit=) and its upper bound
+app.config['HISTORY_PAGE_SIZE'] = int(os.environ.get("HISTORY_PAGE_SIZE", "50"))
+app.config['HISTORY_MAX_PAGE_SIZE'] = int(os.environ.get("HISTORY_MAX_PAGE_SIZE", "200"))
+
+# result cache for repeated uploads, keyed by a hash of the uploaded bytes
+# 'memory' is per process; 'redis' (uses REDIS_URL) is shared by all workers
+app.config['RESULT_CACHE_BACKEND'] = os.environ.get("RESULT_CACHE_BACKEND", "memory").lower()
+app.config['RESULT_CACHE_SIZE'] = int(os.environ.get("RESULT_CACHE_SIZE", "256"))
+app.config['RESULT_CACHE_TTL'] = int(os.environ.get("RESULT_CACHE_TTL", "86400"))  # seconds
+app.config['EVALUATION_STATS_CACHE_TTL'] = int(os.environ.get("EVALUATION_STATS_CACHE_TTL", "3600"))  # seconds
+
+# clause explanations, cached by normalized clause text (same backend as the result cache)
+app.config['EXPLAIN_CACHE_SIZE'] = int(os.environ.get("EXPLAIN_CACHE_SIZE", "1024"))
+app.config['EXPLAIN_CACHE_TTL'] = int(os.environ.get("EXPLAIN_CACHE_TTL", "86400"))  # seconds
+app.config['EXPLAIN_BATCH_MAX_CLAUSES'] = int(os.environ.get("EXPLAIN_BATCH_MAX_CLAUSES", "100"))
+
+# multi-page camera capture sessions (/api/capture-sessions); pages are OCR'd in the background
+# as they arrive, sessions idle for CAPTURE_SESSION_TTL seconds are dropped.
+# 'memory' keeps sessions per process, 'database' shares them (and page text) across gunicorn
+# workers and is the default when WEB_CONCURRENCY is above 1
+app.config['CAPTURE_SESSION_BACKEND'] = os.environ.get(
+    "CAPTURE_SESSION_BACKEND", "database" if app.config['WEB_CONCURRENCY'] > 1 else "memory").lower()
+app.config['CAPTURE_SESSION_MAX_PAGES'] = int(os.environ.get("CAPTURE_SESSION_MAX_PAGES", "50"))
+app.config['CAPTURE_SESSION_TTL'] = int(os.environ.get("CAPTURE_SESSION_TTL", "1800"))  # seconds
+app.config['CAPTURE_OCR_WORKERS'] = int(os.environ.get("CAPTURE_OCR_WORKERS", "2"))
+# a page whose OCR has not finished after this long is reported as failed (its worker died)
+app.config['CAPTURE_PAGE_STALE_AFTER'] = int(os.environ.get("CAPTURE_PAGE_STALE_AFTER", "600"))  # seconds
+
+# camera OCR text, cached by perceptual hash of the capture; near-identical frames from the
+# same user within OCR_DEDUP_WINDOW seconds (at most OCR_DEDUP_MAX_DISTANCE differing bits
+# of the 1024-bit hash) reuse the text too
+app.config['OCR_CACHE_SIZE'] = int(os.environ.get("OCR_CACHE_SIZE", "256"))
+app.config['OCR_CACHE_TTL'] = int(os.environ.get("OCR_CACHE_TTL", "3600"))  # seconds
+app.config['OCR_DEDUP_WINDOW'] = float(os.environ.get("OCR_DEDUP_WINDOW", "10"))  # seconds, 0 disables
+app.config['OCR_DEDUP_MAX_DISTANCE'] = int(os.environ.get("OCR_DEDUP_MAX_DISTANCE", "120"))
+
+# ProcessingLog rows are buffered and written in batches by a background thread
+app.config['AUDIT_LOG_BATCH_SIZE'] = int(os.environ.get("AUDIT_LOG_BATCH_SIZE", "50"))
+app.config['AUDIT_LOG_FLUSH_INTERVAL'] = float(os.environ.get("AUDIT_LOG_FLUSH_INTERVAL", "2.0"))  # seconds
+app.config['AUDIT_LOG_MAX_QUEUE'] = int(os.environ.get("AUDIT_LOG_MAX_QUEUE", "10000"))
+# a batch whose write fails is retried on this many later flushes before it is dropped
+app.config['AUDIT_LOG_RETRIES'] = int(os.environ.get("AUDIT_LOG_RETRIES", "3"))
+
 # Ensure upload folder exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
@@ -99,7 +223,8 @@ def inject_user():
 with app.app_context():
     # Import and create models
     from models import create_models
-    User, Document, KeyClause, ProcessingLog, DocumentEvaluation, ClauseEvaluation = create_models(db)
+    (User, Document, KeyClause, ProcessingLog, DocumentEvaluation, ClauseEvaluation, ProcessingJob,
+     CaptureSession, CapturePage) = create_models(db)
     
     # Make models globally available
     globals()['User'] = User
@@ -108,34 +233,114 @@ with app.app_context():
     globals()['ProcessingLog'] = ProcessingLog
     globals()['DocumentEvaluation'] = DocumentEvaluation
     globals()['ClauseEvaluation'] = ClauseEvaluation
+    globals()['ProcessingJob'] = ProcessingJob
+    globals()['CaptureSession'] = CaptureSession
+    globals()['CapturePage'] = CapturePage
     
     db.create_all()
+    # create_all skips existing tables, so add indexes introduced since they were created
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(db.engine, checkfirst=True)
+            except Exception as e:
+                logging.warning(f"Could not create index {index.name}: {e}")
     logging.info("Database tables created successfully")
 
+# Background job queue for asynchronous uploads
+if app.config['JOB_BACKEND'] == 'database':
+    job_backend = DatabaseJobBackend(db, ProcessingJob, app, stale_after=app.config['JOB_STALE_AFTER'])
+    try:
+        stale_jobs = job_backend.fail_stale_jobs()
+        if stale_jobs:
+            logging.warning(f"Marked {stale_jobs} interrupted job(s) as failed")
+    except Exception as e:
+        logging.warning(f"Could not check for interrupted jobs: {e}")
+else:
+    job_backend = InMemoryJobBackend(ttl=app.config['JOB_RESULT_TTL'], max_jobs=app.config['JOB_MAX_RECORDS'])
+    if app.config['WEB_CONCURRENCY'] > 1:
+        logging.warning("JOB_BACKEND=memory with several workers: async uploads are processed synchronously")
+job_queue = JobQueue(job_backend, max_workers=app.config['JOB_WORKERS'], app=app,
+                     heartbeat_interval=app.config['JOB_HEARTBEAT_INTERVAL'])
+
+# Cache of summary + key clauses for previously processed uploads
+result_cache = create_cache(
+    app.config['RESULT_CACHE_BACKEND'], 'legalease:result',
+    max_entries=app.config['RESULT_CACHE_SIZE'],
+    ttl=app.config['RESULT_CACHE_TTL'],
+    redis_url=os.environ.get('REDIS_URL')
+)
+
+# Aggregated evaluation metrics, keyed by the newest evaluation id (see evaluation_stats)
+evaluation_stats_cache = create_cache(
+    app.config['RESULT_CACHE_BACKEND'], 'legalease:evaluation-stats',
+    max_entries=32,
+    ttl=app.config['EVALUATION_STATS_CACHE_TTL'],
+    redis_url=os.environ.get('REDIS_URL')
+)
+
+# Clause analyses for /explain and /api/explain-batch, keyed by a hash of the normalized clause text
+explain_cache = create_cache(
+    app.config['RESULT_CACHE_BACKEND'], 'legalease:explain',
+    max_entries=app.config['EXPLAIN_CACHE_SIZE'],
+    ttl=app.config['EXPLAIN_CACHE_TTL'],
+    redis_url=os.environ.get('REDIS_URL')
+)
+
+# OCR text of camera captures (see extract_camera_text)
+ocr_cache = OcrCache(
+    create_cache(
+        app.config['RESULT_CACHE_BACKEND'], 'legalease:ocr',
+        max_entries=app.config['OCR_CACHE_SIZE'],
+        ttl=app.config['OCR_CACHE_TTL'],
+        redis_url=os.environ.get('REDIS_URL')
+    ),
+    window=app.config['OCR_DEDUP_WINDOW'],
+    max_distance=app.config['OCR_DEDUP_MAX_DISTANCE']
+)
+
+# Processing logs are written off the request path on the writer's own connection
+with app.app_context():
+    audit_log = AuditLogWriter(
+        db.engine, ProcessingLog.__table__,
+        batch_size=app.config['AUDIT_LOG_BATCH_SIZE'],
+        flush_interval=app.config['AUDIT_LOG_FLUSH_INTERVAL'],
+        max_queue=app.config['AUDIT_LOG_MAX_QUEUE'],
+        retries=app.config['AUDIT_LOG_RETRIES']
+    )
+atexit.register(audit_log.shutdown)
+
 def allowed_file(filename):
     """Check if file has an allowed extension"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def log_action(action, status, ip_address, error_message=None, document_id=None, file_name=None):
+def log_entry(action, status, ip_address, error_message=None, document_id=None, file_name=None, user_id=None):
+    """Build the column values of a ProcessingLog row"""
+    # attach user if available (background jobs pass user_id explicitly)
+    if user_id is None and current_user and hasattr(current_user, 'id'):
+        user_id = current_user.id
+    return {
+        'user_id': user_id,
+        'document_id': document_id,
+        'file_name': file_name,
+        'action': action,
+        'status': status,
+        'error_message': error_message,
+        'timestamp': datetime.now(timezone.utc),
+        'ip_address': ip_address
+    }
+
+def log_entries(entries, document_id=None):
+    """Queue log entries for the audit log writer, filling in a missing document_id"""
+    for entry in entries:
+        if document_id is not None and entry['document_id'] is None:
+            entry = {**entry, 'document_id': document_id}
+        audit_log.write(entry)
+
+def log_action(action, status, ip_address, error_message=None, document_id=None, file_name=None, user_id=None):
     """Log processing activities to database"""
-    try:
-        kwargs = {
-            'document_id': document_id,
-            'file_name': file_name,
-            'action': action,
-            'status': status,
-            'error_message': error_message,
-            'ip_address': ip_address
-        }
-        # attach user if available
-        if current_user and hasattr(current_user, 'id'):
-            kwargs['user_id'] = current_user.id
-        log_entry = ProcessingLog(**kwargs)
-        db.session.add(log_entry)
-        db.session.commit()
-    except Exception as e:
-        logging.error(f"Failed to log action: {str(e)}")
+    log_entries([log_entry(action, status, ip_address, error_message, document_id, file_name, user_id)])
 
 @app.route('/')
 @app.route('/index')  # ensure main UI is reachable
@@ -149,6 +354,202 @@ def index():
 def home():
     return "LegalEase is running!"
 
+def async_uploads_available():
+    """Job polls can reach any worker, so a process-local job backend only works with one"""
+    return app.config['JOB_BACKEND'] == 'database' or app.config['WEB_CONCURRENCY'] <= 1
+
+def wants_async_upload():
+    """Per-request async flag overrides the ASYNC_UPLOADS default; without a job backend the
+    polls can reach (see async_uploads_available), uploads are processed synchronously"""
+    if not async_uploads_available():
+        return False
+    flag = request.form.get('async') or request.args.get('async')
+    if flag is None:
+        return app.config['ASYNC_UPLOADS']
+    return flag.lower() in ('1', 'true', 'yes')
+
+def upload_cache_key(file=None, captured_image=None, data=None):
+    """sha256 of the uploaded bytes (or of the camera capture: data URL string, bytes or stream)"""
+    if isinstance(captured_image, str):
+        data = captured_image.encode()
+    elif isinstance(captured_image, bytes):
+        data = captured_image
+    elif captured_image is not None:
+        file = captured_image
+
+    digest = hashlib.sha256()
+    if data is not None:
+        digest.update(data)
+    else:
+        stream = getattr(file, 'stream', file)
+        for chunk in iter(lambda: stream.read(64 * 1024), b''):
+            digest.update(chunk)
+        stream.seek(0)
+    return digest.hexdigest()
+
+def request_camera_image():
+    """The camera capture sent with this request, or None.
+
+    A multipart file part named `captured_image` is returned as its upload
+    stream and an `application/octet-stream` or `image/*` body as bytes;
+    both reach PIL without base64 or extra copies. The legacy base64 data
+    URL (`captured_image` form or JSON field) is returned as a string.
+    """
+    upload = request.files.get('captured_image')
+    if upload:
+        return upload.stream
+    if request.mimetype == 'application/octet-stream' or request.mimetype.startswith('image/'):
+        return request.get_data(cache=False) or None
+    data = request.get_json(silent=True) if request.is_json else request.form
+    return data.get('captured_image') or None if isinstance(data, dict) else None
+
+def detached_camera_image(captured_image):
+    """A capture that stays valid after the request ends (streams are read into bytes)"""
+    return captured_image.read() if hasattr(captured_image, 'read') else captured_image
+
+def extract_camera_text(captured_image, user_id):
+    """OCR a camera capture, reusing the text of identical or near-identical recent captures"""
+    return utils.extract_text_from_image(captured_image, ocr_cache=ocr_cache, cache_scope=user_id)
+
+# Multi-page camera captures; pages are OCR'd with extract_camera_text as they arrive
+if app.config['CAPTURE_SESSION_BACKEND'] == 'database':
+    capture_backend = DatabaseCaptureBackend(db, CaptureSession, CapturePage, app)
+else:
+    capture_backend = InMemoryCaptureBackend()
+capture_sessions = CaptureSessionStore(
+    extract_camera_text,
+    backend=capture_backend,
+    max_workers=app.config['CAPTURE_OCR_WORKERS'],
+    max_pages=app.config['CAPTURE_SESSION_MAX_PAGES'],
+    ttl=app.config['CAPTURE_SESSION_TTL'],
+    stale_after=app.config['CAPTURE_PAGE_STALE_AFTER']
+)
+
+def summarize_and_store(extracted, filename, file_type, file_size, user_id, ip_address, start_time,
+                        report_progress=None, cache_key=None, logs=()):
+    """Summarize an extracted document, save it with its clauses and build the upload response"""
+    if report_progress:
+        report_progress(50, 'summarize')
+
+    result = summarize_text(extracted, cache_key=cache_key)
+
+    if report_progress:
+        report_progress(80, 'store')
+
+    return store_document(result, result['stored_text'], filename, file_type, file_size, user_id, ip_address,
+                          time.time() - start_time, logs=logs)
+
+def summarize_text(extracted, cache_key=None):
+    """Summarize an extracted document and prepare the stored copy; the result is what the result cache holds
+
+    `extracted` holds summarize_legal_document() arguments: the 'text' and
+    whatever extraction already computed (see utils.extract_document).
+    """
+    extracted_text = extracted['text']
+    summary_data = utils.summarize_legal_document(**extracted)
+
+    # Encrypt or purge original text
+    if app.config.get('ENCRYPT_ORIGINAL_TEXT'):
+        from cryptography.fernet import Fernet
+        key = app.config.get('ORIGINAL_TEXT_KEY')
+        cipher = Fernet(key.encode() if isinstance(key, str) else key)
+        stored_text = cipher.encrypt(extracted_text.encode()).decode()
+    else:
+        stored_text = None
+
+    result = {
+        'summary': summary_data['summary'],
+        'key_clauses': summary_data.get('key_clauses', []),
+        'stored_text': stored_text
+    }
+    # section provenance of chunked (very long document) summaries
+    for key in ('sections', 'summary_sources'):
+        if key in summary_data:
+            result[key] = summary_data[key]
+    if cache_key:
+        result_cache.set(cache_key, result)
+    return result
+
+def store_document(summary_data, stored_text, filename, file_type, file_size, user_id, ip_address, processing_time,
+                   logs=()):
+    """Save a document and its key clauses in one transaction, queue its processing logs
+    and return the upload response"""
+    clauses_response = [
+        {
+            "type": clause_data['type'],
+            "content": clause_data['content'],
+            "explanation": clause_data.get('explanation', ''),
+            **({"source": clause_data['source']} if 'source' in clause_data else {})
+        }
+        for clause_data in summary_data.get('key_clauses', [])
+    ]
+
+    document_id, = save_documents(db.session, Document, KeyClause, [{
+        'document': {
+            'user_id': user_id,
+            'filename': filename,
+            'file_type': file_type,
+            'file_size': file_size,
+            'original_text': stored_text,
+            'summary': summary_data['summary'],
+            'processing_time': processing_time
+        },
+        'clauses': [
+            {'clause_type': clause['type'], 'content': clause['content'], 'explanation': clause['explanation']}
+            for clause in clauses_response
+        ]
+    }])
+    log_entries(list(logs) + [log_entry('summarize', 'success', ip_address, user_id=user_id)], document_id)
+
+    return {
+        "success": True,
+        "document_id": document_id,
+        "filename": filename,
+        "summary": summary_data['summary'],
+        "key_clauses": clauses_response,
+        "processing_time": processing_time,
+        **{key: summary_data[key] for key in ('sections', 'summary_sources') if key in summary_data}
+    }
+
+def run_upload_job(report_progress, filename, file_type, file_size, user_id, ip_address, start_time,
+                   filepath=None, file_data=None, captured_image=None, cache_key=None):
+    """Background job: extract text from an upload (in memory or spilled to disk) or camera image,
+    then summarize and store it"""
+    report_progress(10, 'extract')
+    try:
+        if captured_image:
+            extracted = {'text': extract_camera_text(captured_image, user_id)}
+        else:
+            extracted = utils.extract_document(filepath if file_data is None else file_data, filename)
+    except Exception as e:
+        log_action('extract_text', 'error', ip_address, str(e), file_name=filename, user_id=user_id)
+        raise
+    finally:
+        if filepath and os.path.exists(filepath):
+            os.remove(filepath)
+
+    if not extracted['text'].strip():
+        raise ValueError("No readable text found in file.")
+
+    return summarize_and_store(extracted, filename, file_type, file_size, user_id, ip_address,
+                               start_time, report_progress=report_progress, cache_key=cache_key)
+
+def cached_upload_response(cached, filename, file_type, file_size, start_time, logs=()):
+    """Store a document from a cached result without extracting or summarizing again"""
+    response_data = store_document(cached, cached.get('stored_text'), filename, file_type, file_size,
+                                   current_user.id, request.remote_addr, time.time() - start_time, logs=logs)
+    response_data['cached'] = True
+    return jsonify(response_data)
+
+def queued_upload_response(job_id):
+    """202 response pointing the client at the job status endpoint"""
+    return jsonify({
+        "success": True,
+        "job_id": job_id,
+        "status": "pending",
+        "status_url": url_for('api_job_status', job_id=job_id)
+    }), 202
+
 @app.route('/upload', methods=['POST'])
 @login_required
 @limiter.limit("5 per minute")
@@ -157,7 +558,7 @@ def upload():
 
     try:
         file = request.files.get("file")
-        captured_image = request.form.get("captured_image")
+        captured_image = request_camera_image()
 
         if not file and not captured_image:
             return jsonify({
@@ -165,25 +566,41 @@ def upload():
                 "error": "No file provided"
             }), 400
 
+        use_async = wants_async_upload()
+        pending_logs = []
+
         # -----------------------------
         # CAMERA CAPTURE PROCESSING
         # -----------------------------
         if captured_image:
+            filename = "camera_capture.jpg"
+            file_type = "image"
+            file_size = utils.image_data_size(captured_image)
+
+            cache_key = upload_cache_key(captured_image=captured_image)
+            cached = result_cache.get(cache_key)
+            if cached is not None:
+                return cached_upload_response(cached, filename, file_type, file_size, start_time)
+
+            if use_async:
+                job_id = job_queue.submit(
+                    run_upload_job, filename, file_type, file_size, current_user.id, request.remote_addr,
+                    start_time, captured_image=detached_camera_image(captured_image), cache_key=cache_key,
+                    user_id=current_user.id, filename=filename
+                )
+                return queued_upload_response(job_id)
+
             try:
                 logging.info("Processing camera capture")
 
-                extracted_text = utils.extract_text_from_image(captured_image)
+                extracted = {'text': extract_camera_text(captured_image, current_user.id)}
 
-                if not extracted_text.strip():
+                if not extracted['text'].strip():
                     return jsonify({
                         "success": False,
                         "error": "No text could be extracted from the image."
                     }), 400
 
-                filename = "camera_capture.jpg"
-                file_type = "image"
-                file_size = len(captured_image)
-
             except Exception as e:
                 logging.error(f"Error extracting text from image: {str(e)}")
                 log_action('extract_text', 'error', request.remote_addr, str(e), file_name="camera_capture.jpg")
@@ -210,20 +627,46 @@ def upload():
                 }), 400
 
             filename = secure_filename(file.filename)
-            unique_name = f"{int(time.time())}_{os.urandom(8).hex()}_{filename}"
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_name)
+            file_type = filename.rsplit('.', 1)[1].lower()
 
-            try:
-                file.save(filepath)
+            # small uploads are processed straight from memory, larger ones are spilled to disk
+            file_size = file.stream.seek(0, os.SEEK_END)
+            file.stream.seek(0)
+            file_data = file.stream.read() if file_size <= app.config['IN_MEMORY_UPLOAD_LIMIT'] else None
 
-                file_size = os.path.getsize(filepath)
-                file_type = filename.rsplit('.', 1)[1].lower()
+            cache_key = upload_cache_key(file=file, data=file_data)
+            # written together with the document (or with the error below)
+            pending_logs = [log_entry('upload', 'success', request.remote_addr, file_name=filename)]
 
-                log_action('upload', 'success', request.remote_addr, file_name=filename)
+            cached = result_cache.get(cache_key)
+            if cached is not None:
+                return cached_upload_response(cached, filename, file_type, file_size, start_time, logs=pending_logs)
 
-                extracted_text = utils.extract_text_from_file(filepath)
+            filepath = None
+            queued = False
 
-                if not extracted_text.strip():
+            try:
+                if file_data is None:
+                    unique_name = f"{int(time.time())}_{os.urandom(8).hex()}_{filename}"
+                    filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_name)
+                    file.save(filepath)
+
+                if use_async:
+                    # the job owns the upload (and any spilled file) from here and removes it when done
+                    job_id = job_queue.submit(
+                        run_upload_job, filename, file_type, file_size, current_user.id, request.remote_addr,
+                        start_time, filepath=filepath, file_data=file_data, cache_key=cache_key,
+                        user_id=current_user.id, filename=filename
+                    )
+                    queued = True
+                    # logged once the job exists; a failed submit is logged with its error below
+                    log_entries(pending_logs)
+                    return queued_upload_response(job_id)
+
+                extracted = utils.extract_document(filepath if file_data is None else file_data, filename)
+
+                if not extracted['text'].strip():
+                    log_entries(pending_logs)
                     return jsonify({
                         "success": False,
                         "error": "No readable text found in file."
@@ -231,7 +674,9 @@ def upload():
 
             except Exception as e:
                 logging.error(f"Error extracting text: {str(e)}")
-                log_action('extract_text', 'error', request.remote_addr, str(e), file_name=filename)
+                log_entries(pending_logs + [
+                    log_entry('extract_text', 'error', request.remote_addr, str(e), file_name=filename)
+                ])
 
                 return jsonify({
                     "success": False,
@@ -239,72 +684,22 @@ def upload():
                 }), 500
 
             finally:
-                if os.path.exists(filepath):
+                if not queued and filepath and os.path.exists(filepath):
                     os.remove(filepath)
 
         # -----------------------------
         # AI SUMMARY GENERATION
         # -----------------------------
         try:
-            summary_data = utils.summarize_legal_document(extracted_text)
-            processing_time = time.time() - start_time
-
-            # Encrypt or purge original text
-            if app.config.get('ENCRYPT_ORIGINAL_TEXT'):
-                from cryptography.fernet import Fernet
-                key = app.config.get('ORIGINAL_TEXT_KEY')
-                cipher = Fernet(key.encode() if isinstance(key, str) else key)
-                stored_text = cipher.encrypt(extracted_text.encode()).decode()
-            else:
-                stored_text = None
-
-            # Save document
-            document = Document(
-                user_id=current_user.id,
-                filename=filename,
-                file_type=file_type,
-                file_size=file_size,
-                original_text=stored_text,
-                summary=summary_data['summary'],
-                processing_time=processing_time
+            response_data = summarize_and_store(
+                extracted, filename, file_type, file_size, current_user.id, request.remote_addr, start_time,
+                cache_key=cache_key, logs=pending_logs
             )
 
-            db.session.add(document)
-            db.session.commit()
-            document_id = document.id
-
-            # Save clauses
-            clauses_response = []
-            for clause_data in summary_data.get('key_clauses', []):
-                clause = KeyClause(
-                    document_id=document_id,
-                    clause_type=clause_data['type'],
-                    content=clause_data['content'],
-                    explanation=clause_data.get('explanation', '')
-                )
-                db.session.add(clause)
-
-                clauses_response.append({
-                    "type": clause_data['type'],
-                    "content": clause_data['content'],
-                    "explanation": clause_data.get('explanation', '')
-                })
-
-            db.session.commit()
-
-            log_action('summarize', 'success', request.remote_addr, document_id=document_id)
-
             # -----------------------------
             # FINAL JSON RESPONSE
             # -----------------------------
-            return jsonify({
-                "success": True,
-                "document_id": document_id,
-                "filename": filename,
-                "summary": summary_data['summary'],
-                "key_clauses": clauses_response,
-                "processing_time": processing_time
-            })
+            return jsonify(response_data)
 
         except Exception as e:
             traceback.print_exc()
@@ -327,6 +722,235 @@ def upload():
         }), 500
 
 
+def collect_batch_files(files, max_files, resources):
+    """(filename, read) for every supported document in the request, unpacking zip archives.
+
+    Nothing is read here: read() returns the document's bytes (None when it is
+    over MAX_CONTENT_LENGTH) and is called by the batch worker, so only the
+    documents being processed are held in memory. Opened archives are entered
+    on the resources ExitStack and must stay open until the workers are done.
+    Stops once more than max_files documents were found.
+    """
+    items = []
+    for file in files:
+        if len(items) > max_files:
+            break
+        if not file or file.filename == '':
+            continue
+        if file.filename.lower().endswith('.zip'):
+            archive = resources.enter_context(zipfile.ZipFile(file.stream))
+            for info in archive.infolist():
+                if len(items) > max_files:
+                    break
+                if info.is_dir() or not allowed_file(info.filename):
+                    continue
+                filename = secure_filename(os.path.basename(info.filename))
+                if info.file_size > app.config['MAX_CONTENT_LENGTH']:
+                    items.append((filename, lambda: None))
+                else:
+                    # ZipFile serializes reads of the shared archive stream, so workers can read members concurrently
+                    items.append((filename, partial(archive.read, info)))
+        else:
+            items.append((secure_filename(file.filename), file.read))
+    return items
+
+def process_batch_item(filename, read):
+    """Worker for /api/batch-upload: read, extract and summarize one document from memory"""
+    start_time = time.time()
+    if not allowed_file(filename):
+        raise ValueError("File type not supported. Upload PDF, DOCX, or TXT.")
+    data = read()
+    if data is None:
+        raise ValueError("File too large. Max size 16MB.")
+
+    cache_key = upload_cache_key(data=data)
+    result = result_cache.get(cache_key)
+    cached = result is not None
+    if not cached:
+        extracted = utils.extract_document(data, filename)
+        if not extracted['text'].strip():
+            raise ValueError("No readable text found in file.")
+        result = summarize_text(extracted, cache_key=cache_key)
+
+    return {
+        'result': result,
+        'file_size': len(data),
+        'cached': cached,
+        'processing_time': time.time() - start_time
+    }
+
+def store_batch_documents(user_id, ip_address, completed):
+    """Insert all documents and clauses of a batch in one transaction and queue their upload logs"""
+    entries = []
+    for filename, item in completed:
+        result = item['result']
+        entries.append({
+            'document': {
+                'user_id': user_id,
+                'filename': filename,
+                'file_type': filename.rsplit('.', 1)[1].lower(),
+                'file_size': item['file_size'],
+                'original_text': result['stored_text'],
+                'summary': result['summary'],
+                'processing_time': item['processing_time']
+            },
+            'clauses': [
+                {
+                    'clause_type': clause_data['type'],
+                    'content': clause_data['content'],
+                    'explanation': clause_data.get('explanation', '')
+                }
+                for clause_data in result['key_clauses']
+            ]
+        })
+
+    document_ids = save_documents(db.session, Document, KeyClause, entries)
+    for document_id, (filename, _) in zip(document_ids, completed):
+        log_entries([log_entry('batch_upload', 'success', ip_address, file_name=filename, user_id=user_id)],
+                    document_id)
+    return document_ids
+
+def batch_too_large():
+    return jsonify({
+        "success": False,
+        "error": "Batch too large."
+    }), 413
+
+@app.route('/api/batch-upload', methods=['POST'])
+@login_required
+@limiter.limit("2 per minute")
+def batch_upload():
+    """Process many documents (or a zip of them) and stream per-file results as NDJSON"""
+    # the request body limit is BATCH_MAX_CONTENT_LENGTH here, see UploadRequest
+    resources = ExitStack()
+    try:
+        # the files are read by the workers while the response streams, after the request is closed
+        for _, file in request.files.items(multi=True):
+            resources.callback(file.close)
+        request.keep_files = True
+        items = collect_batch_files(request.files.getlist('files'), app.config['BATCH_MAX_FILES'], resources)
+    except RequestEntityTooLarge:
+        resources.close()
+        return batch_too_large()
+    except zipfile.BadZipFile:
+        resources.close()
+        return jsonify({
+            "success": False,
+            "error": "Invalid zip archive."
+        }), 400
+
+    if not items:
+        resources.close()
+        return jsonify({
+            "success": False,
+            "error": "No supported files provided"
+        }), 400
+
+    if len(items) > app.config['BATCH_MAX_FILES']:
+        resources.close()
+        return jsonify({
+            "success": False,
+            "error": f"Too many files. Max {app.config['BATCH_MAX_FILES']} per batch."
+        }), 400
+
+    user_id = current_user.id
+    ip_address = request.remote_addr
+
+    def generate():
+        completed = []
+        failed = 0
+        workers = min(app.config['BATCH_WORKERS'], len(items))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='legalease-batch') as pool:
+            futures = {
+                pool.submit(process_batch_item, filename, read): (index, filename)
+                for index, (filename, read) in enumerate(items)
+            }
+            for future in as_completed(futures):
+                index, filename = futures[future]
+                try:
+                    item = future.result()
+                except Exception as e:
+                    failed += 1
+                    logging.error(f"Batch item {filename} failed: {str(e)}")
+                    yield json.dumps({"index": index, "filename": filename, "success": False, "error": str(e)}) + "\n"
+                    continue
+
+                completed.append((filename, item))
+                result = item['result']
+                yield json.dumps({
+                    "index": index,
+                    "filename": filename,
+                    "success": True,
+                    "cached": item['cached'],
+                    "summary": result['summary'],
+                    "key_clauses": result['key_clauses'],
+                    "processing_time": item['processing_time']
+                }) + "\n"
+
+        document_ids = []
+        try:
+            if completed:
+                document_ids = store_batch_documents(user_id, ip_address, completed)
+        except Exception as e:
+            logging.error(f"Error saving batch: {str(e)}")
+            log_action('batch_upload', 'error', ip_address, str(e), user_id=user_id)
+            yield json.dumps({"done": True, "success": False, "error": "Error saving documents"}) + "\n"
+            return
+
+        yield json.dumps({
+            "done": True,
+            "success": True,
+            "processed": len(completed),
+            "failed": failed,
+            "documents": [
+                {"filename": filename, "document_id": document_id}
+                for (filename, _), document_id in zip(completed, document_ids)
+            ]
+        }) + "\n"
+
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.call_on_close(resources.close)
+    return response
+
+@app.route('/api/jobs/<job_id>')
+@login_required
+def api_job_status(job_id):
+    """Report progress and, once finished, the result of an asynchronous upload"""
+    job = job_queue.get(job_id)
+    if job is None or job['user_id'] != current_user.id:
+        return jsonify({
+            "success": False,
+            "error": "Job not found"
+        }), 404
+
+    return jsonify({
+        "success": True,
+        **serialize_job(job)
+    })
+
+
+@app.route('/api/cache-stats')
+@login_required
+def api_cache_stats():
+    """Hit/miss counters for the server-side caches"""
+    return jsonify({
+        "success": True,
+        "result_cache": result_cache.stats(),
+        "evaluation_stats_cache": evaluation_stats_cache.stats(),
+        "explain_cache": explain_cache.stats(),
+        "ocr_cache": ocr_cache.stats()
+    })
+
+
+def explain_clause_text(clause_text):
+    """utils.explain_legal_clause with the clause analysis served from explain_cache"""
+    cache_key = hashlib.sha256(utils.normalize_clause_text(clause_text).encode()).hexdigest()
+    analysis = explain_cache.get(cache_key)
+    if analysis is None:
+        analysis = utils.clause_analysis(clause_text)
+        explain_cache.set(cache_key, analysis)
+    return utils.explain_legal_clause(clause_text, analysis)
+
 @app.route('/explain', methods=['POST'])
 @login_required
 @limiter.limit("20 per minute")
@@ -337,7 +961,7 @@ def explain_clause():
         if not clause_text.strip():
             return jsonify({'error': 'No clause text provided'}), 400
         
-        explanation = utils.explain_legal_clause(clause_text)
+        explanation = explain_clause_text(clause_text)
         
         # Log the explanation request
         log_action('explain', 'success', request.remote_addr)
@@ -349,28 +973,120 @@ def explain_clause():
         log_action('explain', 'error', request.remote_addr, str(e))
         return jsonify({'error': f'Error explaining clause: {str(e)}'}), 500
 
+@app.route('/api/explain-batch', methods=['POST'])
+@login_required
+@limiter.limit("10 per minute")
+def explain_batch():
+    """Explain many clauses in one request: a list of clause texts, or the key clauses of a document"""
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({
+            "success": False,
+            "error": "Request body must be a JSON object with 'clauses' or 'document_id'"
+        }), 400
+
+    document_id = payload.get('document_id')
+    if document_id is not None:
+        # bool is an int subclass, but true is not a document id
+        if not isinstance(document_id, int) or isinstance(document_id, bool):
+            return jsonify({
+                "success": False,
+                "error": "'document_id' must be an integer"
+            }), 400
+        document = Document.query.filter_by(id=document_id, user_id=current_user.id).first()
+        if document is None:
+            return jsonify({
+                "success": False,
+                "error": "Document not found"
+            }), 404
+        clauses = [clause.content for clause in KeyClause.query.filter_by(document_id=document.id).all()]
+    else:
+        clauses = payload.get('clauses')
+        if not isinstance(clauses, list) or not all(isinstance(clause, str) for clause in clauses):
+            return jsonify({
+                "success": False,
+                "error": "Provide 'clauses' (a list of clause texts) or 'document_id'"
+            }), 400
+
+    if len(clauses) > app.config['EXPLAIN_BATCH_MAX_CLAUSES']:
+        return jsonify({
+            "success": False,
+            "error": f"Too many clauses. Max {app.config['EXPLAIN_BATCH_MAX_CLAUSES']} per request."
+        }), 400
+
+    explanations = []
+    for index, clause_text in enumerate(clauses):
+        if not clause_text.strip():
+            explanations.append({"index": index, "success": False, "error": "No clause text provided"})
+            continue
+        explanations.append({"index": index, "success": True, "explanation": explain_clause_text(clause_text)})
+
+    log_action('explain_batch', 'success', request.remote_addr)
+    return jsonify({
+        "success": True,
+        "explanations": explanations
+    })
+
+def encode_history_cursor(upload_date, document_id):
+    """Opaque keyset cursor pointing just after the given document"""
+    raw = f"{upload_date.isoformat()}|{document_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_history_cursor(cursor):
+    upload_date, document_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+    return datetime.fromisoformat(upload_date), int(document_id)
+
 @app.route("/api/history")
 @login_required
 def api_history():
+    """List the user's documents newest first, one keyset page at a time"""
+    limit = min(max(request.args.get('limit', app.config['HISTORY_PAGE_SIZE'], type=int), 1),
+                app.config['HISTORY_MAX_PAGE_SIZE'])
+    cursor = request.args.get('cursor')
+
+    # only the list columns; original_text and summary are never loaded here
+    query = select(
+        Document.id, Document.filename, Document.file_type, Document.file_size,
+        Document.upload_date, Document.processing_time
+    ).where(Document.user_id == current_user.id)
+
+    if cursor:
+        try:
+            cursor_date, cursor_id = decode_history_cursor(cursor)
+        except (ValueError, UnicodeDecodeError):
+            return jsonify({
+                "success": False,
+                "error": "Invalid cursor"
+            }), 400
+        query = query.where(or_(
+            Document.upload_date < cursor_date,
+            and_(Document.upload_date == cursor_date, Document.id < cursor_id)
+        ))
+
     try:
-        documents_from_db = Document.query.filter_by(
-            user_id=current_user.id
-        ).order_by(Document.upload_date.desc()).all()
+        rows = db.session.execute(
+            query.order_by(Document.upload_date.desc(), Document.id.desc()).limit(limit + 1)
+        ).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
 
         documents = [
             {
-                "filename": doc.filename,
-                "file_type": doc.file_type,
-                "file_size": doc.file_size,
-                "upload_date": doc.upload_date.strftime("%Y-%m-%d %H:%M"),
-                "processing_time": doc.processing_time
+                "id": row.id,
+                "filename": row.filename,
+                "file_type": row.file_type,
+                "file_size": row.file_size,
+                "upload_date": row.upload_date.strftime("%Y-%m-%d %H:%M"),
+                "processing_time": row.processing_time
             }
-            for doc in documents_from_db
+            for row in rows
         ]
 
         return jsonify({
             "success": True,
-            "documents": documents
+            "documents": documents,
+            "next_cursor": encode_history_cursor(rows[-1].upload_date, rows[-1].id) if has_more else None
         })
 
     except Exception as e:
@@ -420,6 +1136,12 @@ def load_user(user_id):
 @app.errorhandler(413)
 def too_large(e):
     """Handle file too large error"""
+    # API endpoints are called by scripts and the camera page, which expect JSON rather
+    # than a redirect (a body is usually parsed, and rejected, by CSRFProtect before the view runs)
+    if request.endpoint == 'batch_upload':
+        return batch_too_large()
+    if request.path.startswith('/api/'):
+        return jsonify({"success": False, "error": "File too large. Max size 16MB."}), 413
     flash('File too large. Please upload files smaller than 16MB.', 'error')
     return redirect(url_for('index'))
 
@@ -484,12 +1206,17 @@ def logout():
 def dashboard():
     try:
         # recent documents for current user
-        recent_docs = Document.query.filter_by(user_id=current_user.id).order_by(Document.upload_date.desc()).limit(10).all()
+        recent_docs = Document.query.options(load_only(
+            Document.id, Document.filename, Document.file_type, Document.file_size,
+            Document.upload_date, Document.processing_time
+        )).filter_by(user_id=current_user.id).order_by(Document.upload_date.desc()).limit(10).all()
         # recent evaluations (if any)
         evaluations = []
         try:
             DocumentEvaluation = db.Model.DocumentEvaluation
-            evaluations = DocumentEvaluation.query.filter_by().order_by(DocumentEvaluation.evaluation_date.desc()).limit(5).all()
+            evaluations = DocumentEvaluation.query.options(
+                *evaluation_list_options(DocumentEvaluation)
+            ).order_by(DocumentEvaluation.evaluation_date.desc()).limit(5).all()
         except Exception:
             evaluations = []
 
@@ -510,21 +1237,108 @@ def camera_tool():
 @login_required
 def analyze_camera():
     try:
-        # Accept JSON or form-encoded
-        data = request.get_json(silent=True) or request.form
-        captured_image = data.get('captured_image')
+        # Accept a raw/multipart image, or a base64 data URL in JSON or form data
+        captured_image = request_camera_image()
         if not captured_image:
             return jsonify({'error': 'No image provided'}), 400
 
         # Extract text and summarize
-        extracted_text = utils.extract_text_from_image(captured_image)
+        extracted_text = extract_camera_text(captured_image, current_user.id)
         summary_data = utils.summarize_legal_document(extracted_text)
 
         return jsonify({'summary': summary_data.get('summary', ''), 'key_clauses': summary_data.get('key_clauses', [])})
+    except RequestEntityTooLarge:
+        raise  # answered by too_large()
     except Exception as e:
         logging.error(f"Error analyzing camera image: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/capture-sessions', methods=['POST'])
+@login_required
+def create_capture_session():
+    """Open a multi-page camera capture session"""
+    session_id = capture_sessions.create(current_user.id)
+    return jsonify({
+        "success": True,
+        "session_id": session_id,
+        "status_url": url_for('capture_session_status', session_id=session_id)
+    }), 201
+
+@app.route('/api/capture-sessions/<session_id>/pages', methods=['POST'])
+@login_required
+@limiter.limit("60 per minute")
+def add_capture_page(session_id):
+    """Add a page (or retake one with `page`) and start its OCR in the background"""
+    captured_image = request_camera_image()
+    if not captured_image:
+        return jsonify({"success": False, "error": "No image provided"}), 400
+
+    try:
+        data = request.get_json(silent=True) if request.is_json else None
+        page = data.get('page') if isinstance(data, dict) else request.values.get('page')
+        page = capture_sessions.add_page(session_id, current_user.id, detached_camera_image(captured_image),
+                                         utils.image_data_size(captured_image),
+                                         page=int(page) if page is not None else None)
+    except KeyError:
+        return jsonify({"success": False, "error": "Capture session not found"}), 404
+    except (CaptureSessionError, ValueError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    return jsonify({"success": True, "session_id": session_id, "page": page}), 202
+
+@app.route('/api/capture-sessions/<session_id>', methods=['GET'])
+@login_required
+def capture_session_status(session_id):
+    """OCR status of every page in a capture session"""
+    try:
+        status = capture_sessions.status(session_id, current_user.id)
+    except KeyError:
+        return jsonify({"success": False, "error": "Capture session not found"}), 404
+    return jsonify({"success": True, **status})
+
+@app.route('/api/capture-sessions/<session_id>', methods=['DELETE'])
+@login_required
+def discard_capture_session(session_id):
+    """Drop a capture session and any OCR still queued for it"""
+    try:
+        capture_sessions.discard(session_id, current_user.id)
+    except KeyError:
+        return jsonify({"success": False, "error": "Capture session not found"}), 404
+    return jsonify({"success": True})
+
+@app.route('/api/capture-sessions/<session_id>/finalize', methods=['POST'])
+@login_required
+@limiter.limit("10 per minute")
+def finalize_capture_session(session_id):
+    """Summarize the pages' already extracted text and save it as one document"""
+    start_time = time.time()
+    try:
+        texts, file_size = capture_sessions.finalize(session_id, current_user.id)
+    except KeyError:
+        return jsonify({"success": False, "error": "Capture session not found"}), 404
+    except CaptureSessionError as e:
+        log_action('extract_text', 'error', request.remote_addr, str(e), file_name="camera_capture.jpg")
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    extracted_text = '\n\n'.join(texts)
+    if not extracted_text.strip():
+        return jsonify({
+            "success": False,
+            "error": "No text could be extracted from the images."
+        }), 400
+
+    try:
+        extracted = {'text': extracted_text, 'page_offsets': utils.page_start_offsets(texts, '\n\n')}
+        response_data = summarize_and_store(extracted, "camera_capture.jpg", "image", file_size,
+                                            current_user.id, request.remote_addr, start_time)
+    except Exception as e:
+        logging.error(f"Error finalizing capture session: {str(e)}")
+        log_action('summarize', 'error', request.remote_addr, str(e), file_name="camera_capture.jpg")
+        return jsonify({"success": False, "error": "Error processing document"}), 500
+
+    response_data['pages'] = len(texts)
+    return jsonify(response_data)
+
 @app.route('/privacy')
 def privacy():
     return render_template('privacy.html')
@@ -533,6 +1347,36 @@ def privacy():
 def disclaimer():
     return render_template('disclaimer.html')
 # ===== Quality Evaluation Dashboard Routes =====
+def evaluation_list_options(DocumentEvaluation):
+    """Load evaluation scores and the document filename in the same query (no notes or document text)"""
+    return (
+        load_only(
+            DocumentEvaluation.id, DocumentEvaluation.document_id, DocumentEvaluation.evaluator_name,
+            DocumentEvaluation.extraction_accuracy, DocumentEvaluation.clause_completeness,
+            DocumentEvaluation.summary_accuracy, DocumentEvaluation.summary_usefulness,
+            DocumentEvaluation.overall_score, DocumentEvaluation.evaluation_date
+        ),
+        joinedload(DocumentEvaluation.document).load_only(Document.id, Document.filename),
+    )
+
+def evaluation_stats(group_by=None, bucket='day'):
+    """Evaluation metrics aggregated in the database and cached.
+
+    The cache key includes the newest evaluation id, so recording an
+    evaluation invalidates the cached figures in every worker.
+    """
+    from eval_utils import aggregate_evaluation_metrics
+    DocumentEvaluation = db.Model.DocumentEvaluation
+
+    latest_id = db.session.scalar(select(func.max(DocumentEvaluation.id))) or 0
+    cache_key = f"{latest_id}:{group_by}:{bucket}"
+    stats = evaluation_stats_cache.get(cache_key)
+    if stats is None:
+        stats = aggregate_evaluation_metrics(db.session, DocumentEvaluation, Document,
+                                             group_by=group_by, bucket=bucket)
+        evaluation_stats_cache.set(cache_key, stats)
+    return stats
+
 @app.route('/evaluation-dashboard')
 @login_required
 def evaluation_dashboard():
@@ -541,12 +1385,16 @@ def evaluation_dashboard():
         # Import evaluation models
         DocumentEvaluation, ClauseEvaluation = db.Model.DocumentEvaluation, db.Model.ClauseEvaluation
         
-        # Get all evaluations
-        evaluations = DocumentEvaluation.query.all()
+        # Most recent evaluations; totals come from the aggregate query
+        evaluations = DocumentEvaluation.query.options(
+            *evaluation_list_options(DocumentEvaluation)
+        ).order_by(
+            DocumentEvaluation.evaluation_date.desc()
+        ).limit(app.config['EVALUATION_DASHBOARD_SIZE']).all()
         
         # Compute aggregate statistics
-        from eval_utils import aggregate_evaluation_metrics, get_quality_rating
-        stats = aggregate_evaluation_metrics(evaluations)
+        from eval_utils import get_quality_rating
+        stats = evaluation_stats()
         
         return render_template('evaluation_dashboard.html', 
                              evaluations=evaluations,
@@ -621,12 +1469,14 @@ def submit_document_evaluation(document_id):
 @login_required
 def get_evaluation_stats():
     """API endpoint to get evaluation statistics"""
+    from eval_utils import DATE_BUCKETS
+    group_by = request.args.get('group_by')
+    bucket = request.args.get('bucket', 'day')
+    if group_by not in (None, 'document_type', 'date') or bucket not in DATE_BUCKETS:
+        return jsonify({'error': "group_by must be 'document_type' or 'date', bucket one of day, week, month"}), 400
+
     try:
-        DocumentEvaluation = db.Model.DocumentEvaluation
-        evaluations = DocumentEvaluation.query.all()
-        
-        from eval_utils import aggregate_evaluation_metrics
-        stats = aggregate_evaluation_metrics(evaluations)
+        stats = evaluation_stats(group_by=group_by, bucket=bucket)
         
         return jsonify(stats)
     except Exception as e:
@@ -645,8 +1495,10 @@ def get_evaluations():
         page = request.args.get('page', 1, type=int)
         per_page = 20
         
-        # Query evaluations with their documents
-        query = DocumentEvaluation.query.order_by(DocumentEvaluation.evaluation_date.desc())
+        # Query evaluations with their documents (joined, so one query per page)
+        query = DocumentEvaluation.query.options(
+            *evaluation_list_options(DocumentEvaluation)
+        ).order_by(DocumentEvaluation.evaluation_date.desc())
         paginated = query.paginate(page=page, per_page=per_page, error_out=False)
         
         evaluations = []
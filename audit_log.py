@@ -0,0 +1,89 @@
+import logging
+import queue
+import threading
+
+from sqlalchemy import insert
+
+
+class AuditLogWriter:
+    """Buffers ProcessingLog rows in memory and writes them in batches.
+
+    Rows are inserted by a background thread on its own connection, every
+    `batch_size` rows or every `flush_interval` seconds, whichever comes
+    first, so audit logging can never break the request's own transaction.
+    A batch whose write fails is kept and retried by the next flush, up to
+    `retries` times, then logged and dropped. shutdown() drains the buffer.
+    """
+
+    def __init__(self, engine, table, batch_size=50, flush_interval=2.0, max_queue=10000, retries=3):
+        self.engine = engine
+        self.table = table
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._failed = None  # (rows, failed attempts) of the batch to retry first
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='legalease-audit-log', daemon=True)
+        self._thread.start()
+
+    def write(self, entry):
+        """Queue one row (a dict of ProcessingLog column values) without blocking"""
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            logging.error(f"Audit log buffer full, dropping entry: {entry.get('action')}")
+            return
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+
+    def flush(self):
+        """Write everything queued so far, in batches of batch_size.
+
+        Stops at the first failed write (the database is likely unavailable);
+        that batch is retried by the next flush. Returns False if a write failed.
+        """
+        with self._write_lock:
+            while True:
+                rows, attempts = self._failed or (self._next_batch(), 0)
+                self._failed = None
+                if not rows:
+                    return True
+                try:
+                    with self.engine.begin() as connection:
+                        connection.execute(insert(self.table), rows)
+                except Exception as e:
+                    attempts += 1
+                    if attempts > self.retries:
+                        logging.error(f"Dropping {len(rows)} audit log entries after {attempts} failed writes: "
+                                      f"{str(e)}")
+                    else:
+                        logging.warning(f"Failed to write {len(rows)} audit log entries, will retry: {str(e)}")
+                        self._failed = (rows, attempts)
+                    return False
+
+    def shutdown(self, timeout=5.0):
+        """Stop the writer thread and write whatever is still buffered"""
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        if not self.flush():
+            unwritten = self._queue.qsize() + (len(self._failed[0]) if self._failed else 0)
+            logging.error(f"Audit log writer stopped with {unwritten} entries unwritten")
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _next_batch(self):
+        rows = []
+        while len(rows) < self.batch_size:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
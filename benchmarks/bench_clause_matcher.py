@@ -0,0 +1,57 @@
+"""Clause detection benchmark: clause_matcher against the per-pattern regex loop it replaced.
+
+Large documents are built from test_legal_document.txt in several shapes:
+many paragraphs, one paragraph, one line, and a smaller repetitive line that
+makes the old '.*?' patterns backtrack. Every row also checks that both
+return the same clauses.
+
+Usage:
+    python benchmarks/bench_clause_matcher.py [--copies 400] [--runs 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clause_matcher import find_key_clauses  # noqa: E402
+from tests.fixtures import legacy_key_clauses, sample_document  # noqa: E402
+
+
+def best_time(func, text, runs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--copies', type=int, default=400, help='copies of the sample document per input')
+    parser.add_argument('--runs', type=int, default=3, help='runs per measurement (best is reported)')
+    parser.add_argument('--backtracking-chars', type=int, default=120000,
+                        help='size of the backtracking input (the legacy loop is quadratic on it)')
+    args = parser.parse_args()
+
+    document = (sample_document() + '\n\n') * args.copies
+    inputs = {
+        'paragraphs': document,
+        'one paragraph': document.replace('\n\n', '\n'),
+        'one line': document.replace('\n', ' '),
+        'backtracking': 'the end of the term and payment of fee ' * (args.backtracking_chars // 40),
+    }
+
+    print(f"{'input':<14} {'chars':>9} {'legacy':>9} {'matcher':>9} {'speedup':>8}  same")
+    for name, text in inputs.items():
+        legacy_seconds, legacy = best_time(legacy_key_clauses, text, args.runs)
+        matcher_seconds, clauses = best_time(find_key_clauses, text, args.runs)
+        print(f"{name:<14} {len(text):>9} {legacy_seconds:>8.3f}s {matcher_seconds:>8.3f}s "
+              f"{legacy_seconds / matcher_seconds:>7.1f}x  {clauses == legacy}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""LSA benchmark: sumy's dense LsaSummarizer against lsa.SparseLsaSummarizer, by document size.
+
+Documents of N sentences are built from random words: the vocabulary of
+test_legal_document.txt plus 20000 made-up terms, so the term-sentence
+matrix grows the way it does on long contracts. Sentences are tokenized
+with a plain regex tokenizer, so no NLTK data is needed. For each size
+the report gives wall time and peak memory (tracemalloc, numpy buffers
+included) of one summary, and how many of the chosen sentences agree with
+sumy's. Sumy ranks with every singular vector and the sparse path with
+only the leading ones, so on random text, which has no dominant topics,
+the choices drift apart as documents grow. Sumy is skipped above
+--dense-max sentences, where it takes minutes and its dense matrix grows
+towards gigabytes.
+
+Usage:
+    python benchmarks/bench_lsa.py [--sentences 200 500 1000 2000 5000] [--summary 8] [--dense-max 1000]
+"""
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sumy.models.dom import ObjectDocumentModel, Paragraph, Sentence  # noqa: E402
+from sumy.nlp.stemmers import Stemmer  # noqa: E402
+from sumy.summarizers.lsa import LsaSummarizer  # noqa: E402
+from sumy.utils import get_stop_words  # noqa: E402
+
+from lsa import SparseLsaSummarizer  # noqa: E402
+
+
+class RegexTokenizer:
+    language = 'english'
+
+    def to_words(self, sentence):
+        return re.findall(r"[A-Za-z][A-Za-z'-]*", sentence)
+
+
+def vocabulary(seed=42):
+    with open(os.path.join(ROOT, 'test_legal_document.txt'), encoding='utf-8') as file:
+        words = sorted(set(re.findall(r'[A-Za-z]+', file.read())))
+    rng = random.Random(seed)
+    made_up = [''.join(rng.choice(string.ascii_lowercase) for _ in range(7)) for _ in range(20000)]
+    return words + made_up
+
+
+def make_document(sentence_count, words, seed=3):
+    rng = random.Random(seed)
+    tokenizer = RegexTokenizer()
+    sentences = [
+        Sentence(' '.join(rng.choice(words) for _ in range(rng.randint(8, 30))), tokenizer)
+        for _ in range(sentence_count)
+    ]
+    return ObjectDocumentModel([Paragraph(sentences)])
+
+
+def make_summarizer(cls, **options):
+    summarizer = cls(Stemmer('english'), **options)
+    summarizer.stop_words = get_stop_words('english')
+    return summarizer
+
+
+def measure(summarizer, document, summary_size):
+    """(seconds, peak traced bytes, chosen sentences); tracing slows sumy's Python loops
+    down a lot, so the time comes from a separate untraced run"""
+    start = time.perf_counter()
+    sentences = summarizer(document, summary_size)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    summarizer(document, summary_size)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, {str(sentence) for sentence in sentences}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sentences', type=int, nargs='+', default=[200, 500, 1000, 2000, 5000])
+    parser.add_argument('--summary', type=int, default=8, help='sentences per summary')
+    parser.add_argument('--dense-max', type=int, default=1000, help='largest document sumy is run on')
+    args = parser.parse_args()
+
+    words = vocabulary()
+    dense = make_summarizer(LsaSummarizer)
+    # min_sentences=0: always take the sparse path, whatever LSA_SPARSE_MIN_SENTENCES is
+    sparse = make_summarizer(SparseLsaSummarizer, min_sentences=0)
+
+    print(f"{'sentences':>9} {'sumy':>9} {'sumy peak':>10} {'sparse':>9} {'sparse peak':>12}  same as sumy")
+    for sentence_count in args.sentences:
+        document = make_document(sentence_count, words)
+        sparse_seconds, sparse_peak, chosen = measure(sparse, document, args.summary)
+        if sentence_count > args.dense_max:
+            print(f"{sentence_count:>9} {'-':>9} {'-':>10} {sparse_seconds:>8.2f}s "
+                  f"{sparse_peak / 2 ** 20:>10.1f}MB  (sumy skipped)")
+            continue
+        dense_seconds, dense_peak, expected = measure(dense, document, args.summary)
+        print(f"{sentence_count:>9} {dense_seconds:>8.2f}s {dense_peak / 2 ** 20:>8.1f}MB "
+              f"{sparse_seconds:>8.2f}s {sparse_peak / 2 ** 20:>10.1f}MB  "
+              f"{len(chosen & expected)}/{args.summary}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""OCR benchmark: latency and character accuracy of ocr.recognize on synthetic camera captures.
+
+Paragraphs of test_legal_document.txt are rendered black on white into a
+page the size of a 12MP phone photo, then degraded the way camera captures
+are: skewed, noisy, blurred and JPEG-compressed. Each capture is read two ways:
+
+- legacy: the whole RGB photo handed to tesseract as it is (the
+  pre-ocr.py path)
+- ocr: ocr.recognize, which downsamples, deskews, binarizes and reads
+  line-aligned bands concurrently
+
+Accuracy is the difflib similarity of the recognized text with the rendered
+text, whitespace collapsed (1.0 is a perfect read). Preprocessing time and
+the skew angle it estimated (the capture is rotated by the opposite of the
+applied skew) are reported on their own as well, and are all that is
+measured when the tesseract binary is not installed.
+
+Usage:
+    python benchmarks/bench_ocr.py [--pages 2] [--runs 1] [--workers N]
+"""
+import argparse
+import difflib
+import io
+import os
+import shutil
+import sys
+import textwrap
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PIL import Image, ImageDraw, ImageFilter, ImageFont  # noqa: E402
+
+import ocr  # noqa: E402
+from tests.fixtures import sample_document  # noqa: E402
+
+PHOTO_SIZE = (3024, 4032)  # 12MP portrait
+MARGIN = 150
+FONT_SIZE = 44
+LINE_HEIGHT = 62
+
+# name -> (skew degrees, noise sigma, blur radius, JPEG quality)
+DEGRADATIONS = {
+    'clean': (0.0, 0, 0, 95),
+    'skewed 2.5deg': (2.5, 0, 0, 95),
+    'noisy': (0.0, 25, 0, 95),
+    'blurred': (0.0, 0, 1.5, 95),
+    'camera': (-1.5, 15, 1.0, 70),
+}
+
+
+def render_page(paragraphs):
+    """White page with the paragraphs wrapped to its width; returns (image, rendered text)"""
+    font = ImageFont.load_default(size=FONT_SIZE)
+    page = Image.new('L', PHOTO_SIZE, 255)
+    draw = ImageDraw.Draw(page)
+    columns = int((PHOTO_SIZE[0] - 2 * MARGIN) / (FONT_SIZE * 0.5))
+    lines = []
+    for paragraph in paragraphs:
+        lines.extend(textwrap.wrap(' '.join(paragraph.split()), columns) + [''])
+    lines = lines[:(PHOTO_SIZE[1] - 2 * MARGIN) // LINE_HEIGHT]
+    for number, line in enumerate(lines):
+        draw.text((MARGIN, MARGIN + number * LINE_HEIGHT), line, fill=0, font=font)
+    return page, ' '.join(' '.join(lines).split())
+
+
+def degrade(page, skew, noise, blur, quality):
+    image = page.rotate(skew, resample=Image.BILINEAR, fillcolor=255) if skew else page
+    if blur:
+        image = image.filter(ImageFilter.GaussianBlur(blur))
+    if noise:
+        image = Image.blend(image, Image.effect_noise(image.size, noise), 0.3)
+    image = Image.merge('RGB', [image] * 3)
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=quality)
+    return buffer.getvalue()
+
+
+def accuracy(recognized, expected):
+    return difflib.SequenceMatcher(None, ' '.join(recognized.split()), expected, autojunk=False).ratio()
+
+
+def timed(func, runs):
+    best, result = None, None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=2, help='pages (different text) per degradation')
+    parser.add_argument('--runs', type=int, default=1, help='runs per measurement (best is reported)')
+    parser.add_argument('--workers', type=int, default=0, help='ocr.recognize workers (0 = one per CPU)')
+    args = parser.parse_args()
+
+    has_tesseract = shutil.which('tesseract') is not None
+    if has_tesseract:
+        import pytesseract
+    else:
+        print('tesseract not found: only preprocessing is measured')
+
+    paragraphs = [paragraph for paragraph in sample_document().split('\n\n') if paragraph.strip()]
+    print(f"{'capture':<17} {'preprocess':>10} {'deskew':>7} {'legacy':>9} {'ocr':>9} "
+          f"{'legacy acc':>10} {'ocr acc':>8}")
+    for name, (skew, noise, blur, quality) in DEGRADATIONS.items():
+        for number in range(args.pages):
+            start = number * 6 % len(paragraphs)
+            page, expected = render_page((paragraphs * 2)[start:start + 12])
+            data = degrade(page, skew, noise, blur, quality)
+            label = f"{name} #{number + 1}"
+
+            preprocess_seconds, _ = timed(lambda: ocr.preprocess(Image.open(io.BytesIO(data))), args.runs)
+            gray = Image.open(io.BytesIO(data)).convert('L')
+            angle = ocr.estimate_skew(gray, ocr.otsu_threshold(gray.histogram()))
+            row = f"{label:<17} {preprocess_seconds:>9.3f}s {angle:>+7.2f}"
+            if not has_tesseract:
+                print(row)
+                continue
+
+            legacy_seconds, legacy_text = timed(lambda: pytesseract.image_to_string(
+                Image.open(io.BytesIO(data)).convert('RGB'), config=ocr.TESSERACT_CONFIG), args.runs)
+            ocr_seconds, ocr_text = timed(
+                lambda: ocr.recognize(Image.open(io.BytesIO(data)), workers=args.workers), args.runs)
+            print(f"{row} {legacy_seconds:>8.2f}s {ocr_seconds:>8.2f}s "
+                  f"{accuracy(legacy_text, expected):>10.3f} {accuracy(ocr_text, expected):>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Parallel PDF extraction benchmark: utils.extract_text_from_pdf serial against the process pool.
+
+Text PDFs of 100+ pages are generated with PyMuPDF and written to a
+temporary directory. Each is extracted with workers=1 and with the pool
+(min_pages=1, so the page threshold does not get in the way), once from
+its path and once from in-memory bytes as uploads under
+IN_MEMORY_UPLOAD_LIMIT are. Every row checks that the text, page order
+included, is identical.
+
+Usage:
+    python benchmarks/bench_pdf_extraction.py [--pages 100 200 400] [--workers N] [--runs 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import utils  # noqa: E402
+
+
+def make_pdf(path, pages):
+    import fitz
+
+    with open(os.path.join(ROOT, 'test_legal_document.txt'), encoding='utf-8') as file:
+        body = file.read()
+    with fitz.open() as pdf:
+        for number in range(pages):
+            page = pdf.new_page()
+            page.insert_textbox(fitz.Rect(36, 36, 576, 756), f"Page {number + 1}\n\n{body}", fontsize=7)
+        pdf.save(path)
+
+
+def best_time(func, runs):
+    best, result = None, None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[100, 200, 400])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--runs', type=int, default=3, help='runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPU(s), {args.workers} workers")
+    print(f"{'pages':>6} {'serial':>9} {'path':>9} {'bytes':>9} {'speedup':>8}  same")
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = os.path.join(tmp, f'{pages}.pdf')
+            make_pdf(path, pages)
+            with open(path, 'rb') as file:
+                data = file.read()
+            serial_seconds, serial = best_time(lambda: utils.extract_text_from_pdf(path, workers=1), args.runs)
+            path_seconds, from_path = best_time(
+                lambda: utils.extract_text_from_pdf(path, workers=args.workers, min_pages=1), args.runs)
+            bytes_seconds, from_bytes = best_time(
+                lambda: utils.extract_text_from_pdf(data, workers=args.workers, min_pages=1), args.runs)
+            print(f"{pages:>6} {serial_seconds:>8.3f}s {path_seconds:>8.3f}s {bytes_seconds:>8.3f}s "
+                  f"{serial_seconds / max(path_seconds, bytes_seconds):>7.2f}x  {serial == from_path == from_bytes}")
+
+if __name__ == '__main__':
+    main()
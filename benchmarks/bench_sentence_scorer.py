@@ -0,0 +1,74 @@
+"""Sentence scorer benchmark: sentence_scorer's batch scoring against the per-sentence scorer it replaced.
+
+Documents of N sentences are built two ways: random sentences of importance
+keywords and filler (tests/fixtures.scorer_sentences), and the sentences of
+test_legal_document.txt repeated. Each is summarized two ways:
+
+- legacy: calculate_sentence_importance's old loop (one substring search per
+  keyword per sentence), then a full sort (tests/fixtures.legacy_top_sentences)
+- batch: utils.intelligent_summary_sentences, which fills a sentence x keyword
+  matrix one keyword column at a time and picks the top ones with argpartition
+
+Sentences are split once up front (ParsedDocument) and that time is reported
+apart, since both paths need it. Every row checks that both pick the same
+sentences.
+
+Usage:
+    python benchmarks/bench_sentence_scorer.py [--sentences 10000 20000 50000] [--runs 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from parsed_document import parse_document  # noqa: E402
+from tests.fixtures import legacy_top_sentences, sample_document, scorer_sentences  # noqa: E402
+from utils import intelligent_summary_sentences  # noqa: E402
+
+
+def make_documents(sentence_count):
+    sample = [sentence for sentence in parse_document(sample_document()).sentence_texts(min_length=20)]
+    repeated = (sample * (sentence_count // len(sample) + 1))[:sentence_count]
+    return {
+        'random': '. '.join(scorer_sentences(sentence_count, seed=sentence_count)) + '.',
+        'contract': '. '.join(repeated) + '.',
+    }
+
+
+def best_time(func, runs):
+    best, result = None, None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sentences', type=int, nargs='+', default=[10000, 20000, 50000])
+    parser.add_argument('--runs', type=int, default=3, help='runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    print(f"{'sentences':>9} {'document':<9} {'split':>8} {'legacy':>8} {'batch':>8} {'speedup':>8}  same")
+    for sentence_count in args.sentences:
+        for name, text in make_documents(sentence_count).items():
+            split_seconds, _ = best_time(lambda: parse_document(text).sentence_texts(min_length=20), args.runs)
+            # both paths get a document that is already split
+            document = parse_document(text)
+            sentences = document.sentence_texts(min_length=20)
+            document.lowered_sentence_texts(min_length=20)
+
+            legacy_seconds, legacy = best_time(lambda: legacy_top_sentences(sentences), args.runs)
+            batch_seconds, chosen = best_time(lambda: intelligent_summary_sentences(document), args.runs)
+            print(f"{len(sentences):>9} {name:<9} {split_seconds:>7.3f}s {legacy_seconds:>7.3f}s "
+                  f"{batch_seconds:>7.3f}s {legacy_seconds / batch_seconds:>7.1f}x  "
+                  f"{sorted(chosen) == sorted(legacy)}")
+
+
+if __name__ == '__main__':
+    main()
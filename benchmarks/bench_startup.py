@@ -0,0 +1,111 @@
+"""Import-time and cold-start benchmark.
+
+Every measurement runs in a fresh interpreter, so nothing is warm:
+
+- ``import utils``: wall time, and which heavy libraries it pulled in
+  (none of them should be loaded until first use)
+- ``import app``: what a gunicorn worker pays before serving (temporary SQLite DB)
+- first summary: ``import utils`` plus the first summarize_legal_document()
+  call on test_legal_document.txt
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--baseline <git rev>]
+
+With --baseline the same measurements are also taken on a `git archive`
+export of that revision, so before/after numbers come from one run.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries utils.py only needs on first use
+HEAVY_MODULES = ['numpy', 'sumy', 'nltk', 'fitz', 'docx', 'PIL', 'pytesseract', 'lxml']
+
+IMPORT_UTILS = """
+import json, sys, time
+start = time.perf_counter()
+import utils
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'loaded': [m for m in %r if m in sys.modules]}))
+""" % HEAVY_MODULES
+
+IMPORT_APP = """
+import json, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed}))
+"""
+
+FIRST_SUMMARY = """
+import json, time
+start = time.perf_counter()
+import utils
+with open('test_legal_document.txt', encoding='utf-8') as file:
+    utils.summarize_legal_document(file.read())
+print(json.dumps({'seconds': time.perf_counter() - start}))
+"""
+
+
+def run_child(code, cwd, env):
+    process = subprocess.run([sys.executable, '-c', code], cwd=cwd, env=env, capture_output=True, text=True)
+    if process.returncode:
+        raise RuntimeError(f"benchmark child failed in {cwd}:\n{process.stderr[-2000:]}")
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def measure(cwd, runs):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, SESSION_SECRET='x' * 40, DATABASE_URL=f"sqlite:///{tmp}/bench.db",
+                   NLTK_AUTO_DOWNLOAD='false', PYTHONDONTWRITEBYTECODE='1')
+        # warm the OS file cache and the .pyc-less import path once
+        run_child(IMPORT_UTILS, cwd, env)
+        results = {}
+        for name, code in [('import utils', IMPORT_UTILS), ('import app', IMPORT_APP),
+                           ('first summary', FIRST_SUMMARY)]:
+            samples = [run_child(code, cwd, env) for _ in range(runs)]
+            results[name] = {
+                'median_seconds': statistics.median(sample['seconds'] for sample in samples),
+                **({'loaded': samples[-1]['loaded']} if 'loaded' in samples[-1] else {}),
+            }
+        return results
+
+
+def export_revision(revision, directory):
+    archive = os.path.join(directory, 'export.tar')
+    subprocess.run(['git', 'archive', '--format=tar', '-o', archive, revision], cwd=ROOT, check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(os.path.join(directory, 'tree'), filter='data')
+    return os.path.join(directory, 'tree')
+
+
+def report(label, results):
+    print(label)
+    for name, result in results.items():
+        line = f"  {name:<14} {result['median_seconds']:8.3f}s"
+        if 'loaded' in result:
+            line += f"   heavy modules loaded: {', '.join(result['loaded']) or 'none'}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per measurement (median)')
+    parser.add_argument('--baseline', help='git revision to compare against')
+    args = parser.parse_args()
+
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as tmp:
+            report(f'baseline ({args.baseline})', measure(export_revision(args.baseline, tmp), args.runs))
+    report('working tree', measure(ROOT, args.runs))
+
+
+if __name__ == '__main__':
+    main()
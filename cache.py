@@ -0,0 +1,122 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+# Seconds create_cache waits for the Redis server before using the in-memory cache
+REDIS_CONNECT_TIMEOUT = 2
+
+
+class LRUCache:
+    """Thread-safe in-process LRU cache with optional TTL and hit/miss counters"""
+
+    def __init__(self, max_entries=256, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return _stats('memory', self.hits, self.misses, len(self._entries), self.max_entries, self.ttl)
+
+
+class RedisCache:
+    """Cache shared by all workers through Redis; values are stored as JSON.
+
+    Entries are bounded by the TTL (and the server's maxmemory policy);
+    hit/miss counters are kept in Redis so they cover every worker.
+    """
+
+    def __init__(self, client, prefix, ttl=None):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def _key(self, key):
+        return f"{self.prefix}:{key}"
+
+    def get(self, key, default=None):
+        try:
+            raw = self.client.get(self._key(key))
+            self.client.incr(self._key('stats:hits' if raw is not None else 'stats:misses'))
+        except Exception as e:
+            logging.warning(f"Cache read failed ({self.prefix}): {e}")
+            return default
+        return json.loads(raw) if raw is not None else default
+
+    def set(self, key, value):
+        try:
+            self.client.set(self._key(key), json.dumps(value), ex=self.ttl or None)
+        except Exception as e:
+            logging.warning(f"Cache write failed ({self.prefix}): {e}")
+
+    def clear(self):
+        for key in self.client.scan_iter(match=f"{self.prefix}:*"):
+            self.client.delete(key)
+
+    def stats(self):
+        try:
+            hits = int(self.client.get(self._key('stats:hits')) or 0)
+            misses = int(self.client.get(self._key('stats:misses')) or 0)
+        except Exception:
+            hits = misses = 0
+        return _stats('redis', hits, misses, None, None, self.ttl)
+
+
+def _stats(backend, hits, misses, size, max_entries, ttl):
+    lookups = hits + misses
+    return {
+        'backend': backend,
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / lookups, 4) if lookups else 0,
+        'size': size,
+        'max_entries': max_entries,
+        'ttl': ttl,
+    }
+
+
+def create_cache(backend, prefix, max_entries=256, ttl=None, redis_url=None):
+    """Build a cache for the configured backend ('memory' or 'redis').
+
+    Falls back to the in-process LRUCache when the redis package is missing
+    or the server does not answer at startup.
+    """
+    if backend == 'redis' and redis_url:
+        try:
+            import redis
+            client = redis.Redis.from_url(redis_url, socket_connect_timeout=REDIS_CONNECT_TIMEOUT)
+            client.ping()  # from_url() does not connect
+            return RedisCache(client, prefix, ttl=ttl)
+        except Exception as e:
+            logging.warning(f"Redis cache unavailable for {prefix}, using in-memory cache: {e}")
+    return LRUCache(max_entries=max_entries, ttl=ttl)
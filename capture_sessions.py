@@ -0,0 +1,340 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select, update
+
+# Page states reported by /api/capture-sessions/<id>
+PAGE_PENDING = 'pending'
+PAGE_DONE = 'done'
+PAGE_ERROR = 'error'
+
+# Error recorded for pages whose OCR never finished (the worker that ran it went away)
+INTERRUPTED_ERROR = 'Page was not processed; please retake it'
+
+
+class CaptureSessionError(Exception):
+    """Raised for a request the session cannot accept (too many pages, unknown page, unreadable pages)"""
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _age(timestamp):
+    """Seconds since a timestamp; naive values (SQLite drops the zone) are UTC"""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return (_now() - timestamp).total_seconds()
+
+
+def _new_page(page, size, revision):
+    return {'page': page, 'status': PAGE_PENDING, 'text': None, 'error': None,
+            'size': size, 'revision': revision, 'updated_at': _now()}
+
+
+class InMemoryCaptureBackend:
+    """Keeps capture sessions in a process-local dict (tests, single worker)"""
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def create(self, session_id, user_id):
+        with self._lock:
+            self._sessions[session_id] = {'user_id': user_id, 'pages': [], 'updated_at': _now()}
+
+    def add_page(self, session_id, user_id, page, size, revision, max_pages):
+        with self._lock:
+            session = self._get(session_id, user_id)
+            pages = session['pages']
+            if page is None:
+                if len(pages) >= max_pages:
+                    raise CaptureSessionError(f"Too many pages. Max {max_pages} per session.")
+                page = len(pages)
+                pages.append(None)
+            elif not 0 <= page < len(pages):
+                raise CaptureSessionError(f"No page {page} in this session")
+            pages[page] = _new_page(page, size, revision)
+            return page
+
+    def set_page_result(self, session_id, page, revision, text=None, error=None):
+        """Record a page's OCR outcome unless the page was retaken or the session dropped since"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or page >= len(session['pages']):
+                return False
+            record = session['pages'][page]
+            if record['revision'] != revision:
+                return False
+            record.update(status=PAGE_ERROR if error is not None else PAGE_DONE, text=text, error=error,
+                          updated_at=_now())
+            return True
+
+    def pages(self, session_id, user_id):
+        with self._lock:
+            return [dict(record) for record in self._get(session_id, user_id)['pages']]
+
+    def delete(self, session_id, user_id, revisions=None):
+        """Drop the session; with `revisions`, only if its pages are still those revisions"""
+        with self._lock:
+            session = self._get(session_id, user_id)
+            if revisions is not None and [record['revision'] for record in session['pages']] != revisions:
+                return False
+            del self._sessions[session_id]
+            return True
+
+    def expire(self, ttl):
+        with self._lock:
+            for session_id in [sid for sid, session in self._sessions.items() if _age(session['updated_at']) > ttl]:
+                del self._sessions[session_id]
+
+    def _get(self, session_id, user_id):
+        # callers hold self._lock
+        session = self._sessions.get(session_id)
+        if session is None or session['user_id'] != user_id:
+            raise KeyError(session_id)
+        session['updated_at'] = _now()
+        return session
+
+
+class DatabaseCaptureBackend:
+    """Stores capture sessions and their pages' OCR text in the capture_session and
+    capture_page tables so every gunicorn worker sees the same sessions.
+
+    A page is still OCR'd on the thread pool of the worker that received it;
+    its image is not stored. Page text is deleted with the session.
+    """
+
+    def __init__(self, db, session_model, page_model, app):
+        self.db = db
+        self.session_model = session_model
+        self.page_model = page_model
+        self.app = app
+
+    def create(self, session_id, user_id):
+        with self.app.app_context():
+            self.db.session.add(self.session_model(id=session_id, user_id=user_id, page_count=0))
+            self.db.session.commit()
+
+    def add_page(self, session_id, user_id, page, size, revision, max_pages):
+        Session, Page = self.session_model, self.page_model
+        with self.app.app_context():
+            try:
+                if page is None:
+                    # claim the next index atomically: two workers may add pages at once
+                    claimed = self.db.session.execute(
+                        update(Session)
+                        .where(Session.id == session_id, Session.user_id == user_id,
+                               Session.page_count < max_pages)
+                        .values(page_count=Session.page_count + 1, updated_at=_now())
+                    ).rowcount
+                    page_count = self._touch(session_id, user_id).page_count
+                    if not claimed:
+                        raise CaptureSessionError(f"Too many pages. Max {max_pages} per session.")
+                    page = page_count - 1
+                    self.db.session.add(Page(session_id=session_id, page=page))
+                elif not 0 <= page < self._touch(session_id, user_id).page_count:
+                    raise CaptureSessionError(f"No page {page} in this session")
+                self.db.session.execute(
+                    update(Page)
+                    .where(Page.session_id == session_id, Page.page == page)
+                    .values(status=PAGE_PENDING, text=None, error_message=None, size=size,
+                            revision=revision, updated_at=_now())
+                )
+                self.db.session.commit()
+                return page
+            except Exception:
+                self.db.session.rollback()
+                raise
+
+    def set_page_result(self, session_id, page, revision, text=None, error=None):
+        Page = self.page_model
+        with self.app.app_context():
+            try:
+                updated = self.db.session.execute(
+                    update(Page)
+                    .where(Page.session_id == session_id, Page.page == page, Page.revision == revision)
+                    .values(status=PAGE_ERROR if error is not None else PAGE_DONE, text=text,
+                            error_message=error, updated_at=_now())
+                ).rowcount
+                self.db.session.commit()
+            except Exception:
+                self.db.session.rollback()
+                raise
+        return bool(updated)
+
+    def pages(self, session_id, user_id):
+        Page = self.page_model
+        with self.app.app_context():
+            try:
+                self._touch(session_id, user_id)
+                self.db.session.commit()
+            except Exception:
+                self.db.session.rollback()
+                raise
+            rows = self.db.session.scalars(
+                select(Page).where(Page.session_id == session_id).order_by(Page.page)
+            ).all()
+            return [{'page': row.page, 'status': row.status, 'text': row.text, 'error': row.error_message,
+                     'size': row.size, 'revision': row.revision, 'updated_at': row.updated_at} for row in rows]
+
+    def delete(self, session_id, user_id, revisions=None):
+        Session, Page = self.session_model, self.page_model
+        with self.app.app_context():
+            try:
+                self._touch(session_id, user_id)
+                if revisions is not None:
+                    # the pages must still be the ones the caller read; a retake elsewhere changes a revision
+                    current = self.db.session.scalars(
+                        select(Page.revision).where(Page.session_id == session_id).order_by(Page.page)
+                        .with_for_update()
+                    ).all()
+                    if current != revisions:
+                        self.db.session.rollback()
+                        return False
+                self.db.session.execute(delete(Page).where(Page.session_id == session_id))
+                self.db.session.execute(delete(Session).where(Session.id == session_id))
+                self.db.session.commit()
+                return True
+            except Exception:
+                self.db.session.rollback()
+                raise
+
+    def expire(self, ttl):
+        Session, Page = self.session_model, self.page_model
+        cutoff = _now() - timedelta(seconds=ttl)
+        with self.app.app_context():
+            try:
+                expired = select(Session.id).where(Session.updated_at < cutoff).scalar_subquery()
+                self.db.session.execute(delete(Page).where(Page.session_id.in_(expired)))
+                self.db.session.execute(delete(Session).where(Session.updated_at < cutoff))
+                self.db.session.commit()
+            except Exception:
+                self.db.session.rollback()
+                raise
+
+    def count(self):
+        """Number of open sessions (tests and diagnostics)"""
+        with self.app.app_context():
+            return self.db.session.scalar(select(func.count()).select_from(self.session_model))
+
+    def _touch(self, session_id, user_id):
+        # the caller commits
+        session = self.db.session.get(self.session_model, session_id)
+        if session is None or session.user_id != user_id:
+            raise KeyError(session_id)
+        session.updated_at = _now()
+        return session
+
+
+def _page_status(record, stale_after):
+    status = record['status']
+    if status == PAGE_PENDING and _age(record['updated_at']) > stale_after:
+        return {'page': record['page'], 'status': PAGE_ERROR, 'error': INTERRUPTED_ERROR}
+    if status == PAGE_PENDING:
+        return {'page': record['page'], 'status': PAGE_PENDING}
+    if status == PAGE_ERROR:
+        return {'page': record['page'], 'status': PAGE_ERROR, 'error': record['error']}
+    return {'page': record['page'], 'status': PAGE_DONE, 'characters': len(record['text'])}
+
+
+class CaptureSessionStore:
+    """Multi-page camera captures whose pages are OCR'd in the background as they arrive.
+
+    ``extract(captured_image, user_id)`` runs on a thread pool as soon as a
+    page is added, so by the time the user finishes capturing, only the last
+    pages may still be in OCR and finalize() just waits for those. Session
+    and page state lives in `backend` (InMemoryCaptureBackend for a single
+    process, DatabaseCaptureBackend when several gunicorn workers serve the
+    same sessions); sessions are dropped after ``ttl`` seconds without
+    activity. A page still pending after ``stale_after`` seconds is reported
+    as failed, since the worker running its OCR went away.
+    """
+
+    def __init__(self, extract, backend=None, max_workers=2, max_pages=50, ttl=1800, stale_after=600,
+                 poll_interval=0.2):
+        self.extract = extract
+        self.backend = backend if backend is not None else InMemoryCaptureBackend()
+        self.max_pages = max_pages
+        self.ttl = ttl
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self._futures = {}  # (session id, page) -> future of OCR queued in this process
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='legalease-capture')
+
+    def create(self, user_id):
+        session_id = uuid.uuid4().hex
+        self.backend.expire(self.ttl)
+        self.backend.create(session_id, user_id)
+        return session_id
+
+    def add_page(self, session_id, user_id, captured_image, size, page=None):
+        """Queue OCR of a page of `size` bytes; `page` replaces an earlier page (a retake).
+        Returns the page index."""
+        revision = uuid.uuid4().hex
+        page = self.backend.add_page(session_id, user_id, page, size, revision, self.max_pages)
+        future = self._executor.submit(self._run, session_id, page, revision, captured_image, user_id)
+        with self._lock:
+            previous = self._futures.get((session_id, page))
+            self._futures[(session_id, page)] = future
+        if previous is not None:
+            previous.cancel()
+        future.add_done_callback(lambda done: self._forget(session_id, page, done))
+        return page
+
+    def status(self, session_id, user_id):
+        pages = self.backend.pages(session_id, user_id)
+        return {
+            'session_id': session_id,
+            'pages': [_page_status(record, self.stale_after) for record in pages],
+        }
+
+    def finalize(self, session_id, user_id, timeout=None):
+        """Wait for outstanding OCR and return (page texts in order, bytes received).
+
+        The session is closed on success; if a page could not be read it is
+        kept open so the page can be retaken.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            pages = self.backend.pages(session_id, user_id)
+            if not pages:
+                raise CaptureSessionError("No pages captured")
+            statuses = [_page_status(record, self.stale_after) for record in pages]
+            if all(status['status'] != PAGE_PENDING for status in statuses):
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                raise CaptureSessionError("Pages are still being processed")
+            time.sleep(self.poll_interval)
+
+        failed = [status for status in statuses if status['status'] == PAGE_ERROR]
+        if failed:
+            raise CaptureSessionError('; '.join(f"Page {status['page']}: {status['error']}" for status in failed))
+
+        if not self.backend.delete(session_id, user_id, revisions=[record['revision'] for record in pages]):
+            raise CaptureSessionError("Pages changed while finalizing")
+        return [record['text'] for record in pages], sum(record['size'] for record in pages)
+
+    def discard(self, session_id, user_id):
+        self.backend.delete(session_id, user_id)
+        with self._lock:
+            futures = [future for (sid, _), future in self._futures.items() if sid == session_id]
+        for future in futures:
+            future.cancel()
+
+    def _run(self, session_id, page, revision, captured_image, user_id):
+        try:
+            text = self.extract(captured_image, user_id)
+        except Exception as e:
+            self.backend.set_page_result(session_id, page, revision, error=str(e))
+        else:
+            self.backend.set_page_result(session_id, page, revision, text=text)
+
+    def _forget(self, session_id, page, future):
+        with self._lock:
+            if self._futures.get((session_id, page)) is future:
+                del self._futures[(session_id, page)]
@@ -0,0 +1,324 @@
+import re
+
+from parsed_document import PARAGRAPH_SEPARATOR, parse_document
+
+# Clause patterns used by utils.identify_key_clauses_enhanced. Every pattern is
+# a sequence of fixed-length pieces joined by '.*?', i.e. "piece A, then piece B
+# later on the same line". The matcher below relies on that shape.
+CLAUSE_PATTERNS = {
+    'Termination': {
+        'patterns': [
+            r'terminat[ei].*?(?:agreement|contract)',
+            r'end.*?(?:agreement|contract)',
+            r'expir[ye].*?(?:agreement|contract)',
+            r'dissolution.*?(?:agreement|contract)'
+        ],
+        'description': 'Specifies conditions under which the agreement can be ended'
+    },
+    'Confidentiality': {
+        'patterns': [
+            r'confidential.*?information',
+            r'non-disclosure',
+            r'proprietary.*?information',
+            r'trade.*?secret',
+            r'disclose.*?information'
+        ],
+        'description': 'Protects sensitive information from being shared'
+    },
+    'Payment Terms': {
+        'patterns': [
+            r'payment.*?(?:due|terms|schedule)',
+            r'invoice.*?(?:payment|terms)',
+            r'compensation.*?(?:amount|terms)',
+            r'fee.*?(?:payment|schedule)',
+            r'remuneration'
+        ],
+        'description': 'Outlines payment obligations and schedules'
+    },
+    'Liability': {
+        'patterns': [
+            r'liability.*?(?:limited|excluded|damages)',
+            r'damages.*?(?:liable|responsible)',
+            r'indemnif[yi].*?(?:party|damages)',
+            r'responsible.*?(?:damages|loss)'
+        ],
+        'description': 'Defines responsibility for damages or losses'
+    },
+    'Governing Law': {
+        'patterns': [
+            r'governing.*?law',
+            r'jurisdiction.*?(?:court|law)',
+            r'laws.*?of.*?(?:state|country)',
+            r'legal.*?system'
+        ],
+        'description': 'Specifies which laws and courts have authority'
+    },
+    'Intellectual Property': {
+        'patterns': [
+            r'intellectual.*?property',
+            r'copyright.*?(?:ownership|rights)',
+            r'patent.*?(?:rights|ownership)',
+            r'trademark.*?(?:rights|ownership)',
+            r'proprietary.*?rights'
+        ],
+        'description': 'Addresses ownership of ideas and creative works'
+    }
+}
+
+MAX_CLAUSES = 8
+MIN_PARAGRAPH_LENGTH = 50
+MIN_SENTENCE_LENGTH = 20
+
+
+def _expand_piece(piece):
+    """All literal spellings of a pattern piece ('expir[ye]' -> expire, expiry)"""
+    spellings = ['']
+    for literal, char_class, group in re.findall(r'([^\[(]+)|\[([^\]]+)\]|\(\?:([^)]+)\)', piece):
+        options = [literal] if literal else list(char_class) if char_class else group.split('|')
+        spellings = [prefix + option for prefix in spellings for option in options]
+    return spellings
+
+
+def _trie_regex(words):
+    """Regex that matches the longest of `words` at a position, one branch per character"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = []
+        chars = []
+        for char in sorted(key for key in node if key):
+            rest = build(node[char])
+            if rest:
+                branches.append(re.escape(char) + rest)
+            else:
+                chars.append(re.escape(char))
+        if chars:
+            branches.append(chars[0] if len(chars) == 1 else '[' + ''.join(chars) + ']')
+        if not branches:
+            return ''
+        regex = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{regex})?' if '' in node else regex
+
+    return build(trie)
+
+
+def _compile_matcher(clause_patterns):
+    """Break every pattern into pieces and build one scanner for all of them.
+
+    Each piece is expanded into its literal spellings and all spellings are
+    merged into a single trie-shaped regex. The scanner is a zero-width
+    lookahead, so it stops at every position where a spelling (or a newline)
+    starts, including spellings that overlap an earlier one.
+    """
+    piece_ids = {}
+    sequences = []
+    compiled = []
+    for clause_type, clause_info in clause_patterns.items():
+        sequence_indexes = []
+        for pattern in clause_info['patterns']:
+            sequence = []
+            for piece in pattern.split('.*?'):
+                key = piece.lower()
+                if key not in piece_ids:
+                    piece_ids[key] = len(piece_ids)
+                sequence.append(piece_ids[key])
+            sequence_indexes.append(len(sequences))
+            sequences.append(tuple(sequence))
+        compiled.append((clause_type, clause_info['description'], sequence_indexes))
+
+    spellings = {}
+    for piece, piece_id in piece_ids.items():
+        for spelling in _expand_piece(piece):
+            spellings.setdefault(spelling, set()).add(piece_id)
+
+    # the scanner reports the longest spelling at a position; shorter
+    # spellings that are its prefixes ('trade' in 'trademark') match there too
+    found_by_spelling = {}
+    for spelling in spellings:
+        found = {}
+        for other, ids in spellings.items():
+            if spelling.startswith(other):
+                for piece_id in ids:
+                    found[piece_id] = len(other)
+        found_by_spelling[spelling] = found
+
+    scanner = f'(?=(\n|{_trie_regex(spellings)}))'
+
+    # sequences grouped by their first piece, so a sentence only checks candidates
+    by_first_piece = {}
+    for index, sequence in enumerate(sequences):
+        by_first_piece.setdefault(sequence[0], []).append((index, sequence))
+
+    return (re.compile(scanner), re.compile(scanner, re.IGNORECASE),
+            found_by_spelling, by_first_piece, compiled)
+
+
+(SCANNER, SCANNER_IGNORECASE, FOUND_BY_SPELLING,
+ SEQUENCES_BY_FIRST_PIECE, COMPILED_CLAUSES) = _compile_matcher(CLAUSE_PATTERNS)
+
+
+def _scan(document):
+    """Single pass over the text: (position, line, {piece_id: length}) per hit"""
+    if document.lowered_aligned:
+        scanner, lowered = SCANNER, document.lowered
+    else:
+        # lower() changed some offsets (rare non-ASCII case), match case-insensitively instead
+        scanner, lowered = SCANNER_IGNORECASE, document.text
+
+    hits = []
+    line = 0
+    for match in scanner.finditer(lowered):
+        spelling = match.group(1)
+        if spelling == '\n':
+            line += 1
+            continue
+        hits.append((match.start(), line, FOUND_BY_SPELLING[spelling.lower()]))
+    return hits
+
+
+def _split_sentences(document, hits):
+    """Kept sentences of each long enough paragraph, with their hits"""
+    text = document.text
+    kept = {index for index, (start, end) in enumerate(document.paragraphs) if end - start > MIN_PARAGRAPH_LENGTH}
+    paragraphs = {}
+    hit_index = 0
+    hit_count = len(hits)
+
+    for start, end, paragraph in document.sentences:
+        if paragraph not in kept:
+            continue
+        # skip hits that belong to earlier, discarded sentences
+        while hit_index < hit_count and hits[hit_index][0] < start:
+            hit_index += 1
+        first_hit = hit_index
+        while hit_index < hit_count and hits[hit_index][0] < end:
+            hit_index += 1
+        if end - start > MIN_SENTENCE_LENGTH and first_hit < hit_index:
+            paragraphs.setdefault(paragraph, []).append((text[start:end], hits[first_hit:hit_index]))
+
+    return list(paragraphs.values())
+
+
+def _sequence_matches(sequence, sentence_hits):
+    """True when the pieces appear in order on one line (same as re.search on 'A.*?B')"""
+    step = 0
+    line = None
+    position = 0
+    last = len(sequence) - 1
+    for start, hit_line, found in sentence_hits:
+        if step and hit_line != line:
+            # '.*?' cannot cross a newline; restart on the new line
+            step = 0
+        if step and start < position:
+            continue
+        length = found.get(sequence[step])
+        if length is None:
+            continue
+        if step == last:
+            return True
+        step += 1
+        line = hit_line
+        position = start + length
+    return False
+
+
+def _paragraph_matches(sentences):
+    """Map sequence index -> first two sentences of the paragraph it matches"""
+    matches = {}
+    for sentence, sentence_hits in sentences:
+        present = set()
+        for _, _, found in sentence_hits:
+            present.update(found)
+        for piece_id in present:
+            for index, sequence in SEQUENCES_BY_FIRST_PIECE.get(piece_id, ()):
+                if present.issuperset(sequence) and _sequence_matches(sequence, sentence_hits):
+                    relevant_sentences = matches.setdefault(index, [])
+                    if len(relevant_sentences) < 2:
+                        relevant_sentences.append(sentence)
+    return matches
+
+
+def iter_paragraphs(chunks):
+    """Yield text from an iterable of chunks (e.g. PDF pages) cut at paragraph breaks.
+
+    The unfinished tail paragraph is kept as a list of chunks and each chunk is
+    searched once, together with the whitespace before it (a break can span
+    two chunks), so the work is linear even when pages have no blank lines.
+    """
+    pending = []
+    for chunk in chunks:
+        tail = _trailing_whitespace(pending)
+        last_break = None
+        for last_break in PARAGRAPH_SEPARATOR.finditer(tail + chunk):
+            pass
+        if last_break is None:
+            pending.append(chunk)
+            continue
+        text = ''.join(pending) + chunk
+        # where tail + chunk starts in text
+        offset = len(text) - len(chunk) - len(tail)
+        yield text[:offset + last_break.start()]
+        pending = [text[offset + last_break.end():]]
+    text = ''.join(pending)
+    if text:
+        yield text
+
+
+def _trailing_whitespace(pieces):
+    """The whitespace that ends ''.join(pieces)"""
+    tail = []
+    for piece in reversed(pieces):
+        stripped = piece.rstrip()
+        tail.append(piece[len(stripped):])
+        if stripped:
+            break
+    return ''.join(reversed(tail))
+
+
+def _collect_matches(documents):
+    for document in documents:
+        document = parse_document(document)
+        for sentences in _split_sentences(document, _scan(document)):
+            matches = _paragraph_matches(sentences)
+            if matches:
+                yield matches
+
+
+def _build_clauses(paragraphs):
+    clauses = []
+
+    for clause_type, description, sequence_indexes in COMPILED_CLAUSES:
+        for matches in paragraphs:
+            for index in sequence_indexes:
+                relevant_sentences = matches.get(index)
+                if relevant_sentences:
+                    clauses.append({
+                        'type': clause_type,
+                        'content': '. '.join(relevant_sentences) + '.',
+                        'explanation': description
+                    })
+                    break
+
+        # Limit clauses to avoid overwhelming the user
+        if len(clauses) >= MAX_CLAUSES:
+            break
+
+    return clauses
+
+
+def find_key_clauses(text):
+    """Detect key clauses with one scan of the text and one sentence split
+
+    `text` may be a string or a ParsedDocument whose split is reused.
+    """
+    return _build_clauses(list(_collect_matches([text])))
+
+
+def find_key_clauses_in_chunks(chunks):
+    """Same result as find_key_clauses(''.join(chunks)), consuming chunks incrementally"""
+    return _build_clauses(list(_collect_matches(iter_paragraphs(chunks))))
@@ -0,0 +1,97 @@
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+PARAGRAPH = W + 'p'
+TEXT = W + 't'
+TABLE = W + 'tbl'
+TABLE_ROW = W + 'tr'
+TABLE_CELL = W + 'tc'
+
+# run content that python-docx's Paragraph.text renders as characters
+RUN_CHARACTERS = {W + 'tab': '\t', W + 'br': '\n', W + 'cr': '\n', W + 'noBreakHyphen': '-'}
+
+DOCUMENT_PART = 'word/document.xml'
+HEADER_PART = re.compile(r'word/header(\d*)\.xml$')
+FOOTER_PART = re.compile(r'word/footer(\d*)\.xml$')
+
+
+def _numbered_parts(names, pattern):
+    """Zip members matching pattern, in numeric order (header1, header2, ..., header10)"""
+    matches = [(int(match.group(1) or 0), name) for name in names for match in [pattern.match(name)] if match]
+    return [name for _, name in sorted(matches)]
+
+
+def _paragraph_text(paragraph):
+    parts = []
+    for element in paragraph.iter():
+        if element.tag == TEXT:
+            if element.text:
+                parts.append(element.text)
+        else:
+            char = RUN_CHARACTERS.get(element.tag)
+            if char:
+                parts.append(char)
+    return ''.join(parts)
+
+
+def iter_part_lines(stream):
+    """Text lines of one WordprocessingML part, streamed with iterparse.
+
+    Every paragraph is one line; a table row is one line with its cells
+    separated by tabs. Elements are cleared as soon as they have been read,
+    so memory stays flat however long the document is.
+    """
+    cells = []  # paragraph texts of the table cell being read, per open cell
+    rows = []   # cell texts of the table row being read, per open row
+    stack = []
+    for event, element in iterparse(stream, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            if tag == TABLE_ROW:
+                rows.append([])
+            elif tag == TABLE_CELL:
+                cells.append([])
+            stack.append(element)
+            continue
+
+        stack.pop()
+        if tag == PARAGRAPH:
+            text = _paragraph_text(element)
+            if cells:
+                cells[-1].append(text)
+            else:
+                yield text
+        elif tag == TABLE_CELL:
+            text = ' '.join(line for line in cells.pop() if line)
+            if rows:
+                rows[-1].append(text)
+        elif tag == TABLE_ROW:
+            text = '\t'.join(rows.pop())
+            if cells:
+                cells[-1].append(text)
+            else:
+                yield text
+        elif tag != TABLE:
+            continue
+
+        # drop what has been read; nested paragraphs (text boxes) are then not read twice
+        element.clear()
+        if stack:
+            stack[-1].remove(element)
+
+
+def iter_docx_lines(source):
+    """Text lines of a DOCX (path or file-like): headers, then the body, then footers"""
+    with zipfile.ZipFile(source) as archive:
+        names = archive.namelist()
+        parts = _numbered_parts(names, HEADER_PART) + [DOCUMENT_PART] + _numbered_parts(names, FOOTER_PART)
+        for name in parts:
+            with archive.open(name) as stream:
+                yield from iter_part_lines(stream)
+
+
+def docx_text(source):
+    """All text of a DOCX, one line per paragraph or table row"""
+    return '\n'.join(iter_docx_lines(source)) + '\n'
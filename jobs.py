@@ -0,0 +1,287 @@
+import json
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+# Job states reported by /api/jobs/<id>
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_SUCCESS = 'success'
+JOB_ERROR = 'error'
+FINISHED_STATES = (JOB_SUCCESS, JOB_ERROR)
+
+# Error recorded for jobs whose worker process went away before they finished
+INTERRUPTED_ERROR = 'Job was interrupted before it finished; please upload the document again'
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _age(timestamp):
+    """Seconds since a timestamp; naive values (SQLite drops the zone) are UTC"""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return (_now() - timestamp).total_seconds()
+
+
+class InMemoryJobBackend:
+    """Keeps job records in a process-local dict (tests, single worker).
+
+    Finished jobs, results included, are dropped `ttl` seconds after they
+    finish, and the oldest finished ones go first once more than `max_jobs`
+    records are kept. Pending and running jobs are never evicted.
+    """
+
+    def __init__(self, ttl=3600, max_jobs=1000):
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, job_id, user_id=None, filename=None):
+        with self._lock:
+            self._evict()
+            self._jobs[job_id] = {
+                'id': job_id,
+                'user_id': user_id,
+                'filename': filename,
+                'status': JOB_PENDING,
+                'progress': 0,
+                'stage': 'queued',
+                'result': None,
+                'error': None,
+                'created_at': _now(),
+                'updated_at': _now(),
+            }
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            job['updated_at'] = _now()
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def touch(self, job_ids):
+        """Mark unfinished jobs as alive (see JobQueue's heartbeat)"""
+        with self._lock:
+            for job_id in job_ids:
+                job = self._jobs.get(job_id)
+                if job is not None and job['status'] not in FINISHED_STATES:
+                    job['updated_at'] = _now()
+
+    def _evict(self):
+        # callers hold self._lock; records are in creation order, so the oldest come first
+        finished = [job_id for job_id, job in self._jobs.items() if job['status'] in FINISHED_STATES]
+        expired = [job_id for job_id in finished if _age(self._jobs[job_id]['updated_at']) > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+        # leave room for the job being created
+        excess = len(self._jobs) + 1 - self.max_jobs
+        for job_id in [job_id for job_id in finished if job_id in self._jobs][:max(excess, 0)]:
+            del self._jobs[job_id]
+
+
+class DatabaseJobBackend:
+    """Stores job records in the processing_job table so every gunicorn
+    worker (SQLite or Postgres) sees the same job state.
+
+    Jobs still run on the thread pool of the worker that accepted them and
+    their input is not persisted, so a job whose worker dies cannot be
+    requeued. The worker's JobQueue refreshes updated_at of its queued and
+    running jobs every heartbeat, so pending or running jobs not updated for
+    `stale_after` seconds belong to a worker that is gone; they are reported
+    (and stored) as failed instead of staying pending forever; see
+    fail_stale_jobs().
+    """
+
+    def __init__(self, db, model, app, stale_after=3600):
+        self.db = db
+        self.model = model
+        self.app = app
+        self.stale_after = stale_after
+
+    def create(self, job_id, user_id=None, filename=None):
+        with self.app.app_context():
+            job = self.model(id=job_id, user_id=user_id, filename=filename,
+                             status=JOB_PENDING, progress=0, stage='queued')
+            self.db.session.add(job)
+            self.db.session.commit()
+
+    def update(self, job_id, **fields):
+        with self.app.app_context():
+            try:
+                job = self.db.session.get(self.model, job_id)
+                if job is None:
+                    return
+                if 'result' in fields:
+                    fields['result'] = json.dumps(fields['result']) if fields['result'] is not None else None
+                if 'error' in fields:
+                    fields['error_message'] = fields.pop('error')
+                for key, value in fields.items():
+                    setattr(job, key, value)
+                job.updated_at = _now()
+                self.db.session.commit()
+            except Exception:
+                self.db.session.rollback()
+                raise
+
+    def get(self, job_id):
+        with self.app.app_context():
+            job = self.db.session.get(self.model, job_id)
+            if job is None:
+                return None
+            if job.status not in FINISHED_STATES and _age(job.updated_at) > self.stale_after:
+                try:
+                    job.status, job.stage, job.error_message = JOB_ERROR, 'failed', INTERRUPTED_ERROR
+                    job.updated_at = _now()
+                    self.db.session.commit()
+                except Exception:
+                    self.db.session.rollback()
+                    raise
+            return {
+                'id': job.id,
+                'user_id': job.user_id,
+                'filename': job.filename,
+                'status': job.status,
+                'progress': job.progress,
+                'stage': job.stage,
+                'result': json.loads(job.result) if job.result else None,
+                'error': job.error_message,
+                'created_at': job.created_at,
+                'updated_at': job.updated_at,
+            }
+
+    def touch(self, job_ids):
+        """Mark unfinished jobs as alive (see JobQueue's heartbeat)"""
+        with self.app.app_context():
+            try:
+                self.db.session.execute(
+                    update(self.model)
+                    .where(self.model.id.in_(job_ids), self.model.status.notin_(FINISHED_STATES))
+                    .values(updated_at=_now())
+                )
+                self.db.session.commit()
+            except Exception:
+                self.db.session.rollback()
+                raise
+
+    def fail_stale_jobs(self):
+        """Mark jobs left pending or running by a worker that died as failed; returns how many"""
+        cutoff = _now() - timedelta(seconds=self.stale_after)
+        with self.app.app_context():
+            try:
+                result = self.db.session.execute(
+                    update(self.model)
+                    .where(self.model.status.notin_(FINISHED_STATES), self.model.updated_at < cutoff)
+                    .values(status=JOB_ERROR, stage='failed', error_message=INTERRUPTED_ERROR, updated_at=_now())
+                )
+                self.db.session.commit()
+            except Exception:
+                self.db.session.rollback()
+                raise
+        return result.rowcount
+
+
+class JobQueue:
+    """Runs document processing jobs on a local thread pool.
+
+    Job functions are called as ``func(report_progress, *args, **kwargs)``
+    where ``report_progress(percent, stage)`` updates the stored job. The
+    return value becomes the job result; exceptions mark the job as failed.
+
+    Every `heartbeat_interval` seconds a background thread touches the jobs
+    this queue has accepted and not finished, so a job busy in one long stage
+    is not taken for one whose worker died (see DatabaseJobBackend).
+    """
+
+    def __init__(self, backend, max_workers=2, app=None, heartbeat_interval=60):
+        self.backend = backend
+        self.app = app
+        self.heartbeat_interval = heartbeat_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='legalease-job')
+        self._active = set()  # ids of jobs queued or running here
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._heartbeat = threading.Thread(target=self._beat, name='legalease-job-heartbeat', daemon=True)
+        self._heartbeat.start()
+
+    def submit(self, func, *args, user_id=None, filename=None, **kwargs):
+        job_id = uuid.uuid4().hex
+        self.backend.create(job_id, user_id=user_id, filename=filename)
+        with self._lock:
+            self._active.add(job_id)
+        try:
+            self._executor.submit(self._run, job_id, func, args, kwargs)
+        except Exception:
+            with self._lock:
+                self._active.discard(job_id)
+            raise
+        return job_id
+
+    def get(self, job_id):
+        return self.backend.get(job_id)
+
+    def shutdown(self, wait=True):
+        self._stopped.set()
+        self._executor.shutdown(wait=wait)
+
+    def _beat(self):
+        while not self._stopped.wait(self.heartbeat_interval):
+            with self._lock:
+                job_ids = list(self._active)
+            if not job_ids:
+                continue
+            try:
+                self.backend.touch(job_ids)
+            except Exception as e:
+                logging.warning(f"Job heartbeat failed: {str(e)}")
+
+    def _run(self, job_id, func, args, kwargs):
+        try:
+            self._run_job(job_id, func, args, kwargs)
+        finally:
+            with self._lock:
+                self._active.discard(job_id)
+
+    def _run_job(self, job_id, func, args, kwargs):
+        def report_progress(percent, stage):
+            self.backend.update(job_id, progress=int(percent), stage=stage)
+
+        self.backend.update(job_id, status=JOB_RUNNING, stage='started')
+        try:
+            if self.app is not None:
+                with self.app.app_context():
+                    result = func(report_progress, *args, **kwargs)
+            else:
+                result = func(report_progress, *args, **kwargs)
+            self.backend.update(job_id, status=JOB_SUCCESS, progress=100, stage='done', result=result)
+        except Exception as e:
+            logging.error(f"Job {job_id} failed: {str(e)}")
+            self.backend.update(job_id, status=JOB_ERROR, stage='failed', error=str(e))
+
+
+def serialize_job(job):
+    """Convert a job record into the JSON shape returned by /api/jobs/<id>"""
+    return {
+        'job_id': job['id'],
+        'status': job['status'],
+        'progress': job['progress'],
+        'stage': job['stage'],
+        'filename': job['filename'],
+        'result': job['result'],
+        'error': job['error'],
+        'created_at': job['created_at'].strftime('%Y-%m-%d %H:%M:%S') if job['created_at'] else None,
+        'updated_at': job['updated_at'].strftime('%Y-%m-%d %H:%M:%S') if job['updated_at'] else None,
+    }
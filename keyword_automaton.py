@@ -0,0 +1,87 @@
+import re
+from collections import Counter
+from itertools import product
+
+
+def _trie_pattern(keywords):
+    """Regex for the keywords, factored into a trie so each position is tried once per branch"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # optional tails are greedy, so the longest keyword at a position wins
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordAutomaton:
+    """Finds the keywords of several keyword tables in one pass over a text.
+
+    `tables` maps a table name to {category: [keywords]}. All keywords are
+    compiled into one trie-shaped regex behind a lookahead, so the scan
+    visits every position once and reports the longest keyword starting
+    there; the shorter keywords that are prefixes of it are added from a
+    table built here. Matching is on substrings of lowercased text, exactly
+    like `keyword in text.lower()`, and overlapping occurrences all count.
+    Keywords of the tables named in `whole_words` only count as whole words,
+    like re.search(r'\\bkeyword\\b'), so 'rent' is not found in 'current'.
+
+    scan() returns a Counter keyed by (table, category).
+    """
+
+    def __init__(self, tables, whole_words=()):
+        self.labels = {}       # keyword -> [(table, category), ...] matched as substrings
+        self.word_labels = {}  # keyword -> [(table, category), ...] matched as whole words
+        for table, categories in tables.items():
+            labels = self.word_labels if table in whole_words else self.labels
+            for category, keywords in categories.items():
+                for keyword in keywords:
+                    labels.setdefault(keyword, []).append((table, category))
+        keywords = self.labels.keys() | self.word_labels.keys()
+
+        # every label reached when a keyword matches: its own and those of its prefixes
+        self._matches = {
+            keyword: tuple(label for prefix in self.labels if keyword.startswith(prefix) for label in self.labels[prefix])
+            for keyword in keywords
+        }
+        # whole-word labels by whether the text has a word character before and after the keyword:
+        # those of prefixes with a word boundary after them inside the keyword, plus its own when
+        # there is one after it in the text too
+        self._word_matches = {}
+        for keyword in keywords:
+            inner = tuple(label for prefix in self.word_labels
+                          if keyword.startswith(prefix) and len(prefix) < len(keyword)
+                          and _is_word(prefix[-1]) != _is_word(keyword[len(prefix)])
+                          for label in self.word_labels[prefix])
+            for before, after in product((False, True), repeat=2):
+                labels = ()
+                if before != _is_word(keyword[0]):
+                    labels = inner
+                    if after != _is_word(keyword[-1]):
+                        labels += tuple(self.word_labels.get(keyword, ()))
+                self._word_matches[keyword, before, after] = labels
+        # groups: the keyword, the word character after it, the word character before it (looked
+        # behind only where a keyword starts, which keeps the scan of other positions as cheap)
+        self._pattern = re.compile(r'(?=(%s)(\w)?)(?:(?<=(\w)))?' % _trie_pattern(keywords))
+
+    def scan(self, text):
+        """Counter of (table, category) -> keyword occurrences in an already lowercased text"""
+        hits = Counter()
+        # most occurrences repeat a few (before, keyword, after) combinations; count those in C first
+        for (keyword, after, before), count in Counter(self._pattern.findall(text)).items():
+            for label in self._matches[keyword] + self._word_matches[keyword, bool(before), bool(after)]:
+                hits[label] += count
+        return hits
+
+
+def _is_word(char):
+    return re.match(r'\w', char) is not None
@@ -0,0 +1,105 @@
+import numpy as np
+from sumy.summarizers.lsa import LsaSummarizer
+
+
+class SparseLsaSummarizer(LsaSummarizer):
+    """sumy's LsaSummarizer with a sparse, truncated SVD path for long documents.
+
+    sumy builds a dense |words| x |sentences| matrix, smooths it with two
+    Python loops over every cell and runs a full SVD, which is quadratic in
+    memory and cubic in time. From `min_sentences` sentences on, this class
+    keeps the term counts as coordinate arrays instead. The smoothed matrix
+    (0.4 on every cell of a non-empty column plus 0.6 * normalized counts) is
+    applied as "rank one + sparse", and a randomized SVD computes only the
+    components needed for `sentences_count`. Shorter documents use sumy's
+    exact implementation.
+    """
+
+    SMOOTH = 0.4  # same smoothing as LsaSummarizer._compute_term_frequency
+    OVERSAMPLES = 10
+    POWER_ITERATIONS = 2
+
+    def __init__(self, stemmer, min_sentences=200, seed=0):
+        super().__init__(stemmer)
+        self.min_sentences = min_sentences
+        self.seed = seed
+
+    def __call__(self, document, sentences_count):
+        sentences = document.sentences
+        if len(sentences) < self.min_sentences:
+            return super().__call__(document, sentences_count)
+
+        counts = self._sparse_counts(sentences)
+        if counts is None:
+            return ()
+
+        dimensions = max(LsaSummarizer.MIN_DIMENSIONS, sentences_count)
+        sigma, v = self._truncated_svd(counts, dimensions)
+        ranks = iter(np.sqrt((sigma[:, None] ** 2 * v ** 2).sum(axis=0)))
+        return self._get_best_sentences(sentences, sentences_count, lambda s: next(ranks))
+
+    def _sparse_counts(self, sentences):
+        """Term counts as (rows, cols, values, shape), built like sumy's matrix"""
+        stems = {}
+
+        def stem(word):
+            stemmed = stems.get(word)
+            if stemmed is None:
+                stemmed = stems[word] = self.stem_word(word)
+            return stemmed
+
+        sentence_words = [sentence.words for sentence in sentences]
+        dictionary = {}
+        for words in sentence_words:
+            for word in words:
+                if self.normalize_word(word) not in self._stop_words:
+                    dictionary.setdefault(stem(word), len(dictionary))
+        if not dictionary:
+            return None
+
+        rows = []
+        cols = []
+        for col, words in enumerate(sentence_words):
+            for word in words:
+                row = dictionary.get(stem(word))
+                if row is not None:
+                    rows.append(row)
+                    cols.append(col)
+
+        # merge duplicate (term, sentence) pairs into counts
+        shape = (len(dictionary), len(sentences))
+        keys, values = np.unique(np.array(rows, dtype=np.int64) * shape[1] + np.array(cols, dtype=np.int64),
+                                 return_counts=True)
+        return keys // shape[1], keys % shape[1], values.astype(np.float64), shape
+
+    def _truncated_svd(self, counts, dimensions):
+        """Top `dimensions` singular values and right singular vectors of the smoothed matrix"""
+        rows, cols, values, (n_words, n_sentences) = counts
+
+        # per-sentence max-frequency normalization; empty sentences stay all zero
+        column_max = np.zeros(n_sentences)
+        np.maximum.at(column_max, cols, values)
+        non_empty = (column_max > 0).astype(np.float64)
+        values = (1.0 - self.SMOOTH) * values / column_max[cols]
+
+        def matmul(block):
+            # A @ block for A = SMOOTH * ones x non_empty + sparse values
+            result = np.zeros((n_words, block.shape[1]))
+            np.add.at(result, rows, values[:, None] * block[cols])
+            return result + self.SMOOTH * (non_empty @ block)
+
+        def rmatmul(block):
+            # A.T @ block
+            result = np.zeros((n_sentences, block.shape[1]))
+            np.add.at(result, cols, values[:, None] * block[rows])
+            return result + self.SMOOTH * np.outer(non_empty, block.sum(axis=0))
+
+        size = min(dimensions + self.OVERSAMPLES, n_words, n_sentences)
+        rng = np.random.default_rng(self.seed)
+        q, _ = np.linalg.qr(matmul(rng.standard_normal((n_sentences, size))))
+        for _ in range(self.POWER_ITERATIONS):
+            q, _ = np.linalg.qr(rmatmul(q))
+            q, _ = np.linalg.qr(matmul(q))
+
+        _, sigma, v = np.linalg.svd(rmatmul(q).T, full_matrices=False)
+        return sigma[:dimensions], v[:dimensions]
@@ -14,6 +14,9 @@ def create_models(db):
             db.Model.ProcessingLog,
             db.Model.DocumentEvaluation,
             db.Model.ClauseEvaluation,
+            db.Model.ProcessingJob,
+            db.Model.CaptureSession,
+            db.Model.CapturePage,
         )
 
     class User(db.Model, UserMixin):
@@ -32,6 +35,9 @@ def create_models(db):
 
     class Document(db.Model):
         """Model for storing document information and summaries"""
+        # history and dashboard list a user's documents newest first
+        __table_args__ = (db.Index('ix_document_user_upload_date', 'user_id', 'upload_date'),)
+
         id = db.Column(db.Integer, primary_key=True)
         user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
         filename = db.Column(db.String(255), nullable=False)
@@ -52,7 +58,7 @@ def create_models(db):
     class KeyClause(db.Model):
         """Model for storing identified key clauses"""
         id = db.Column(db.Integer, primary_key=True)
-        document_id = db.Column(db.Integer, db.ForeignKey('document.id'), nullable=False)
+        document_id = db.Column(db.Integer, db.ForeignKey('document.id'), nullable=False, index=True)
         clause_type = db.Column(db.String(100), nullable=False)
         content = db.Column(db.Text, nullable=False)
         explanation = db.Column(db.Text)
@@ -62,9 +68,11 @@ def create_models(db):
 
     class ProcessingLog(db.Model):
         """Model for logging processing activities"""
+        __table_args__ = (db.Index('ix_processing_log_user_timestamp', 'user_id', 'timestamp'),)
+
         id = db.Column(db.Integer, primary_key=True)
         user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
-        document_id = db.Column(db.Integer, db.ForeignKey('document.id'), nullable=True)
+        document_id = db.Column(db.Integer, db.ForeignKey('document.id'), nullable=True, index=True)
         file_name = db.Column(db.String(255))
         action = db.Column(db.String(100), nullable=False)  # upload, summarize, explain
         status = db.Column(db.String(20), nullable=False)   # success, error
@@ -78,7 +86,7 @@ def create_models(db):
     class DocumentEvaluation(db.Model):
         """Model for storing document quality evaluations"""
         id = db.Column(db.Integer, primary_key=True)
-        document_id = db.Column(db.Integer, db.ForeignKey('document.id'), nullable=False)
+        document_id = db.Column(db.Integer, db.ForeignKey('document.id'), nullable=False, index=True)
         evaluator_name = db.Column(db.String(255))  # Name of evaluator (lawyer, QA, etc)
         
         # Scoring dimensions (1-5 scale)
@@ -90,7 +98,10 @@ def create_models(db):
         # Overall score and notes
         overall_score = db.Column(db.Float)  # Average of the above
         notes = db.Column(db.Text)  # Evaluator comments
-        evaluation_date = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+        evaluation_date = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+        
+        # evaluation lists only need the filename; callers eager-load it with joinedload
+        document = db.relationship('Document', lazy=True)
         
         def __repr__(self):
             return f'<DocumentEvaluation doc_id={self.document_id} score={self.overall_score}>'
@@ -98,7 +109,8 @@ def create_models(db):
     class ClauseEvaluation(db.Model):
         """Model for storing per-clause evaluation results"""
         id = db.Column(db.Integer, primary_key=True)
-        document_evaluation_id = db.Column(db.Integer, db.ForeignKey('document_evaluation.id'), nullable=False)
+        document_evaluation_id = db.Column(db.Integer, db.ForeignKey('document_evaluation.id'), nullable=False,
+                                           index=True)
         key_clause_id = db.Column(db.Integer, db.ForeignKey('key_clause.id'), nullable=False)
         
         # Was this clause correctly identified?
@@ -111,6 +123,47 @@ def create_models(db):
         def __repr__(self):
             return f'<ClauseEvaluation evaluation_id={self.document_evaluation_id}>'
 
+    class ProcessingJob(db.Model):
+        """Model for tracking asynchronous upload processing jobs"""
+        id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+        user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+        filename = db.Column(db.String(255))
+        status = db.Column(db.String(20), nullable=False)  # pending, running, success, error
+        progress = db.Column(db.Integer, default=0)  # 0-100
+        stage = db.Column(db.String(50))  # extract, summarize, store, done
+        result = db.Column(db.Text)  # JSON encoded upload response
+        error_message = db.Column(db.Text)
+        created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+        updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+        def __repr__(self):
+            return f'<ProcessingJob {self.id} - {self.status}>'
+
+    class CaptureSession(db.Model):
+        """Model for an open multi-page camera capture (see DatabaseCaptureBackend)"""
+        id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+        user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+        page_count = db.Column(db.Integer, nullable=False, default=0)
+        created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+        updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+
+        def __repr__(self):
+            return f'<CaptureSession {self.id} - {self.page_count} pages>'
+
+    class CapturePage(db.Model):
+        """Model for the OCR state and text of one page of a capture session"""
+        session_id = db.Column(db.String(32), db.ForeignKey('capture_session.id'), primary_key=True)
+        page = db.Column(db.Integer, primary_key=True)  # 0-based
+        status = db.Column(db.String(20), nullable=False, default='pending')  # pending, done, error
+        text = db.Column(db.Text)
+        error_message = db.Column(db.Text)
+        size = db.Column(db.Integer, nullable=False, default=0)  # decoded image bytes
+        revision = db.Column(db.String(32))  # uuid4 hex of the latest upload of this page
+        updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+        def __repr__(self):
+            return f'<CapturePage {self.session_id}:{self.page} - {self.status}>'
+
     # cache classes on the base so subsequent calls return them
     db.Model._initialized_models = True
     db.Model.User = User
@@ -119,5 +172,9 @@ def create_models(db):
     db.Model.ProcessingLog = ProcessingLog
     db.Model.DocumentEvaluation = DocumentEvaluation
     db.Model.ClauseEvaluation = ClauseEvaluation
-    
-    return User, Document, KeyClause, ProcessingLog, DocumentEvaluation, ClauseEvaluation
+    db.Model.ProcessingJob = ProcessingJob
+    db.Model.CaptureSession = CaptureSession
+    db.Model.CapturePage = CapturePage
+
+    return (User, Document, KeyClause, ProcessingLog, DocumentEvaluation, ClauseEvaluation, ProcessingJob,
+            CaptureSession, CapturePage)
@@ -0,0 +1,207 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# numpy and PIL are imported inside the functions that use them, so that
+# importing this module (and utils) does not load them
+
+# Camera captures carry no reliable DPI, so a capture is assumed to show a page
+# this wide; the image is scaled down to target_dpi across that width
+PAGE_WIDTH_INCHES = 8.5
+
+# Skew is estimated on a copy DESKEW_SAMPLE_WIDTH pixels wide, trying angles up
+# to DESKEW_MAX_ANGLE degrees either way in DESKEW_STEP increments
+DESKEW_SAMPLE_WIDTH = 800
+DESKEW_MAX_ANGLE = 5.0
+DESKEW_STEP = 0.25
+
+# Perceptual hash: difference hash of a HASH_SIZE x HASH_SIZE grayscale thumbnail
+# (HASH_SIZE ** 2 bits). Recaptures of one page differ in far fewer bits than
+# two different pages.
+HASH_SIZE = 32
+
+# LSTM engine, one uniform block of text, characters found in legal documents.
+# pytesseract splits the config with shlex, so the quote characters are escaped.
+TESSERACT_CONFIG = r'--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz.,;:!?()[]{}\"-' + "\\'"
+
+
+def otsu_threshold(histogram):
+    """Gray level that best separates ink from paper (Otsu's method on a 256-bin histogram)"""
+    import numpy as np
+
+    counts = np.asarray(histogram[:256], dtype=np.float64)
+    levels = np.arange(256)
+    weight = np.cumsum(counts)
+    total = weight[-1]
+    if total == 0:
+        return 128
+    mass = np.cumsum(counts * levels)
+    background = weight[:-1]
+    foreground = total - background
+    valid = (background > 0) & (foreground > 0)
+    if not valid.any():
+        return 128
+    mean_background = mass[:-1] / np.where(valid, background, 1)
+    mean_foreground = (mass[-1] - mass[:-1]) / np.where(valid, foreground, 1)
+    between = np.where(valid, background * foreground * (mean_background - mean_foreground) ** 2, -1)
+    return int(np.argmax(between))
+
+
+def estimate_skew(gray, threshold):
+    """Angle in degrees (counterclockwise, as Image.rotate takes it) that levels the text lines.
+
+    Ink pixels of a small copy are projected onto the vertical axis at each
+    candidate angle; text lines are level where that projection is sharpest.
+    """
+    import numpy as np
+
+    sample = gray.reduce(max(1, gray.width // DESKEW_SAMPLE_WIDTH))
+    ys, xs = np.nonzero(np.asarray(sample) <= threshold)
+    if ys.size < 2:
+        return 0.0
+
+    angles = np.arange(-DESKEW_MAX_ANGLE, DESKEW_MAX_ANGLE + DESKEW_STEP / 2, DESKEW_STEP)
+    best_angle, best_score = 0.0, -1.0
+    for angle in angles:
+        rows = np.round(ys - xs * np.tan(np.radians(angle))).astype(np.int64)
+        profile = np.bincount(rows - rows.min())
+        score = float(np.dot(profile, profile))
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+
+def preprocess(image, target_dpi=300):
+    """Grayscale, downscaled, deskewed and binarized copy of a camera capture.
+
+    JPEGs at least twice the target size are decoded directly at a reduced
+    scale (1/2, 1/4 or 1/8), so such captures are never decoded in full.
+    """
+    from PIL import Image
+
+    target_width = int(PAGE_WIDTH_INCHES * target_dpi)
+    if image.width > target_width:
+        scale = target_width / image.width
+        target_size = (target_width, max(1, round(image.height * scale)))
+        if image.format == 'JPEG':
+            image.draft('L', target_size)
+
+    gray = image.convert('L')
+    if gray.width > target_width:
+        gray = gray.resize((target_width, max(1, round(gray.height * target_width / gray.width))),
+                           Image.BILINEAR, reducing_gap=2.0)
+
+    threshold = otsu_threshold(gray.histogram())
+    angle = estimate_skew(gray, threshold)
+    if abs(angle) >= DESKEW_STEP:
+        gray = gray.rotate(angle, resample=Image.BILINEAR, expand=True, fillcolor=255)
+
+    return gray.point([0 if level <= threshold else 255 for level in range(256)])
+
+
+def split_bands(image, tile_height):
+    """Horizontal bands about tile_height tall, cut on the emptiest row nearest each boundary
+    so that no text line is split between two bands"""
+    import numpy as np
+
+    ink = (np.asarray(image) == 0).sum(axis=1)
+    window = max(1, tile_height // 4)
+    cuts = [0]
+    while image.height - cuts[-1] > tile_height + window:
+        target = cuts[-1] + tile_height
+        low = target - window
+        rows = ink[low:target + window]
+        emptiest = np.flatnonzero(rows == rows.min())
+        cuts.append(low + int(emptiest[np.argmin(np.abs(emptiest - window))]))
+    cuts.append(image.height)
+    return [image.crop((0, top, image.width, bottom)) for top, bottom in zip(cuts, cuts[1:]) if bottom > top]
+
+
+def _ocr_band(band):
+    import pytesseract
+    return pytesseract.image_to_string(band, config=TESSERACT_CONFIG)
+
+
+def recognize(image, target_dpi=300, tile_height=1200, workers=0):
+    """OCR text of a PIL image.
+
+    The image is preprocessed once; images taller than two tiles are split
+    into line-aligned bands that are recognized concurrently. Each band runs
+    in its own tesseract process, so threads are enough to use every core
+    (workers=0 means one per CPU).
+    """
+    page = preprocess(image, target_dpi)
+    bands = split_bands(page, tile_height) if page.height > 2 * tile_height else [page]
+
+    workers = min(workers or os.cpu_count() or 1, len(bands))
+    if workers <= 1:
+        return '\n'.join(_ocr_band(band) for band in bands)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='legalease-ocr') as pool:
+        return '\n'.join(pool.map(_ocr_band, bands))
+
+
+def perceptual_hash(image):
+    """Difference hash of an image as an int; pass a freshly opened image, JPEGs are drafted small"""
+    import numpy as np
+    from PIL import Image
+
+    if image.format == 'JPEG':
+        image.draft('L', (HASH_SIZE * 8, HASH_SIZE * 8))
+    thumbnail = np.asarray(image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.BILINEAR), dtype=np.int16)
+    bits = thumbnail[:, 1:] > thumbnail[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+class OcrCache:
+    """OCR text keyed by perceptual hash, with near-duplicate matching of recent frames.
+
+    Exact hash matches come from `cache` (see cache.create_cache). Frames
+    recognized in this process during the last `window` seconds are also
+    matched by Hamming distance, so a resent or slightly moved capture of
+    the same page reuses its text. Both are limited to the same `scope`
+    (the user): a perceptual hash identifies what an image looks like, not
+    the image itself, so one user's text is never served for another's
+    capture.
+    """
+
+    def __init__(self, cache, window=10.0, max_distance=120, max_recent=64):
+        self.cache = cache
+        self.window = window
+        self.max_distance = max_distance
+        self._recent = deque(maxlen=max_recent)  # (time, scope, hash, text)
+        self._lock = threading.Lock()
+        self.near_duplicate_hits = 0
+
+    @staticmethod
+    def _key(image_hash, scope):
+        return f'{scope}:{image_hash:x}'
+
+    def get(self, image_hash, scope=None):
+        text = self.cache.get(self._key(image_hash, scope))
+        if text is not None or not self.window:
+            return text
+
+        now = time.monotonic()
+        with self._lock:
+            for seen_at, seen_scope, seen_hash, seen_text in reversed(self._recent):
+                if now - seen_at > self.window:
+                    break
+                if seen_scope == scope and (image_hash ^ seen_hash).bit_count() <= self.max_distance:
+                    self.near_duplicate_hits += 1
+                    return seen_text
+        return None
+
+    def set(self, image_hash, text, scope=None):
+        self.cache.set(self._key(image_hash, scope), text)
+        with self._lock:
+            self._recent.append((time.monotonic(), scope, image_hash, text))
+
+    def stats(self):
+        stats = self.cache.stats()
+        with self._lock:
+            stats['near_duplicate_hits'] = self.near_duplicate_hits
+        stats['near_duplicate_window'] = self.window
+        return stats
@@ -0,0 +1,88 @@
+import re
+from functools import cached_property
+
+PARAGRAPH_SEPARATOR = re.compile(r'\n\s*\n')
+SENTENCE_SEPARATOR = re.compile(r'[.!?]+')
+# the text between two separators with surrounding whitespace removed, i.e. one
+# stripped sentence (re's \s and str.strip() agree on what whitespace is)
+SENTENCE = re.compile(r'[^.!?\s](?:[^.!?]*[^.!?\s])?')
+
+
+def _stripped_span(text, start, end):
+    """(start, end) of text[start:end] without surrounding whitespace"""
+    segment = text[start:end]
+    stripped = segment.strip()
+    if not stripped:
+        return None
+    start += len(segment) - len(segment.lstrip())
+    return start, start + len(stripped)
+
+
+class ParsedDocument:
+    """A document's text split once and shared by every analysis step.
+
+    Paragraphs are separated by blank lines and sentences by runs of
+    '.', '!' or '?' inside a paragraph; both are kept as (start, end)
+    offsets into `text` with surrounding whitespace removed. Each view is
+    computed on first use and reused afterwards, so the summarizer, the
+    clause detector and the document type detector share one split, one
+    lowercased copy and one word count.
+    """
+
+    def __init__(self, text):
+        self.text = text
+
+    @cached_property
+    def lowered(self):
+        return self.text.lower()
+
+    @cached_property
+    def lowered_aligned(self):
+        """True when `lowered` has the same offsets as `text` (lower() can change lengths)"""
+        return len(self.lowered) == len(self.text)
+
+    @cached_property
+    def paragraphs(self):
+        """(start, end) of every non-empty paragraph"""
+        text = self.text
+        spans = []
+        start = 0
+        for separator in PARAGRAPH_SEPARATOR.finditer(text):
+            span = _stripped_span(text, start, separator.start())
+            if span:
+                spans.append(span)
+            start = separator.end()
+        span = _stripped_span(text, start, len(text))
+        if span:
+            spans.append(span)
+        return spans
+
+    @cached_property
+    def sentences(self):
+        """(start, end, paragraph index) of every non-empty sentence"""
+        finditer = SENTENCE.finditer
+        return [
+            (match.start(), match.end(), index)
+            for index, (start, end) in enumerate(self.paragraphs)
+            for match in finditer(self.text, start, end)
+        ]
+
+    @cached_property
+    def word_count(self):
+        # paragraph separators are whitespace only, so this equals len(text.split())
+        return sum(len(self.text[start:end].split()) for start, end in self.paragraphs)
+
+    def sentence_texts(self, min_length=0):
+        """Sentence strings longer than min_length characters"""
+        return [self.text[start:end] for start, end, _ in self.sentences if end - start > min_length]
+
+    def lowered_sentence_texts(self, min_length=0):
+        """Same as sentence_texts(), lowercased"""
+        if self.lowered_aligned:
+            return [self.lowered[start:end] for start, end, _ in self.sentences if end - start > min_length]
+        return [sentence.lower() for sentence in self.sentence_texts(min_length)]
+
+
+def parse_document(text):
+    """Return `text` as a ParsedDocument, reusing it if it already is one"""
+    return text if isinstance(text, ParsedDocument) else ParsedDocument(text)
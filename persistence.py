@@ -0,0 +1,40 @@
+from sqlalchemy import insert
+
+
+def save_documents(session, Document, KeyClause, entries):
+    """Insert documents with their key clauses in one transaction.
+
+    Each entry is a dict with 'document' (Document column values) and
+    'clauses' (KeyClause column values, without document_id). Rows of each
+    table are written with a single executemany INSERT, so an upload costs
+    two statements and one commit however many clauses it has. Processing
+    logs go through the audit log writer instead. Returns the new document
+    ids in entry order.
+    """
+    if not entries:
+        return []
+
+    # render_nulls keeps rows with different None columns in the same executemany batch
+    options = {'render_nulls': True}
+
+    try:
+        document_ids = session.scalars(
+            insert(Document).returning(Document.id, sort_by_parameter_order=True),
+            [entry['document'] for entry in entries],
+            execution_options=options
+        ).all()
+
+        clause_rows = [
+            {**clause, 'document_id': document_id}
+            for document_id, entry in zip(document_ids, entries)
+            for clause in entry.get('clauses', [])
+        ]
+        if clause_rows:
+            session.execute(insert(KeyClause), clause_rows, execution_options=options)
+
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    return list(document_ids)
@@ -0,0 +1,76 @@
+from itertools import repeat
+from operator import contains
+
+# Score added when a sentence contains the keyword (substring match, as
+# 'all' also counts inside 'shall'). Used by utils.create_intelligent_summary.
+# Custom weights may be fractional. numpy is imported on first use, so that
+# importing utils stays cheap.
+IMPORTANCE_WEIGHTS = {
+    # high importance
+    'agreement': 3, 'party': 3, 'shall': 3, 'must': 3,
+    'required': 3, 'obligation': 3, 'rights': 3, 'liability': 3,
+    # medium importance
+    'may': 2, 'payment': 2, 'termination': 2, 'confidential': 2, 'breach': 2, 'damages': 2,
+    # low importance (negative scoring)
+    'including': -1, 'such': -1, 'other': -1, 'any': -1, 'all': -1, 'each': -1,
+}
+
+# moderate sentence length is preferred
+LENGTH_BONUS = 2           # for IDEAL_WORD_RANGE words
+SHORT_PENALTY = -2         # for fewer than SHORT_SENTENCE_WORDS words
+IDEAL_WORD_RANGE = (10, 30)
+SHORT_SENTENCE_WORDS = 5
+
+
+def keyword_matrix(sentences, keywords, lowered=None):
+    """Boolean sentence x keyword matrix: does sentence i contain keyword j.
+
+    Each column is filled by one C-level pass, `keyword in sentence` mapped
+    over the lowercased sentences straight into the array, so no Python code
+    runs per sentence or per match.
+    """
+    import numpy as np
+
+    matrix = np.zeros((len(sentences), len(keywords)), dtype=bool)
+    if not sentences:
+        return matrix
+
+    # lowercase per sentence (lower() may change lengths)
+    if lowered is None:
+        lowered = [sentence.lower() for sentence in sentences]
+    for column, keyword in enumerate(keywords):
+        matrix[:, column] = np.fromiter(map(contains, lowered, repeat(keyword)), dtype=bool, count=len(lowered))
+    return matrix
+
+
+def score_sentences(sentences, weights=None, lowered=None):
+    """Importance score of every sentence, computed for the whole batch at once.
+
+    `lowered` may pass the sentences already lowercased (ParsedDocument does).
+    """
+    import numpy as np
+
+    weights = IMPORTANCE_WEIGHTS if weights is None else weights
+    keywords = list(weights)
+    scores = keyword_matrix(sentences, keywords, lowered) @ np.array([weights[k] for k in keywords], dtype=np.float64)
+
+    word_counts = np.fromiter(map(len, map(str.split, sentences)), dtype=np.int64, count=len(sentences))
+    low, high = IDEAL_WORD_RANGE
+    scores += np.where((word_counts >= low) & (word_counts <= high), LENGTH_BONUS, 0)
+    scores += np.where(word_counts < SHORT_SENTENCE_WORDS, SHORT_PENALTY, 0)
+    return scores
+
+
+def top_sentence_indexes(scores, k):
+    """Indexes of the k best scores in document order; ties go to the earlier sentence"""
+    import numpy as np
+
+    scores = np.asarray(scores)
+    if len(scores) <= k:
+        return np.arange(len(scores))
+
+    # the k-th best score; everything above it is in, equal scores fill up in order
+    threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+    above = np.flatnonzero(scores > threshold)
+    tied = np.flatnonzero(scores == threshold)[:k - len(above)]
+    return np.sort(np.concatenate([above, tied]))
@@ -0,0 +1,37 @@
+"""App fixtures for route tests: a temporary SQLite database, CSRF and rate limits off"""
+import os
+import tempfile
+
+import pytest
+
+# app.py reads its configuration at import time
+_database_dir = tempfile.mkdtemp(prefix='legalease-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_database_dir, 'test.db')}"
+os.environ.setdefault('SESSION_SECRET', 'test-secret-' + 'x' * 32)
+os.environ.setdefault('NLTK_AUTO_DOWNLOAD', 'false')
+
+
+@pytest.fixture(scope='session')
+def legal_ease():
+    """The app module, configured for tests"""
+    import app as legal_ease
+
+    legal_ease.app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    legal_ease.limiter.enabled = False
+    return legal_ease
+
+
+@pytest.fixture
+def client(legal_ease):
+    """Test client logged in as a new user, on empty tables and caches"""
+    with legal_ease.app.app_context():
+        legal_ease.db.drop_all()
+        legal_ease.db.create_all()
+    # cached results of an earlier test would short-cut this test's uploads
+    for cache in (legal_ease.result_cache, legal_ease.evaluation_stats_cache, legal_ease.explain_cache):
+        cache.clear()
+    client = legal_ease.app.test_client()
+    client.post('/register', data={'email': 'tester@example.com', 'password': 'correct horse'})
+    yield client
+    with legal_ease.app.app_context():
+        legal_ease.db.session.remove()
@@ -0,0 +1,175 @@
+"""Shared test data: a fixed clause corpus, random scorer sentences, generated DOCX files and the
+reference implementations they are checked against"""
+import io
+import os
+import random
+import re
+
+from clause_matcher import CLAUSE_PATTERNS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_DOCUMENT = os.path.join(ROOT, 'test_legal_document.txt')
+
+# Words that make up the clause patterns (and near misses), and separators that
+# exercise sentence, line and paragraph boundaries
+CLAUSE_WORDS = (
+    "the agreement contract shall terminate termination end expiry expire dissolution confidential "
+    "information non-disclosure proprietary trade secret trademark trademarks disclose payment due terms "
+    "schedule invoice compensation amount fee remuneration liability limited excluded damages liable "
+    "responsible indemnify indemnification party loss governing law laws of state country jurisdiction "
+    "court legal system intellectual property copyright copyrights ownership rights patent xyz foo bar "
+    "amendment calendar Proof LAW Of"
+).split()
+SEPARATORS = [' ', ' ', ' ', ' ', '\n', '. ', '.\n\n', '! ', '\n \n', '? ', '...']
+
+
+def sample_document():
+    with open(SAMPLE_DOCUMENT, encoding='utf-8') as file:
+        return file.read()
+
+
+def clause_corpus(count, seed=1, max_words=300):
+    """`count` random documents built from CLAUSE_WORDS; the same seed gives the same corpus"""
+    rng = random.Random(seed)
+    return [
+        ''.join(rng.choice(CLAUSE_WORDS) + rng.choice(SEPARATORS) for _ in range(rng.randint(5, max_words)))
+        for _ in range(count)
+    ]
+
+
+def legacy_key_clauses(text):
+    """identify_key_clauses_enhanced as it was before clause_matcher: every clause type x
+    paragraph x pattern searched with re.search, then every sentence searched again"""
+    clauses = []
+    paragraphs = re.split(r'\n\s*\n', text)
+
+    for clause_type, clause_info in CLAUSE_PATTERNS.items():
+        for paragraph in paragraphs:
+            paragraph = paragraph.strip()
+            if len(paragraph) > 50:
+                for pattern in clause_info['patterns']:
+                    if re.search(pattern, paragraph, re.IGNORECASE):
+                        sentences = re.split(r'[.!?]+', paragraph)
+                        relevant_sentences = []
+
+                        for sentence in sentences:
+                            sentence = sentence.strip()
+                            if len(sentence) > 20 and re.search(pattern, sentence, re.IGNORECASE):
+                                relevant_sentences.append(sentence)
+
+                        if relevant_sentences:
+                            clauses.append({
+                                'type': clause_type,
+                                'content': '. '.join(relevant_sentences[:2]) + '.',
+                                'explanation': clause_info['description']
+                            })
+                            break
+
+        if len(clauses) >= 8:
+            break
+
+    return clauses
+
+
+# calculate_sentence_importance before sentence_scorer: (weight, keywords) checked one by one
+LEGACY_IMPORTANCE_KEYWORDS = [
+    (3, ['agreement', 'party', 'shall', 'must', 'required', 'obligation', 'rights', 'liability']),
+    (2, ['may', 'payment', 'termination', 'confidential', 'breach', 'damages']),
+    (-1, ['including', 'such', 'other', 'any', 'all', 'each']),
+]
+
+
+def legacy_sentence_importance(sentence):
+    """calculate_sentence_importance as it was before sentence_scorer: a substring search per keyword"""
+    sentence_lower = sentence.lower()
+    score = 0
+    for weight, keywords in LEGACY_IMPORTANCE_KEYWORDS:
+        for keyword in keywords:
+            if keyword in sentence_lower:
+                score += weight
+
+    word_count = len(sentence.split())
+    if 10 <= word_count <= 30:
+        score += 2
+    elif word_count < 5:
+        score -= 2
+    return score
+
+
+def legacy_top_sentences(sentences, max_sentences=5):
+    """The sentences create_intelligent_summary picked before sentence_scorer: sorted by
+    legacy_sentence_importance, best first (ties to the earlier sentence)"""
+    scored = [(sentence, legacy_sentence_importance(sentence)) for sentence in sentences]
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return [sentence for sentence, _ in scored[:max_sentences]]
+
+
+def scorer_sentences(count, seed=0):
+    """`count` random sentences of importance keywords, words containing them ('shall', 'install')
+    and filler, 2 to 40 words long"""
+    rng = random.Random(seed)
+    words = [keyword for _, keywords in LEGACY_IMPORTANCE_KEYWORDS for keyword in keywords]
+    words += ['install', 'Party', 'ALL', 'parties', 'mayor', 'İstanbul', 'the', 'of', 'and', 'to', 'contract',
+              'notice', 'days', 'seller']
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(2, 40))) for _ in range(count)]
+
+
+def make_docx(paragraphs, seed=0, tables=True, headers=True):
+    """Bytes of a DOCX written by python-docx: `paragraphs` paragraphs of random words from the
+    sample document, some with tabs, line breaks and extra runs, tables in between and, optionally,
+    a header and a footer"""
+    import docx
+
+    rng = random.Random(seed)
+    words = sample_document().split()
+    document = docx.Document()
+    if headers:
+        section = document.sections[0]
+        section.header.paragraphs[0].text = 'CONFIDENTIAL - Master Services Agreement'
+        section.header.add_table(1, 2, section.page_width).rows[0].cells[1].text = 'Rev. 3'
+        section.footer.paragraphs[0].text = 'Page footer'
+    for _ in range(paragraphs):
+        paragraph = document.add_paragraph(' '.join(rng.choice(words) for _ in range(rng.randint(0, 40))))
+        if rng.random() < 0.1:
+            paragraph.add_run('\tTabbed').add_break()
+            paragraph.add_run('after break')
+        if rng.random() < 0.05:
+            paragraph.add_run(' bold').bold = True
+        if tables and rng.random() < 0.05:
+            table = document.add_table(rows=rng.randint(1, 3), cols=3)
+            for row in table.rows:
+                for cell in row.cells:
+                    cell.text = ' '.join(rng.choice(words) for _ in range(rng.randint(0, 3)))
+                    if rng.random() < 0.2:
+                        cell.add_paragraph('second paragraph')
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def python_docx_text(source):
+    """docx_text() built with python-docx's object model: header, body and footer paragraphs in
+    document order, a table row as its cells' non-empty paragraphs joined by tabs"""
+    import docx
+    from docx.table import Table
+
+    document = docx.Document(source)
+    lines = []
+
+    def add_blocks(container):
+        for block in container.iter_inner_content():
+            if isinstance(block, Table):
+                for row in block.rows:
+                    cells = (' '.join(p.text for p in cell.paragraphs if p.text) for cell in row.cells)
+                    lines.append('\t'.join(cells))
+            else:
+                lines.append(block.text)
+
+    for section in document.sections:
+        if not section.header.is_linked_to_previous:
+            add_blocks(section.header)
+    add_blocks(document)
+    for section in document.sections:
+        if not section.footer.is_linked_to_previous:
+            add_blocks(section.footer)
+    return '\n'.join(lines) + '\n'
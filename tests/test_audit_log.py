@@ -0,0 +1,143 @@
+"""AuditLogWriter: flushes by size, by interval and at shutdown; retries, then drops, failed batches"""
+import logging
+import time
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, func, select
+
+from audit_log import AuditLogWriter
+
+
+@pytest.fixture
+def audit_table(tmp_path):
+    """A processing_log-like table in its own SQLite database; (engine, table)"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    table = Table('processing_log', MetaData(), Column('id', Integer, primary_key=True),
+                  Column('action', String(50)), Column('status', String(20)))
+    table.create(engine)
+    yield engine, table
+    engine.dispose()
+
+
+@pytest.fixture
+def make_writer(audit_table):
+    """make_writer(**options); with background=False the writer thread is stopped, so only the
+    test's own flush() calls write"""
+    writers = []
+
+    def make(background=True, **options):
+        options.setdefault('flush_interval', 60)
+        writer = AuditLogWriter(*audit_table, **options)
+        writers.append(writer)
+        if not background:
+            writer._stopped.set()
+            writer._wake.set()
+            writer._thread.join()
+        return writer
+
+    yield make
+    for writer in writers:
+        writer.shutdown()
+
+
+def written(audit_table):
+    engine, table = audit_table
+    with engine.connect() as connection:
+        return [row.action for row in connection.execute(select(table).order_by(table.c.id))]
+
+
+def wait_for_rows(audit_table, count, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if len(written(audit_table)) >= count:
+            return written(audit_table)
+        time.sleep(0.01)
+    raise AssertionError(f"{count} rows were not written within {timeout}s")
+
+
+def entry(action):
+    return {'action': action, 'status': 'success'}
+
+
+def test_full_batch_is_flushed_without_waiting_for_the_interval(audit_table, make_writer):
+    writer = make_writer(batch_size=3)
+    writer.write(entry('upload'))
+    writer.write(entry('explain'))
+    time.sleep(0.1)
+    assert written(audit_table) == []
+
+    writer.write(entry('evaluate'))
+    assert wait_for_rows(audit_table, 3) == ['upload', 'explain', 'evaluate']
+
+
+def test_partial_batch_is_flushed_every_interval(audit_table, make_writer):
+    make_writer(batch_size=100, flush_interval=0.05).write(entry('upload'))
+    assert wait_for_rows(audit_table, 1, timeout=2) == ['upload']
+
+
+def test_shutdown_drains_the_buffer(audit_table, make_writer):
+    writer = make_writer(batch_size=2)
+    for number in range(5):
+        writer.write(entry(f'upload-{number}'))
+    writer.shutdown()
+
+    assert written(audit_table) == [f'upload-{number}' for number in range(5)]
+    assert not writer._thread.is_alive()
+
+
+def test_full_buffer_drops_new_entries(audit_table, make_writer, caplog):
+    writer = make_writer(background=False, batch_size=100, max_queue=2)
+    for action in ('upload', 'explain', 'evaluate'):
+        writer.write(entry(action))
+    writer.flush()
+
+    assert written(audit_table) == ['upload', 'explain']
+    assert 'Audit log buffer full, dropping entry: evaluate' in caplog.text
+
+
+def test_failed_batch_is_retried_by_the_next_flush(audit_table, make_writer):
+    engine, table = audit_table
+    writer = make_writer(background=False, batch_size=2, retries=3)
+    table.drop(engine)  # every write fails until the table is back
+    for action in ('upload', 'explain', 'evaluate'):
+        writer.write(entry(action))
+
+    assert writer.flush() is False
+    assert writer.flush() is False
+    writer.write(entry('export'))
+    table.create(engine)
+
+    assert writer.flush() is True
+    # the failed batch first, then the rest in queue order; nothing twice
+    assert written(audit_table) == ['upload', 'explain', 'evaluate', 'export']
+
+
+def test_batch_is_dropped_after_its_retries(audit_table, make_writer, caplog):
+    engine, table = audit_table
+    writer = make_writer(background=False, batch_size=2, retries=1)
+    table.drop(engine)
+    for action in ('upload', 'explain', 'evaluate'):
+        writer.write(entry(action))
+
+    with caplog.at_level(logging.WARNING):
+        assert writer.flush() is False  # first attempt: kept for a retry
+        assert writer.flush() is False  # the retry fails too: dropped
+    assert 'Dropping 2 audit log entries after 2 failed writes' in caplog.text
+
+    table.create(engine)
+    assert writer.flush() is True
+    assert written(audit_table) == ['evaluate']
+
+
+def test_shutdown_reports_entries_it_could_not_write(audit_table, make_writer, caplog):
+    engine, table = audit_table
+    writer = make_writer(background=False, batch_size=2)
+    table.drop(engine)
+    for action in ('upload', 'explain', 'evaluate'):
+        writer.write(entry(action))
+    writer.shutdown()
+
+    assert 'Audit log writer stopped with 3 entries unwritten' in caplog.text
+    table.create(engine)
+    with engine.connect() as connection:
+        assert connection.scalar(select(func.count()).select_from(table)) == 0
@@ -0,0 +1,92 @@
+"""/api/batch-upload: NDJSON results, per-file errors, the file-count limit and the batch body limit"""
+import io
+import json
+import zipfile
+
+import pytest
+
+from tests.fixtures import sample_document
+
+DOCUMENT = sample_document().encode()
+
+
+def zip_of(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def post_batch(client, files):
+    """POST (filename, bytes) pairs as `files` parts; returns the response and its NDJSON lines"""
+    response = client.post('/api/batch-upload', data={'files': [(io.BytesIO(data), name) for name, data in files]},
+                           content_type='multipart/form-data')
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    return response, lines
+
+
+def test_results_stream_as_ndjson(client, legal_ease):
+    response, lines = post_batch(client, [('lease.txt', DOCUMENT), ('nda.txt', DOCUMENT + b'\n\nSigned.')])
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    *items, done = lines
+    assert sorted((item['index'], item['filename'], item['success']) for item in items) == [
+        (0, 'lease.txt', True), (1, 'nda.txt', True)]
+    assert all(item['summary'] and isinstance(item['key_clauses'], list) for item in items)
+
+    assert (done['done'], done['success'], done['processed'], done['failed']) == (True, True, 2, 0)
+    with legal_ease.app.app_context():
+        for saved in done['documents']:
+            assert legal_ease.db.session.get(legal_ease.Document, saved['document_id']).filename == saved['filename']
+
+
+def test_failing_files_do_not_stop_the_batch(client, legal_ease, monkeypatch):
+    monkeypatch.setitem(legal_ease.app.config, 'MAX_CONTENT_LENGTH', 5000)
+    archive = zip_of({'contracts/lease.txt': DOCUMENT, 'contracts/huge.txt': DOCUMENT * 3,
+                      'contracts/readme.md': b'skipped: not a supported type', 'contracts/': b''})
+
+    response, lines = post_batch(client, [('empty.txt', b'   \n'), ('notes.exe', b'MZ'), ('contracts.zip', archive)])
+
+    assert response.status_code == 200
+    *items, done = lines
+    outcomes = {item['filename']: item.get('error') for item in items}
+    assert outcomes == {
+        'empty.txt': 'No readable text found in file.',
+        'notes.exe': 'File type not supported. Upload PDF, DOCX, or TXT.',
+        'lease.txt': None,
+        'huge.txt': 'File too large. Max size 16MB.',
+    }
+    assert (done['success'], done['processed'], done['failed']) == (True, 1, 3)
+    assert [saved['filename'] for saved in done['documents']] == ['lease.txt']
+
+
+@pytest.mark.parametrize('files', [
+    [('one.txt', DOCUMENT), ('two.txt', DOCUMENT), ('three.txt', DOCUMENT)],
+    [('one.txt', DOCUMENT), ('more.zip', zip_of({'two.txt': DOCUMENT, 'three.txt': DOCUMENT}))],
+])
+def test_too_many_files(client, legal_ease, monkeypatch, files):
+    monkeypatch.setitem(legal_ease.app.config, 'BATCH_MAX_FILES', 2)
+    response, _ = post_batch(client, files)
+
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': 'Too many files. Max 2 per batch.'}
+
+
+def test_batch_body_limit_is_batch_max_content_length(client, legal_ease, monkeypatch):
+    monkeypatch.setitem(legal_ease.app.config, 'MAX_CONTENT_LENGTH', 5000)
+    monkeypatch.setitem(legal_ease.app.config, 'BATCH_MAX_CONTENT_LENGTH', 20000)
+    files = [(f'contract-{number}.txt', DOCUMENT) for number in range(4)]  # about 10KB in all
+
+    # over MAX_CONTENT_LENGTH: refused by /upload, accepted by /api/batch-upload
+    response = client.post('/upload', data={'file': (io.BytesIO(DOCUMENT * 3), 'contract.txt')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 413
+    response, lines = post_batch(client, files)
+    assert response.status_code == 200
+    assert lines[-1]['processed'] == 4
+
+    response, _ = post_batch(client, files * 3)
+    assert response.status_code == 413
+    assert response.get_json() == {'success': False, 'error': 'Batch too large.'}
@@ -0,0 +1,157 @@
+"""LRUCache eviction, TTL and counters; RedisCache on a working and a failing server; create_cache fallback"""
+import fnmatch
+
+import pytest
+
+import cache
+from cache import LRUCache, RedisCache, create_cache
+
+
+class Clock:
+    """Stands in for time.monotonic so TTLs expire without sleeping"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, 'monotonic', clock)
+    return clock
+
+
+class DictRedis:
+    """The few Redis commands RedisCache uses, on a dict (values as bytes, like redis-py returns them)"""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        self.expiry[key] = ex
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+
+    def scan_iter(self, match):
+        return [key for key in list(self.data) if fnmatch.fnmatchcase(key, match)]
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+class DownRedis:
+    """A client whose server went away after startup"""
+
+    def __getattr__(self, command):
+        def fail(*args, **kwargs):
+            raise ConnectionError('Connection refused')
+        return fail
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    lru = LRUCache(max_entries=3)
+    for key in 'abc':
+        lru.set(key, key.upper())
+    assert lru.get('a') == 'A'  # 'a' is now the most recently used
+    lru.set('d', 'D')
+    assert lru.get('b') is None
+    assert [lru.get(key) for key in 'acd'] == ['A', 'C', 'D']
+
+    lru.set('c', 'C2')  # overwriting refreshes too
+    lru.set('e', 'E')
+    assert lru.get('a') is None
+    assert [lru.get(key) for key in 'cde'] == ['C2', 'D', 'E']
+
+
+def test_lru_entries_expire_after_the_ttl(clock):
+    lru = LRUCache(max_entries=8, ttl=60)
+    lru.set('old', 1)
+    clock.now += 30
+    lru.set('new', 2)
+    clock.now += 31
+
+    assert lru.get('old') is None
+    assert lru.get('new') == 2
+    assert lru.stats()['size'] == 1  # the expired entry was dropped on lookup
+    clock.now += 30
+    assert lru.get('new', 'gone') == 'gone'
+
+
+def test_lru_without_ttl_keeps_entries(clock):
+    lru = LRUCache(max_entries=8)
+    lru.set('key', 'value')
+    clock.now += 10 ** 9
+    assert lru.get('key') == 'value'
+
+
+def test_lru_stats_count_hits_and_misses(clock):
+    lru = LRUCache(max_entries=2, ttl=60)
+    assert lru.stats() == {'backend': 'memory', 'hits': 0, 'misses': 0, 'hit_rate': 0, 'size': 0,
+                           'max_entries': 2, 'ttl': 60}
+    lru.set('a', 1)
+    lru.get('a')
+    lru.get('a')
+    lru.get('missing')
+    clock.now += 61
+    lru.get('a')  # expired: a miss
+
+    stats = lru.stats()
+    assert (stats['hits'], stats['misses'], stats['hit_rate'], stats['size']) == (2, 2, 0.5, 0)
+    lru.clear()
+    assert lru.stats()['hits'] == 2  # clear() drops entries, not counters
+
+
+def test_redis_cache_round_trips_json_and_counts_in_redis():
+    client = DictRedis()
+    shared = RedisCache(client, 'legalease:result', ttl=300)
+    other_worker = RedisCache(client, 'legalease:result', ttl=300)
+
+    shared.set('digest', {'summary': 'Short.', 'key_clauses': [{'type': 'Termination'}]})
+    assert client.expiry['legalease:result:digest'] == 300
+    assert other_worker.get('digest') == {'summary': 'Short.', 'key_clauses': [{'type': 'Termination'}]}
+    assert other_worker.get('missing', 'default') == 'default'
+
+    # both workers' lookups are counted
+    assert shared.stats() == {'backend': 'redis', 'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'size': None,
+                              'max_entries': None, 'ttl': 300}
+
+    RedisCache(client, 'legalease:explain').set('digest', 'kept')
+    shared.clear()
+    assert list(client.data) == ['legalease:explain:digest']
+
+
+def test_redis_cache_without_ttl_sets_no_expiry():
+    client = DictRedis()
+    RedisCache(client, 'legalease:ocr').set('page', 'text')
+    assert client.expiry['legalease:ocr:page'] is None
+
+
+def test_redis_outage_degrades_to_cache_misses(caplog):
+    down = RedisCache(DownRedis(), 'legalease:result', ttl=300)
+
+    down.set('digest', {'summary': 'Short.'})
+    assert down.get('digest', 'default') == 'default'
+    assert down.stats()['hits'] == down.stats()['misses'] == 0
+    assert 'Cache write failed (legalease:result)' in caplog.text
+    assert 'Cache read failed (legalease:result)' in caplog.text
+
+
+@pytest.mark.parametrize('backend, redis_url', [
+    ('memory', 'redis://127.0.0.1:1/0'),
+    ('redis', None),
+    ('redis', 'redis://127.0.0.1:1/0'),  # nothing listens on port 1
+])
+def test_create_cache_falls_back_to_memory(backend, redis_url):
+    pytest.importorskip('redis')
+    built = create_cache(backend, 'legalease:result', max_entries=16, ttl=60, redis_url=redis_url)
+    assert isinstance(built, LRUCache)
+    assert (built.max_entries, built.ttl) == (16, 60)
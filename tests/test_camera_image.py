@@ -0,0 +1,91 @@
+"""Camera captures: reading them from the request, decoding base64 and data URLs, sizes and the body limit"""
+import base64
+import io
+
+import pytest
+
+from utils import decode_image_data, image_data_size
+
+# not a real image: these functions never look inside the bytes
+CAPTURE = bytes(range(256)) * 4 + b'end'
+
+
+def data_url(data, media_type='image/jpeg'):
+    return f"data:{media_type};base64,{base64.b64encode(data).decode()}"
+
+
+@pytest.mark.parametrize('encoded', [
+    base64.b64encode(CAPTURE).decode(),
+    data_url(CAPTURE),
+    data_url(CAPTURE, 'image/png'),
+])
+def test_base64_and_data_urls_decode_to_the_capture(encoded):
+    assert decode_image_data(encoded) == CAPTURE
+    assert image_data_size(encoded) == len(CAPTURE)
+
+
+@pytest.mark.parametrize('length', [1, 2, 3, 4, 5])
+def test_size_of_base64_accounts_for_padding(length):
+    for encoded in (base64.b64encode(CAPTURE[:length]).decode(), data_url(CAPTURE[:length])):
+        assert image_data_size(encoded) == len(decode_image_data(encoded)) == length
+
+
+@pytest.mark.parametrize('encoded', ['abc', 'data:image/jpeg;base64,QUJDRA=', 'data:image/jpeg;base64,café'])
+def test_invalid_base64_is_a_value_error(encoded):
+    with pytest.raises(ValueError):
+        decode_image_data(encoded)
+
+
+def test_size_of_bytes_and_streams():
+    assert image_data_size(CAPTURE) == image_data_size(bytearray(CAPTURE)) == len(CAPTURE)
+    stream = io.BytesIO(CAPTURE)
+    stream.seek(10)
+    assert image_data_size(stream) == len(CAPTURE)
+    assert stream.tell() == 10  # the position the caller left it at
+
+
+@pytest.mark.parametrize('request_options, expected', [
+    ({'data': CAPTURE, 'content_type': 'image/jpeg'}, CAPTURE),
+    ({'data': CAPTURE, 'content_type': 'application/octet-stream'}, CAPTURE),
+    ({'json': {'captured_image': data_url(CAPTURE)}}, data_url(CAPTURE)),
+    ({'data': {'captured_image': data_url(CAPTURE)}}, data_url(CAPTURE)),
+    ({'data': b'', 'content_type': 'image/jpeg'}, None),
+    ({'json': ['not', 'an', 'object']}, None),
+    ({'data': {'file': 'no capture here'}}, None),
+])
+def test_request_camera_image(legal_ease, request_options, expected):
+    with legal_ease.app.test_request_context('/upload', method='POST', **request_options):
+        assert legal_ease.request_camera_image() == expected
+
+
+def test_multipart_capture_is_returned_as_its_upload_stream(legal_ease):
+    with legal_ease.app.test_request_context('/upload', method='POST', content_type='multipart/form-data',
+                                             data={'captured_image': (io.BytesIO(CAPTURE), 'capture.jpg')}):
+        captured = legal_ease.request_camera_image()
+        assert not isinstance(captured, (bytes, str))
+        assert image_data_size(captured) == len(CAPTURE)
+        assert legal_ease.detached_camera_image(captured) == CAPTURE
+
+
+@pytest.fixture
+def capture_url(client):
+    return f"/api/capture-sessions/{client.post('/api/capture-sessions').get_json()['session_id']}/pages"
+
+
+@pytest.mark.parametrize('request_options', [
+    lambda: {'data': CAPTURE, 'content_type': 'image/jpeg'},
+    lambda: {'json': {'captured_image': data_url(CAPTURE)}},
+    lambda: {'data': {'captured_image': (io.BytesIO(CAPTURE), 'capture.jpg')}, 'content_type': 'multipart/form-data'},
+], ids=['binary', 'data-url', 'multipart'])
+def test_captures_over_the_size_limit_get_json_413(client, legal_ease, capture_url, monkeypatch, request_options):
+    monkeypatch.setitem(legal_ease.app.config, 'MAX_CONTENT_LENGTH', len(CAPTURE) // 2)
+    for url in ('/upload', '/api/analyze-camera', capture_url):
+        response = client.post(url, **request_options())
+        assert response.status_code == 413, url
+        assert response.get_json() == {'success': False, 'error': 'File too large. Max size 16MB.'}, url
+
+
+def test_capture_page_accepts_a_binary_body(client, capture_url):
+    response = client.post(capture_url, data=CAPTURE, content_type='image/jpeg')
+    assert response.status_code == 202
+    assert response.get_json()['page'] == 0
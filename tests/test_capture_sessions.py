@@ -0,0 +1,146 @@
+"""CaptureSessionStore page bookkeeping, in one process and across workers sharing the database"""
+import threading
+
+import pytest
+
+from capture_sessions import (CaptureSessionError, CaptureSessionStore, DatabaseCaptureBackend,
+                              InMemoryCaptureBackend, INTERRUPTED_ERROR, PAGE_ERROR, PAGE_PENDING)
+
+
+def read_image(image, user_id):
+    if image.startswith(b'unreadable'):
+        raise ValueError('No text found')
+    return image.decode()
+
+
+@pytest.fixture
+def database_backend(client, legal_ease):
+    """A DatabaseCaptureBackend on the test database (a new instance per call, as in each worker)"""
+    def make():
+        return DatabaseCaptureBackend(legal_ease.db, legal_ease.CaptureSession, legal_ease.CapturePage,
+                                      legal_ease.app)
+    return make
+
+
+@pytest.fixture(params=['memory', 'database'])
+def make_store(request):
+    if request.param == 'memory':
+        backend = InMemoryCaptureBackend()
+        make_backend = lambda: backend  # noqa: E731
+    else:
+        make_backend = request.getfixturevalue('database_backend')
+
+    def make(extract=read_image, **options):
+        return CaptureSessionStore(extract, backend=make_backend(), poll_interval=0.01, **options)
+    return make
+
+
+def test_retaken_page_is_counted_once(make_store):
+    store = make_store()
+    session_id = store.create(user_id=1)
+    store.add_page(session_id, 1, b'first page', size=100)
+    store.add_page(session_id, 1, b'blurry second page', size=300)
+    store.add_page(session_id, 1, b'second page', size=250, page=1)
+
+    texts, size = store.finalize(session_id, 1, timeout=5)
+
+    assert texts == ['first page', 'second page']
+    assert size == 350
+    with pytest.raises(KeyError):
+        store.status(session_id, 1)
+
+
+def test_sessions_belong_to_their_user(make_store):
+    store = make_store()
+    session_id = store.create(user_id=1)
+    for call in (lambda: store.status(session_id, 2), lambda: store.add_page(session_id, 2, b'page', size=4),
+                 lambda: store.discard(session_id, 2), lambda: store.status('missing', 1)):
+        with pytest.raises(KeyError):
+            call()
+
+
+def test_page_limit_and_unknown_page(make_store):
+    store = make_store(max_pages=2)
+    session_id = store.create(user_id=1)
+    store.add_page(session_id, 1, b'one', size=3)
+    store.add_page(session_id, 1, b'two', size=3)
+    with pytest.raises(CaptureSessionError, match='Too many pages'):
+        store.add_page(session_id, 1, b'three', size=5)
+    with pytest.raises(CaptureSessionError, match='No page 2'):
+        store.add_page(session_id, 1, b'three', size=5, page=2)
+
+
+def test_unreadable_page_keeps_the_session_open_for_a_retake(make_store):
+    store = make_store()
+    session_id = store.create(user_id=1)
+    store.add_page(session_id, 1, b'unreadable', size=10)
+    with pytest.raises(CaptureSessionError, match='Page 0: No text found'):
+        store.finalize(session_id, 1, timeout=5)
+    assert store.status(session_id, 1)['pages'] == [{'page': 0, 'status': PAGE_ERROR, 'error': 'No text found'}]
+
+    store.add_page(session_id, 1, b'readable', size=8, page=0)
+    assert store.finalize(session_id, 1, timeout=5) == (['readable'], 8)
+
+
+def test_stores_sharing_the_database_serve_the_same_session(database_backend):
+    """Two workers: pages uploaded to one are polled, retaken and finalized on the other"""
+    release = threading.Event()
+
+    def slow_read(image, user_id):
+        release.wait(5)
+        return read_image(image, user_id)
+
+    first = CaptureSessionStore(slow_read, backend=database_backend(), poll_interval=0.01)
+    second = CaptureSessionStore(read_image, backend=database_backend(), poll_interval=0.01)
+
+    session_id = first.create(user_id=1)
+    first.add_page(session_id, 1, b'page one', size=8)
+    first.add_page(session_id, 1, b'draft of page two', size=17)
+    assert [page['status'] for page in second.status(session_id, 1)['pages']] == [PAGE_PENDING, PAGE_PENDING]
+
+    second.add_page(session_id, 1, b'page two', size=8, page=1)
+    second.add_page(session_id, 1, b'page three', size=10)
+    with pytest.raises(CaptureSessionError, match='still being processed'):
+        second.finalize(session_id, 1, timeout=0.05)
+
+    release.set()
+    assert second.finalize(session_id, 1, timeout=5) == (['page one', 'page two', 'page three'], 26)
+    # the retaken draft finished on the first worker after the retake and was not recorded
+    first._executor.shutdown(wait=True)
+    with pytest.raises(KeyError):
+        first.status(session_id, 1)
+
+
+def test_page_of_a_dead_worker_is_reported_as_failed(database_backend):
+    # the page is added through the backend alone, as by a worker that died before running the OCR
+    backend = database_backend()
+    store = CaptureSessionStore(read_image, backend=backend, stale_after=0, poll_interval=0.01)
+    session_id = store.create(user_id=1)
+    backend.add_page(session_id, 1, None, 5, 'revision', store.max_pages)
+
+    assert store.status(session_id, 1)['pages'] == [{'page': 0, 'status': PAGE_ERROR, 'error': INTERRUPTED_ERROR}]
+    with pytest.raises(CaptureSessionError, match='Page 0'):
+        store.finalize(session_id, 1, timeout=5)
+
+    store.stale_after = 600
+    store.add_page(session_id, 1, b'retaken', size=7, page=0)
+    assert store.finalize(session_id, 1, timeout=5) == (['retaken'], 7)
+
+
+def test_idle_sessions_expire(make_store):
+    store = make_store()
+    session_id = store.create(user_id=1)
+    store.add_page(session_id, 1, b'page', size=4)
+    store.ttl = -1
+    store.create(user_id=2)
+    with pytest.raises(KeyError):
+        store.status(session_id, 1)
+
+
+def test_discard_drops_the_session(make_store):
+    store = make_store()
+    session_id = store.create(user_id=1)
+    store.add_page(session_id, 1, b'page', size=4)
+    store.discard(session_id, 1)
+    with pytest.raises(KeyError):
+        store.finalize(session_id, 1, timeout=5)
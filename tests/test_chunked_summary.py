@@ -0,0 +1,80 @@
+"""Map-reduce summaries of long documents: page provenance and repeated boilerplate"""
+import pytest
+
+from tests.fixtures import sample_document
+from utils import extract_document, page_start_offsets, summarize_legal_document_chunked, _sentence_key
+
+BOILERPLATE = ("CONFIDENTIAL: the party shall keep this agreement and every obligation, right and liability "
+               "of the parties confidential.")
+
+
+def test_page_start_offsets():
+    pages = ['first page', '', 'third']
+    assert page_start_offsets(pages) == [0, 10, 10]
+    joined = '\n\n'.join(pages)
+    for page, offset in zip(pages, page_start_offsets(pages, '\n\n')):
+        assert joined[offset:offset + len(page)] == page
+
+
+def test_repeated_boilerplate_reaches_the_summary_once():
+    paragraphs = sample_document().split('\n\n')
+    text = '\n\n'.join(f"{BOILERPLATE}\n\n{paragraph}" for paragraph in paragraphs * 3)
+
+    result = summarize_legal_document_chunked(text, max_chars=1500, workers=1)
+
+    assert len(result['sections']) > 5
+    keys = [_sentence_key(source['sentence']) for source in result['summary_sources']]
+    assert len(keys) == len(set(keys))
+
+
+def test_pdf_sections_cite_their_pages():
+    fitz = pytest.importorskip('fitz')
+    paragraphs = sample_document().split('\n\n')
+    with fitz.open() as pdf:
+        for start in range(0, len(paragraphs), 3):
+            pdf.new_page().insert_textbox(fitz.Rect(36, 36, 576, 756), '\n\n'.join(paragraphs[start:start + 3]),
+                                          fontsize=9)
+        page_count = pdf.page_count
+        data = pdf.tobytes()
+
+    extracted = extract_document(data, 'contract.pdf')
+    assert len(extracted['page_offsets']) == page_count
+    assert extracted['text'][extracted['page_offsets'][1]:].startswith(paragraphs[3].split()[0])
+
+    result = summarize_legal_document_chunked(**extracted, max_chars=800, workers=1)
+    pages = [section['pages'] for section in result['sections']]
+    assert pages[0][0] == 1 and pages[-1][1] == page_count
+    assert all(first <= last for first, last in pages)
+
+
+def nltk_check_in_worker():
+    """Run in a pool worker: ensure_nltk_data() with downloads on, counting download attempts"""
+    import nltk
+    import utils
+
+    attempts = []
+    nltk.download = lambda name, **kwargs: attempts.append(name) or False
+    utils.NLTK_AUTO_DOWNLOAD = True
+    return utils.ensure_nltk_data(), attempts
+
+
+def test_section_workers_use_the_parents_nltk_check(monkeypatch):
+    """Pool workers never retry the NLTK download the parent already tried (no network: one timeout each)"""
+    pytest.importorskip('nltk')
+    import utils
+
+    pools = []
+    real_process_pool = utils._process_pool
+
+    def recording_process_pool(workers, initializer=None, initargs=()):
+        pools.append((initializer, initargs))
+        return real_process_pool(workers, initializer, initargs)
+
+    monkeypatch.setattr(utils, '_process_pool', recording_process_pool)
+    # the parent checked (and with NLTK_AUTO_DOWNLOAD, tried to download) and found no data
+    monkeypatch.setattr(utils, '_nltk_ready', False)
+    assert len(utils._map_sections(['First section text.', 'Second section text.'], workers=2)) == 2
+
+    [(initializer, initargs)] = pools
+    with real_process_pool(1, initializer, initargs) as pool:
+        assert pool.submit(nltk_check_in_worker).result() == (False, [])
@@ -0,0 +1,104 @@
+"""Parity of the single-pass clause matcher with the per-pattern regex loop it replaced,
+and of its streaming entry point with whole-text detection"""
+import random
+import time
+
+import pytest
+
+from clause_matcher import find_key_clauses, iter_paragraphs
+from parsed_document import PARAGRAPH_SEPARATOR
+from tests.fixtures import clause_corpus, legacy_key_clauses, sample_document
+from utils import extract_document, identify_key_clauses_enhanced, identify_key_clauses_from_pages
+
+
+def test_random_corpus_matches_legacy():
+    mismatches = [text for text in clause_corpus(1000) if find_key_clauses(text) != legacy_key_clauses(text)]
+    assert not mismatches, f"{len(mismatches)} documents differ, first: {mismatches[0][:300]!r}"
+
+
+@pytest.mark.parametrize('transform', [
+    lambda text: text,
+    str.upper,
+    lambda text: text.replace('\n\n', '\n'),  # one paragraph
+    lambda text: text.replace('\n', ' '),     # one line
+    lambda text: (text + '\n\n') * 20,        # long document, clause limit reached
+])
+def test_sample_document_matches_legacy(transform):
+    text = transform(sample_document())
+    assert find_key_clauses(text) == legacy_key_clauses(text)
+
+
+def test_identify_key_clauses_enhanced_uses_matcher():
+    text = sample_document()
+    clauses = identify_key_clauses_enhanced(text)
+    assert clauses == legacy_key_clauses(text)
+    assert {clause['type'] for clause in clauses} >= {'Confidentiality', 'Termination', 'Governing Law'}
+
+
+def test_overlapping_and_non_ascii_text_matches_legacy():
+    texts = [
+        # 'trade' is a prefix of 'trademark'; both patterns must still be found
+        "The trademark rights and the trade secret of the party are protected under this contract.\n\n" * 2,
+        # '.*?' does not cross a newline
+        "The payment of the fee shall be\ndue within thirty days of the invoice for the services rendered.",
+        # lower() changes the length of 'İ', so offsets of the lowered text differ
+        "İİİ The governing law of this agreement is the law of the state of Delaware, and disputes go to court.",
+    ]
+    for text in texts:
+        assert find_key_clauses(text) == legacy_key_clauses(text)
+
+
+def random_chunks(text, rng):
+    """text cut at up to 8 random positions"""
+    cuts = sorted(rng.sample(range(1, len(text)), min(len(text) - 1, rng.randint(1, 8))))
+    return [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+
+def test_streamed_pages_match_whole_text():
+    rng = random.Random(2)
+    documents = clause_corpus(300, seed=3) + [(sample_document() + '\n\n') * 3]
+    for text in documents:
+        assert identify_key_clauses_from_pages(random_chunks(text, rng)) == find_key_clauses(text)
+
+
+def paragraphs_of(pieces):
+    return [paragraph.strip() for piece in pieces for paragraph in PARAGRAPH_SEPARATOR.split(piece)
+            if paragraph.strip()]
+
+
+def test_paragraph_breaks_across_chunks():
+    rng = random.Random(5)
+    for _ in range(500):
+        text = ''.join(rng.choice(['word', ' ', '\n', '\n\n', ' \n \n', '.']) for _ in range(60))
+        chunks = random_chunks(text, rng) + ['', '  ']
+        assert paragraphs_of(iter_paragraphs(chunks)) == paragraphs_of([text])
+
+
+def test_pages_without_blank_lines_stream_in_linear_time():
+    page = ('The party shall pay the fee within thirty days of the invoice.\n' * 30)
+
+    def elapsed(page_count):
+        start = time.perf_counter()
+        pieces = list(iter_paragraphs([page] * page_count))
+        seconds = time.perf_counter() - start
+        assert pieces == [page * page_count]
+        return seconds
+
+    elapsed(100)
+    small, large = min(elapsed(500) for _ in range(3)), min(elapsed(4000) for _ in range(3))
+    # 8x the pages: about 8x the time when linear, 64x when every page rescans the buffer
+    assert large < small * 24
+
+
+def test_extract_document_finds_pdf_clauses_while_extracting():
+    fitz = pytest.importorskip('fitz')
+    paragraphs = sample_document().split('\n\n')
+    with fitz.open() as pdf:
+        for start in range(0, len(paragraphs), 3):
+            pdf.new_page().insert_textbox(fitz.Rect(36, 36, 576, 756), '\n\n'.join(paragraphs[start:start + 3]),
+                                          fontsize=9)
+        data = pdf.tobytes()
+
+    extracted = extract_document(data, 'contract.pdf')
+    assert extracted['key_clauses']
+    assert extracted['key_clauses'] == find_key_clauses(extracted['text'])
@@ -0,0 +1,67 @@
+"""Parity of the streaming DOCX extractor (docx_text) with python-docx's object model"""
+import io
+
+import pytest
+
+from tests.fixtures import make_docx, python_docx_text
+
+docx = pytest.importorskip('docx')
+
+from docx_text import docx_text  # noqa: E402
+from utils import extract_text_from_bytes, extract_text_from_docx  # noqa: E402
+
+
+def assert_same_text(data):
+    expected = python_docx_text(io.BytesIO(data))
+    assert docx_text(io.BytesIO(data)) == expected
+    assert extract_text_from_docx(io.BytesIO(data)) == expected
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_paragraphs_match_python_docx(seed):
+    assert_same_text(make_docx(200, seed=seed, tables=False, headers=False))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_tables_headers_and_footers_match_python_docx(seed):
+    assert_same_text(make_docx(300, seed=seed))
+
+
+def test_line_breaks_tabs_and_runs():
+    document = docx.Document()
+    paragraph = document.add_paragraph('Payment ')
+    paragraph.add_run('is due').bold = True
+    paragraph.add_run('\tin 30 days').add_break()
+    paragraph.add_run('of the invoice.')
+    document.add_paragraph('')
+    document.add_paragraph('Governing law: Delaware.')
+    buffer = io.BytesIO()
+    document.save(buffer)
+
+    assert_same_text(buffer.getvalue())
+    assert docx_text(io.BytesIO(buffer.getvalue())) == (
+        'Payment is due\tin 30 days\nof the invoice.\n\nGoverning law: Delaware.\n'
+    )
+
+
+def test_table_cells_and_nested_paragraphs():
+    document = docx.Document()
+    document.add_paragraph('Fees')
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = 'Service'
+    table.cell(0, 1).text = 'Fee'
+    table.cell(1, 0).text = 'Hosting'
+    table.cell(1, 1).add_paragraph('100 USD per month')
+    document.add_paragraph('After the table')
+    buffer = io.BytesIO()
+    document.save(buffer)
+
+    assert_same_text(buffer.getvalue())
+    assert docx_text(io.BytesIO(buffer.getvalue())) == (
+        'Fees\nService\tFee\nHosting\t100 USD per month\nAfter the table\n'
+    )
+
+
+def test_in_memory_upload_uses_streaming_extractor():
+    data = make_docx(50, seed=9)
+    assert extract_text_from_bytes(data, 'contract.docx') == python_docx_text(io.BytesIO(data))
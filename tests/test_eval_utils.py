@@ -0,0 +1,124 @@
+"""aggregate_evaluation_metrics: means, standard deviations, rating histogram and groups"""
+from datetime import datetime
+from statistics import mean, pstdev
+
+import pytest
+
+from eval_utils import RATINGS, SCORE_DIMENSIONS, aggregate_evaluation_metrics, get_quality_rating
+
+# (file type, evaluation date, the four dimension scores)
+EVALUATIONS = [
+    ('pdf', datetime(2026, 12, 27, 9, 30), (5, 5, 4, 5)),
+    ('pdf', datetime(2026, 12, 28, 14, 0), (4, 3, 4, 4)),
+    ('txt', datetime(2026, 12, 31, 23, 59), (3, 2, 3, 2)),
+    ('txt', datetime(2027, 1, 1, 0, 5), (1, 2, 1, 2)),
+    ('docx', datetime(2027, 1, 4, 12, 0), (5, 4, 5, 5)),
+]
+
+
+def overall(scores):
+    return round(sum(scores) / len(scores), 2)
+
+
+@pytest.fixture
+def evaluated(client, legal_ease):
+    """Stores EVALUATIONS, one document each; yields a session to aggregate with"""
+    db = legal_ease.db
+    with legal_ease.app.app_context():
+        user = db.session.scalar(db.select(legal_ease.User))
+        for number, (file_type, evaluated_at, scores) in enumerate(EVALUATIONS):
+            document = legal_ease.Document(user_id=user.id, filename=f'contract-{number}.{file_type}',
+                                           file_type=file_type, file_size=1000, summary='Summary.',
+                                           processing_time=0.1)
+            db.session.add(document)
+            db.session.flush()
+            db.session.add(legal_ease.DocumentEvaluation(
+                document_id=document.id, evaluator_name='QA', overall_score=overall(scores),
+                evaluation_date=evaluated_at, **dict(zip(SCORE_DIMENSIONS, scores))
+            ))
+        db.session.commit()
+        yield db.session
+
+
+def aggregate(legal_ease, session, **options):
+    return aggregate_evaluation_metrics(session, legal_ease.DocumentEvaluation, legal_ease.Document, **options)
+
+
+def expected_stats(evaluations):
+    scores = [overall(scores) for _, _, scores in evaluations]
+    histogram = dict.fromkeys(RATINGS, 0)
+    for score in scores:
+        histogram[get_quality_rating(score)] += 1
+    dimensions = {}
+    for index, name in enumerate(SCORE_DIMENSIONS):
+        values = [scores[index] for _, _, scores in evaluations]
+        dimensions[name] = {'mean': round(mean(values), 2), 'stddev': round(pstdev(values), 2)}
+    return {
+        'total_evaluations': len(evaluations),
+        'average_score': round(mean(scores), 2),
+        'score_stddev': round(pstdev(scores), 2),
+        'dimensions': dimensions,
+        'histogram': histogram,
+    }
+
+
+def test_overall_means_stddevs_and_histogram(legal_ease, evaluated):
+    stats = aggregate(legal_ease, evaluated)
+    assert stats == expected_stats(EVALUATIONS)
+    assert stats['histogram'] == {'Excellent': 2, 'Good': 1, 'Fair': 1, 'Poor': 1}
+
+
+def test_no_evaluations(legal_ease, client):
+    with legal_ease.app.app_context():
+        stats = aggregate(legal_ease, legal_ease.db.session, group_by='document_type')
+    assert (stats['total_evaluations'], stats['average_score'], stats['score_stddev']) == (0, 0, 0)
+    assert stats['histogram'] == dict.fromkeys(RATINGS, 0)
+    assert stats['groups'] == []
+
+
+def test_group_by_document_type(legal_ease, evaluated):
+    stats = aggregate(legal_ease, evaluated, group_by='document_type')
+    assert stats['group_by'] == 'document_type' and 'bucket' not in stats
+    assert stats['groups'] == [
+        {'key': file_type, **expected_stats([evaluation for evaluation in EVALUATIONS if evaluation[0] == file_type])}
+        for file_type in ('docx', 'pdf', 'txt')
+    ]
+
+
+@pytest.mark.parametrize('bucket, keys', [
+    ('day', ['2026-12-27', '2026-12-28', '2026-12-31', '2027-01-01', '2027-01-04']),
+    # ISO weeks: 2026-12-28 to 2027-01-03 is 2026-W53, whichever year its days fall in
+    ('week', ['2026-W52', '2026-W53', '2026-W53', '2026-W53', '2027-W01']),
+    ('month', ['2026-12', '2026-12', '2026-12', '2027-01', '2027-01']),
+])
+def test_group_by_date(legal_ease, evaluated, bucket, keys):
+    stats = aggregate(legal_ease, evaluated, group_by='date', bucket=bucket)
+    assert (stats['group_by'], stats['bucket']) == ('date', bucket)
+    assert stats['groups'] == [
+        {'key': key, **expected_stats([evaluation for evaluation, k in zip(EVALUATIONS, keys) if k == key])}
+        for key in sorted(set(keys))
+    ]
+
+
+def test_iso_weeks_match_python(legal_ease, client):
+    """The SQLite week bucket agrees with date.isocalendar() across year boundaries"""
+    days = [datetime(year, month, day, 12) for year in range(2020, 2030) for month, day in ((1, 1), (1, 4), (12, 29))]
+    db = legal_ease.db
+    with legal_ease.app.app_context():
+        user = db.session.scalar(db.select(legal_ease.User))
+        document = legal_ease.Document(user_id=user.id, filename='contract.txt', file_type='txt', file_size=10,
+                                       summary='Summary.')
+        db.session.add(document)
+        db.session.flush()
+        db.session.add_all(legal_ease.DocumentEvaluation(document_id=document.id, overall_score=3.0,
+                                                         evaluation_date=day) for day in days)
+        db.session.commit()
+        stats = aggregate(legal_ease, db.session, group_by='date', bucket='week')
+
+    expected = {'%d-W%02d' % day.isocalendar()[:2] for day in days}
+    assert [group['key'] for group in stats['groups']] == sorted(expected)
+
+
+def test_unknown_group_by(legal_ease, evaluated):
+    with pytest.raises(ValueError, match='Unknown group_by'):
+        aggregate(legal_ease, evaluated, group_by='evaluator')
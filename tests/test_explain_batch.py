@@ -0,0 +1,35 @@
+"""/api/explain-batch request validation"""
+import pytest
+
+
+@pytest.mark.parametrize('body', [
+    '[1, 2]',
+    '"clauses"',
+    '42',
+    'null',
+    '{"document_id": "1"}',
+    '{"document_id": 1.5}',
+    '{"document_id": true}',
+    '{"document_id": {"id": 1}}',
+    '{"clauses": "not a list"}',
+    '{"clauses": ["ok", 3]}',
+    '{}',
+])
+def test_malformed_body_is_rejected(client, body):
+    response = client.post('/api/explain-batch', data=body, content_type='application/json')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_unknown_document_is_not_found(client):
+    response = client.post('/api/explain-batch', json={'document_id': 12345})
+    assert response.status_code == 404
+
+
+def test_clauses_are_explained(client):
+    response = client.post('/api/explain-batch', json={'clauses': [
+        'The Receiving Party shall not disclose any confidential information to third parties.', ' ',
+    ]})
+    assert response.status_code == 200
+    explanations = response.get_json()['explanations']
+    assert [explanation['success'] for explanation in explanations] == [True, False]
@@ -0,0 +1,191 @@
+"""Job state transitions, eviction, heartbeats and stale-job failure, and async uploads in /upload"""
+import io
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+
+from jobs import (DatabaseJobBackend, InMemoryJobBackend, INTERRUPTED_ERROR, JOB_ERROR, JOB_PENDING, JOB_RUNNING,
+                  JOB_SUCCESS, JobQueue, _now, serialize_job)
+from tests.fixtures import sample_document
+
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in (JOB_SUCCESS, JOB_ERROR):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+@pytest.fixture
+def database_backend(client, legal_ease):
+    def make(stale_after=3600):
+        return DatabaseJobBackend(legal_ease.db, legal_ease.ProcessingJob, legal_ease.app, stale_after=stale_after)
+    return make
+
+
+@pytest.fixture(params=['memory', 'database'])
+def backend(request):
+    if request.param == 'memory':
+        return InMemoryJobBackend()
+    return request.getfixturevalue('database_backend')()
+
+
+def test_progress_and_success(backend):
+    queue = JobQueue(backend, max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    seen = []
+
+    def job(report_progress, text):
+        report_progress(40, 'summarize')
+        started.set()
+        release.wait(5)
+        return {'summary': text.upper()}
+
+    job_id = queue.submit(job, 'short contract', user_id=1, filename='contract.txt')
+    started.wait(5)
+    seen.append(queue.get(job_id))
+    release.set()
+    finished = wait_for(queue, job_id)
+    queue.shutdown()
+
+    assert (seen[0]['status'], seen[0]['progress'], seen[0]['stage']) == (JOB_RUNNING, 40, 'summarize')
+    assert (finished['status'], finished['progress'], finished['stage']) == (JOB_SUCCESS, 100, 'done')
+    assert finished['result'] == {'summary': 'SHORT CONTRACT'}
+    assert serialize_job(finished)['filename'] == 'contract.txt'
+
+
+def test_failed_job_records_the_error(backend):
+    queue = JobQueue(backend, max_workers=1)
+
+    def job(report_progress):
+        report_progress(10, 'extract')
+        raise ValueError('No readable text found in file.')
+
+    finished = wait_for(queue, queue.submit(job))
+    queue.shutdown()
+    assert (finished['status'], finished['stage'], finished['error']) == (JOB_ERROR, 'failed',
+                                                                          'No readable text found in file.')
+    assert finished['result'] is None
+
+
+def test_new_job_is_pending(backend):
+    backend.create('queued-job', user_id=1, filename='contract.pdf')
+    job = backend.get('queued-job')
+    assert (job['status'], job['progress'], job['stage']) == (JOB_PENDING, 0, 'queued')
+    assert backend.get('missing') is None
+
+
+def test_memory_backend_drops_finished_jobs_after_ttl():
+    backend = InMemoryJobBackend(ttl=60)
+    for job_id in ('old', 'recent', 'running'):
+        backend.create(job_id)
+    backend.update('old', status=JOB_SUCCESS)
+    backend.update('recent', status=JOB_ERROR)
+    backend.update('running', status=JOB_RUNNING)
+    for job_id in ('old', 'running'):
+        backend._jobs[job_id]['updated_at'] = _now() - timedelta(seconds=120)
+
+    backend.create('new')
+
+    assert backend.get('old') is None
+    assert [job_id for job_id in ('recent', 'running', 'new') if backend.get(job_id)] == ['recent', 'running', 'new']
+
+
+def test_memory_backend_evicts_oldest_finished_jobs_beyond_max_jobs():
+    backend = InMemoryJobBackend(max_jobs=3)
+    backend.create('running')
+    backend.update('running', status=JOB_RUNNING)
+    for job_id in ('first', 'second'):
+        backend.create(job_id)
+        backend.update(job_id, status=JOB_SUCCESS)
+
+    backend.create('third')
+    assert backend.get('first') is None
+    assert all(backend.get(job_id) for job_id in ('running', 'second', 'third'))
+
+    # unfinished jobs are never evicted, even when that means going over max_jobs
+    backend.update('second', status=JOB_RUNNING)
+    backend.create('fourth')
+    assert all(backend.get(job_id) for job_id in ('running', 'second', 'third', 'fourth'))
+
+
+def test_stale_jobs_are_failed(database_backend, legal_ease):
+    backend = database_backend(stale_after=60)
+    for job_id in ('abandoned', 'abandoned-too', 'alive', 'done'):
+        backend.create(job_id)
+    backend.update('done', status=JOB_SUCCESS)
+    with legal_ease.app.app_context():
+        for job_id in ('abandoned', 'abandoned-too', 'done'):
+            legal_ease.db.session.get(legal_ease.ProcessingJob, job_id).updated_at = _now() - timedelta(seconds=120)
+        legal_ease.db.session.commit()
+
+    job = backend.get('abandoned')
+    assert (job['status'], job['stage'], job['error']) == (JOB_ERROR, 'failed', INTERRUPTED_ERROR)
+    assert backend.fail_stale_jobs() == 1  # abandoned-too; 'abandoned' was failed by get()
+    assert backend.get('abandoned-too')['error'] == INTERRUPTED_ERROR
+    assert backend.get('alive')['status'] == JOB_PENDING
+    assert backend.get('done')['status'] == JOB_SUCCESS
+
+
+def test_heartbeat_keeps_a_long_stage_alive(database_backend):
+    """A job that reports no progress for longer than stale_after is not taken for an abandoned one"""
+    backend = database_backend(stale_after=0.5)
+    queue = JobQueue(backend, max_workers=1, heartbeat_interval=0.05)
+    started, release = threading.Event(), threading.Event()
+
+    def long_stage(report_progress):
+        report_progress(10, 'extract')
+        started.set()
+        release.wait(5)
+        return {}
+
+    try:
+        # the second job waits in the queue behind the first, and is kept alive too
+        running, queued = queue.submit(long_stage), queue.submit(long_stage)
+        started.wait(5)
+        deadline = time.monotonic() + 1.5
+        while time.monotonic() < deadline:
+            assert queue.get(running)['status'] == JOB_RUNNING
+            assert queue.get(queued)['status'] == JOB_PENDING
+            time.sleep(0.05)
+        release.set()
+        assert wait_for(queue, running)['status'] == JOB_SUCCESS
+        assert wait_for(queue, queued)['status'] == JOB_SUCCESS
+    finally:
+        release.set()
+        queue.shutdown()
+
+
+def upload_log_count(legal_ease):
+    legal_ease.audit_log.flush()
+    with legal_ease.app.app_context():
+        return legal_ease.ProcessingLog.query.filter_by(action='upload').count()
+
+
+def test_failed_submit_logs_the_upload_once(client, legal_ease, monkeypatch):
+    def refuse(*args, **kwargs):
+        raise RuntimeError('job queue unavailable')
+
+    monkeypatch.setattr(legal_ease.job_queue, 'submit', refuse)
+    response = client.post('/upload', data={'file': (io.BytesIO(sample_document().encode()), 'contract.txt'),
+                                            'async': 'true'}, content_type='multipart/form-data')
+
+    assert response.status_code == 500
+    assert upload_log_count(legal_ease) == 1
+
+
+def test_async_upload_with_a_process_local_backend_and_several_workers_runs_synchronously(
+        client, legal_ease, monkeypatch):
+    monkeypatch.setitem(legal_ease.app.config, 'WEB_CONCURRENCY', 3)
+    monkeypatch.setitem(legal_ease.app.config, 'JOB_BACKEND', 'memory')
+    response = client.post('/upload', data={'file': (io.BytesIO(sample_document().encode()), 'contract.txt'),
+                                            'async': 'true'}, content_type='multipart/form-data')
+
+    assert response.status_code == 200
+    assert response.get_json()['document_id']
+    assert 'job_id' not in response.get_json()
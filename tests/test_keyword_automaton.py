@@ -0,0 +1,59 @@
+"""KeywordAutomaton counts against naive per-keyword counting, and document type detection"""
+import random
+import re
+
+import pytest
+
+from keyword_automaton import KeywordAutomaton
+from utils import KEYWORD_TABLES, KEYWORDS, detect_document_type
+
+TABLES = {
+    'words': {'lease': ['lease', 'rent', 'tenant'], 'service': ['service', 'services', 'terms of service'],
+              'nda': ['nda', 'non-disclosure'], 'term': ['terms', 'term']},
+    'substrings': {'rent': ['rent'], 'party': ['part', 'party', 'partnership'], 'hyphen': ['-'],
+                   'nda': ['nda']},
+}
+ALPHABET = ['rent', 'current', 'services', 'service', 'nda', 'standard', 'terms of service', 'term',
+            'non-disclosure', 'partnership', 'party', '-', ' ', ' ', '.', '\n', 'é', 'x', '_', '7']
+
+
+def naive_counts(tables, whole_words, text):
+    counts = {}
+    for table, categories in tables.items():
+        for category, keywords in categories.items():
+            total = 0
+            for keyword in keywords:
+                if table in whole_words:
+                    total += len(re.findall(r'(?=\b%s\b)' % re.escape(keyword), text))
+                else:
+                    total += sum(text.startswith(keyword, start) for start in range(len(text)))
+            if total:
+                counts[table, category] = total
+    return counts
+
+
+@pytest.mark.parametrize('whole_words', [(), ('words',), ('words', 'substrings')])
+def test_random_texts_match_naive_counting(whole_words):
+    automaton = KeywordAutomaton(TABLES, whole_words=whole_words)
+    rng = random.Random(len(whole_words))
+    for _ in range(2000):
+        text = ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 30)))
+        assert dict(automaton.scan(text)) == naive_counts(TABLES, whole_words, text), text
+
+
+def test_repo_tables_match_naive_counting():
+    words = sorted({keyword for categories in KEYWORD_TABLES.values() for keywords in categories.values()
+                    for keyword in keywords})
+    rng = random.Random(7)
+    for _ in range(300):
+        text = ''.join(rng.choice(words + ['s', 'un', ' ', ' ', '. ', '-']) for _ in range(40))
+        assert dict(KEYWORDS.scan(text)) == naive_counts(KEYWORD_TABLES, ('document_type',), text), text
+
+
+def test_document_type_ignores_keywords_inside_other_words():
+    # 'lease' in please/release, 'rent' in current/different, 'nda' in standard/calendar
+    text = ("Please release the current and different standard calendar, and please note the parent "
+            "company. The provider delivers the services described in the statement of work to the client.")
+    assert detect_document_type(text) == 'Service Agreement'
+    assert detect_document_type("The tenant shall pay rent under this lease.") == 'Lease Agreement'
+    assert detect_document_type("Please see the standard calendar.") == 'Legal Document'
@@ -0,0 +1,22 @@
+"""OcrCache never serves one user's OCR text for another user's capture"""
+from cache import LRUCache
+from ocr import OcrCache
+
+PAGE_HASH = 0x1234abcd
+
+
+def test_exact_hash_is_scoped_to_the_user():
+    cache = OcrCache(LRUCache(max_entries=8), window=0)
+    cache.set(PAGE_HASH, 'text of user 1', scope=1)
+
+    assert cache.get(PAGE_HASH, scope=1) == 'text of user 1'
+    assert cache.get(PAGE_HASH, scope=2) is None
+
+
+def test_near_duplicate_is_scoped_to_the_user():
+    cache = OcrCache(LRUCache(max_entries=8), window=60, max_distance=4)
+    cache.set(PAGE_HASH, 'text of user 1', scope=1)
+
+    assert cache.get(PAGE_HASH ^ 0b11, scope=1) == 'text of user 1'
+    assert cache.get(PAGE_HASH ^ 0b11, scope=2) is None
+    assert cache.near_duplicate_hits == 1
@@ -0,0 +1,85 @@
+"""The evaluation and history lists run a fixed number of SQL statements, however many rows they show"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture
+def count_queries(legal_ease):
+    """count_queries() -> context manager collecting the SQL statements run inside it"""
+    with legal_ease.app.app_context():
+        engine = legal_ease.db.engine
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            # the audit log writer flushes on its own thread whenever its interval expires
+            if 'processing_log' not in statement:
+                statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+
+    return counter
+
+
+def add_evaluated_documents(legal_ease, count):
+    """count documents of the logged-in test user, each with one evaluation"""
+    db = legal_ease.db
+    with legal_ease.app.app_context():
+        user = db.session.scalar(db.select(legal_ease.User))
+        for number in range(count):
+            document = legal_ease.Document(user_id=user.id, filename=f'contract-{number}.pdf', file_type='pdf',
+                                           file_size=1000, summary='Summary.', processing_time=0.1)
+            db.session.add(document)
+            db.session.flush()
+            db.session.add(legal_ease.DocumentEvaluation(
+                document_id=document.id, evaluator_name='QA', extraction_accuracy=4, clause_completeness=4,
+                summary_accuracy=5, summary_usefulness=3, overall_score=4.0, notes='n' * 500
+            ))
+        db.session.commit()
+
+
+@pytest.mark.parametrize('url', ['/api/evaluations', '/api/history'])
+def test_list_endpoint_query_count_is_constant(legal_ease, client, count_queries, url):
+    counts = []
+    for added in (1, 24):  # a single row, then more than a full page
+        add_evaluated_documents(legal_ease, added)
+        with count_queries() as statements:
+            response = client.get(url)
+        assert response.status_code == 200
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1], f"{url}: {counts[0]} statements for 1 row, {counts[1]} for a page"
+
+
+def test_api_evaluations_loads_document_names_in_the_page_query(legal_ease, client, count_queries):
+    add_evaluated_documents(legal_ease, 5)
+    with count_queries() as statements:
+        evaluations = client.get('/api/evaluations').get_json()['evaluations']
+
+    assert {evaluation['document_name'] for evaluation in evaluations} == {f'contract-{n}.pdf' for n in range(5)}
+    # the logged-in user, the page count and the page itself
+    assert len(statements) == 3
+    page_query = next(statement for statement in statements if statement.startswith('SELECT document_evaluation'))
+    assert 'JOIN document' in page_query and 'notes' not in page_query
+
+
+def test_evaluation_list_options_avoid_lazy_loads(legal_ease, client, count_queries):
+    add_evaluated_documents(legal_ease, 10)
+    DocumentEvaluation = legal_ease.DocumentEvaluation
+    with legal_ease.app.app_context():
+        with count_queries() as statements:
+            evaluations = DocumentEvaluation.query.options(
+                *legal_ease.evaluation_list_options(DocumentEvaluation)
+            ).order_by(DocumentEvaluation.evaluation_date.desc()).all()
+            filenames = [evaluation.document.filename for evaluation in evaluations]
+
+    assert len(filenames) == 10
+    assert len(statements) == 1
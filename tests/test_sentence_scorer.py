@@ -0,0 +1,31 @@
+"""Batch sentence scoring against the per-sentence scorer it replaced"""
+from sentence_scorer import score_sentences
+from parsed_document import parse_document
+from tests.fixtures import (legacy_sentence_importance, legacy_top_sentences, sample_document,
+                            scorer_sentences)
+from utils import calculate_sentence_importance, intelligent_summary_sentences
+
+
+def test_batch_scores_match_the_per_sentence_scorer():
+    sentences = scorer_sentences(3000) + [line for line in sample_document().splitlines() if line.strip()]
+    expected = [legacy_sentence_importance(sentence) for sentence in sentences]
+
+    assert score_sentences(sentences).tolist() == expected
+    assert [calculate_sentence_importance(sentence) for sentence in sentences] == expected
+
+
+def test_summary_picks_the_same_sentences():
+    sample = sample_document()
+    documents = [sample, sample.upper()]
+    documents += ['. '.join(scorer_sentences(40, seed=seed)) + '.' for seed in range(300)]
+    for text in documents:
+        chosen = intelligent_summary_sentences(text)
+        sentences = parse_document(text).sentence_texts(min_length=20)
+        assert sorted(chosen) == sorted(legacy_top_sentences(sentences))
+        # kept in document order
+        assert chosen == sorted(chosen, key=text.index)
+
+
+def test_empty_input():
+    assert score_sentences([]).tolist() == []
+    assert intelligent_summary_sentences('Too short.') == []
@@ -0,0 +1,42 @@
+"""TXT uploads decode to the same text from memory (decode_text) as from disk (open_text)"""
+import pytest
+
+from tests.fixtures import sample_document
+from text_decoding import SNIFF_BYTES, decode_text, iter_text_chunks, open_text
+from utils import extract_document, identify_key_clauses_enhanced
+
+ENCODINGS = ['utf-8', 'utf-8-sig', 'utf-16', 'utf-16-le', 'utf-32', 'latin-1']
+NEWLINES = ['\n', '\r\n', '\r']
+
+
+@pytest.mark.parametrize('newline', NEWLINES)
+@pytest.mark.parametrize('encoding', ENCODINGS)
+def test_memory_and_disk_agree(tmp_path, encoding, newline):
+    text = "Café clause: the party shall pay\nthe fee.\n\nGoverning law - Delaware\n"
+    data = text.replace('\n', newline).encode(encoding)
+    path = tmp_path / 'contract.txt'
+    path.write_bytes(data)
+
+    with open_text(str(path)) as file:
+        from_disk = file.read()
+    assert decode_text(data) == from_disk == text
+
+
+def test_non_utf8_byte_after_the_sample():
+    data = b'a' * SNIFF_BYTES + b'\r\nfee \xe9\r\n'
+    assert decode_text(data) == 'a' * SNIFF_BYTES + '\nfee \xe9\n'
+
+
+def test_extract_document_streams_txt_files(tmp_path):
+    text = (sample_document().replace('\n', '\r\n') + '\r\n\r\n') * 3
+    path = tmp_path / 'contract.txt'
+    path.write_bytes(text.encode('utf-8'))
+
+    from_disk = extract_document(str(path), 'contract.txt')
+    from_memory = extract_document(text.encode('utf-8'), 'contract.txt')
+
+    assert from_disk['text'] == from_memory['text']
+    assert from_disk['text'] == ''.join(iter_text_chunks(str(path), chunk_size=1000))
+    assert from_disk['key_clauses'] == identify_key_clauses_enhanced(from_disk['text'])
+    assert from_disk['key_clauses']
+    assert from_memory['key_clauses'] is None
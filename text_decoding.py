@@ -0,0 +1,88 @@
+import codecs
+import io
+
+# The encoding of a TXT upload is decided once, from its first SNIFF_BYTES
+SNIFF_BYTES = 64 * 1024
+
+# Longest BOMs first: the UTF-32 LE BOM starts with the UTF-16 LE one
+BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+# Share of NUL bytes in alternate positions above which a sample without a BOM
+# is taken to be UTF-16 (mostly-ASCII text has a NUL in every other byte)
+UTF16_NUL_RATIO = 0.3
+
+# Error handler for bytes that are not valid in the sniffed encoding: they are
+# decoded as latin-1 where they stand, so a file that turns out not to be UTF-8
+# after the sample is still read once instead of being decoded again
+DECODE_ERRORS = 'legalease-latin-1'
+
+
+def _latin1_fallback(error):
+    if not isinstance(error, UnicodeDecodeError):
+        raise error
+    return bytes(error.object[error.start:error.end]).decode('latin-1'), error.end
+
+
+codecs.register_error(DECODE_ERRORS, _latin1_fallback)
+
+
+def sniff_encoding(sample):
+    """Encoding of text starting with `sample` (bytes): its BOM, UTF-16 by NUL pattern, UTF-8, else latin-1"""
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    half = len(sample) // 2
+    if half >= 2:
+        even_nuls, odd_nuls = sample[0::2].count(0), sample[1::2].count(0)
+        if odd_nuls > half * UTF16_NUL_RATIO and not even_nuls:
+            return 'utf-16-le'
+        if even_nuls > half * UTF16_NUL_RATIO and not odd_nuls:
+            return 'utf-16-be'
+
+    try:
+        # not final: the sample may end inside a multi-byte character
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def open_text(filepath):
+    """Text stream over a TXT file with its encoding sniffed from the first bytes.
+
+    Reading it decodes the file chunk by chunk in a single pass; newlines are
+    translated as by open().
+    """
+    raw = open(filepath, 'rb')
+    try:
+        encoding = sniff_encoding(raw.read(SNIFF_BYTES))
+        raw.seek(0)
+        return io.TextIOWrapper(raw, encoding=encoding, errors=DECODE_ERRORS)
+    except Exception:
+        raw.close()
+        raise
+
+
+def iter_text_chunks(filepath, chunk_size=1 << 20):
+    """Decoded text of a TXT file, chunk_size characters at a time"""
+    with open_text(filepath) as file:
+        yield from iter(lambda: file.read(chunk_size), '')
+
+
+def decode_text(data):
+    """Text of an in-memory TXT upload, decoded in the sniffed encoding
+
+    CRLF and CR line endings become LF, as open_text() translates them, so a
+    file gives the same text from memory as from disk.
+    """
+    text = codecs.decode(data, sniff_encoding(data[:SNIFF_BYTES]), DECODE_ERRORS)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
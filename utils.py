@@ -2,49 +2,247 @@ import os
 import logging
 import json
 import re
-import base64
+import binascii
+import importlib
+import threading
+from bisect import bisect_right
+from functools import lru_cache
 from io import BytesIO
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer
-from sumy.nlp.stemmers import Stemmer
-from sumy.utils import get_stop_words
-import nltk
-
-# Image processing for OCR
-try:
-    from PIL import Image
-    import pytesseract
-except ImportError:
-    Image = None
-    pytesseract = None
-
-# PDF processing
-try:
-    import fitz  # PyMuPDF
-except ImportError:
-    fitz = None
-
-# DOCX processing
-try:
-    from docx import Document
-except ImportError:
-    Document = None
-
-# Download required NLTK data
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('punkt_tab', quiet=True)
-    nltk.download('stopwords', quiet=True)
-    nltk.download('averaged_perceptron_tagger', quiet=True)
-except Exception as e:
-    logging.warning(f"NLTK download warning: {e}")
-
-# Initialize summarizer
+
+from clause_matcher import find_key_clauses, find_key_clauses_in_chunks
+from docx_text import docx_text
+from keyword_automaton import KeywordAutomaton
+from ocr import perceptual_hash, recognize
+from parsed_document import parse_document
+from sentence_scorer import score_sentences, top_sentence_indexes
+from text_decoding import decode_text, iter_text_chunks, open_text
+
+# Heavy dependencies (sumy, nltk, PyMuPDF, python-docx, PIL, pytesseract) are
+# imported on first use so gunicorn workers boot without loading them.
+
 LANGUAGE = "english"
-stemmer = Stemmer(LANGUAGE)
-summarizer = LsaSummarizer(stemmer)
-summarizer.stop_words = get_stop_words(LANGUAGE)
+
+# NLTK data needed by sumy's tokenizer, mapped to its nltk.data path
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'punkt_tab': 'tokenizers/punkt_tab',
+    'stopwords': 'corpora/stopwords',
+}
+
+# Set NLTK_AUTO_DOWNLOAD=false when the data is baked into the image and the
+# host has no network access
+NLTK_AUTO_DOWNLOAD = os.environ.get("NLTK_AUTO_DOWNLOAD", "true").lower() == "true"
+
+_nltk_ready = None
+_nltk_lock = threading.Lock()
+
+# Parallel PDF extraction: documents with at least PDF_PARALLEL_MIN_PAGES pages
+# are split into page ranges and extracted on a process pool
+# (PDF_PARALLEL_WORKERS=0 means one worker per CPU, 1 disables it)
+PDF_PARALLEL_WORKERS = int(os.environ.get("PDF_PARALLEL_WORKERS", "0"))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", "100"))
+
+# Documents with at least LSA_SPARSE_MIN_SENTENCES sentences are summarized with
+# a sparse, truncated SVD (lsa.SparseLsaSummarizer) instead of sumy's dense one
+LSA_SPARSE_MIN_SENTENCES = int(os.environ.get("LSA_SPARSE_MIN_SENTENCES", "200"))
+
+# Documents of at least SUMMARY_CHUNK_MIN_CHARS characters are summarized per
+# section of about SUMMARY_CHUNK_CHARS (in parallel), then the section summaries
+# are summarized again (SUMMARY_CHUNK_WORKERS=0 means one process per CPU)
+SUMMARY_CHUNK_MIN_CHARS = int(os.environ.get("SUMMARY_CHUNK_MIN_CHARS", "200000"))
+SUMMARY_CHUNK_CHARS = int(os.environ.get("SUMMARY_CHUNK_CHARS", "20000"))
+SUMMARY_CHUNK_WORKERS = int(os.environ.get("SUMMARY_CHUNK_WORKERS", "0"))
+
+# Camera captures are converted to grayscale, deskewed, binarized and scaled down
+# to OCR_TARGET_DPI before OCR; pages taller than two OCR_TILE_HEIGHT bands are
+# split into bands recognized in parallel (OCR_WORKERS=0 means one per CPU)
+OCR_TARGET_DPI = int(os.environ.get("OCR_TARGET_DPI", "300"))
+OCR_TILE_HEIGHT = int(os.environ.get("OCR_TILE_HEIGHT", "1200"))
+OCR_WORKERS = int(os.environ.get("OCR_WORKERS", "0"))
+
+# Lines that start a new section: "ARTICLE 5", "Section 3.2 Payment", "7. TERMINATION", "SCHEDULE A"
+SECTION_HEADING = re.compile(
+    r'^[ \t]*(?:(?:ARTICLE|Article|SECTION|Section|SCHEDULE|Schedule|EXHIBIT|Exhibit|PART|Part)\s+[\dIVXLCA-Z][\w.]*'
+    r'|\d+(?:\.\d+)*\.?[ \t]+[A-Z][A-Z ,&\'-]{2,}$)[^\n]*',
+    re.MULTILINE
+)
+
+# Keyword tables for document type detection and clause explanations. They are
+# compiled into one KeywordAutomaton at import; keywords match as substrings of
+# the lowercased text, except document type keywords, which only count as whole
+# words ('rent' is not in 'current', 'service' is not counted again in 'services').
+DOCUMENT_TYPE_KEYWORDS = {
+    'Non-Disclosure Agreement': ['non-disclosure', 'nda', 'confidential', 'proprietary information'],
+    'Employment Agreement': ['employment', 'employee', 'employer', 'job', 'salary', 'benefits'],
+    'Service Agreement': ['service', 'services', 'provider', 'client', 'deliverables'],
+    'Purchase Agreement': ['purchase', 'buyer', 'seller', 'goods', 'merchandise'],
+    'License Agreement': ['license', 'licensing', 'intellectual property', 'software', 'patent'],
+    'Lease Agreement': ['lease', 'rent', 'tenant', 'landlord', 'property'],
+    'Partnership Agreement': ['partnership', 'partner', 'joint venture', 'collaboration'],
+    'Terms of Service': ['terms of service', 'terms and conditions', 'user agreement', 'website']
+}
+
+CLAUSE_STRUCTURE = {
+    'obligation': {
+        'patterns': ['shall', 'must', 'required', 'obligation', 'duty'],
+        'explanation': "This clause creates binding obligations - someone must do something."
+    },
+    'permission': {
+        'patterns': ['may', 'can', 'permitted', 'allowed'],
+        'explanation': "This clause grants permissions - someone is allowed to do something."
+    },
+    'prohibition': {
+        'patterns': ['shall not', 'cannot', 'prohibited', 'forbidden'],
+        'explanation': "This clause contains prohibitions - someone is forbidden from doing something."
+    },
+    'condition': {
+        'patterns': ['if', 'when', 'unless', 'provided that'],
+        'explanation': "This clause is conditional - it only applies under certain circumstances."
+    },
+    'time': {
+        'patterns': ['within', 'days', 'months', 'years', 'immediately'],
+        'explanation': "This clause has time-sensitive elements - specific deadlines or time periods apply."
+    }
+}
+
+# Checked in order; the first matching interpretation is used
+LEGAL_INTERPRETATIONS = {
+    'termination': {
+        'patterns': ['terminat', 'end', 'expir', 'dissolution'],
+        'explanation': "Termination Clause: This defines when and how the agreement can be ended. It typically specifies notice periods, conditions that trigger termination, and what happens to obligations after termination."
+    },
+    'confidentiality': {
+        'patterns': ['confidential', 'non-disclosure', 'proprietary', 'trade secret'],
+        'explanation': "Confidentiality Clause: This protects sensitive information by legally requiring parties to keep certain information secret and not share it with unauthorized parties."
+    },
+    'indemnification': {
+        'patterns': ['indemnif', 'hold harmless', 'defend'],
+        'explanation': "Indemnification Clause: This means one party agrees to protect and compensate the other party for certain types of losses, damages, or legal claims."
+    },
+    'liability': {
+        'patterns': ['liability', 'damages', 'responsible', 'liable'],
+        'explanation': "Liability Clause: This defines who is responsible for damages, losses, or injuries, and may limit or exclude certain types of liability."
+    },
+    'governing law': {
+        'patterns': ['governing law', 'jurisdiction', 'laws of'],
+        'explanation': "Governing Law Clause: This specifies which state's or country's laws will be used to interpret the agreement and which courts will handle disputes."
+    },
+    'force majeure': {
+        'patterns': ['force majeure', 'act of god', 'unforeseeable'],
+        'explanation': "Force Majeure Clause: This excuses performance when extraordinary circumstances beyond anyone's control (like natural disasters or wars) make it impossible to fulfill obligations."
+    },
+    'assignment': {
+        'patterns': ['assign', 'transfer', 'delegate'],
+        'explanation': "Assignment Clause: This controls whether and how the rights and obligations under the agreement can be transferred to another party."
+    },
+    'severability': {
+        'patterns': ['severab', 'invalid', 'unenforceable'],
+        'explanation': "Severability Clause: This ensures that if one part of the agreement is found to be invalid or unenforceable, the rest of the agreement remains in effect."
+    },
+    'amendment': {
+        'patterns': ['amend', 'modify', 'change'],
+        'explanation': "Amendment Clause: This specifies how changes to the agreement can be made, typically requiring written consent from all parties."
+    },
+    'dispute resolution': {
+        'patterns': ['dispute', 'arbitration', 'mediation', 'litigation'],
+        'explanation': "Dispute Resolution Clause: This establishes the process for resolving disagreements, which may include negotiation, mediation, arbitration, or court proceedings."
+    }
+}
+
+PRACTICAL_IMPLICATIONS = {
+    'financial': {
+        'patterns': ['payment', 'fee', 'cost', 'expense', 'penalty'],
+        'explanation': "This may have financial implications - money may need to be paid or penalties may apply."
+    },
+    'time': {
+        'patterns': ['within', 'days', 'deadline', 'immediately'],
+        'explanation': "This has time-sensitive requirements - failing to meet deadlines could have consequences."
+    },
+    'performance': {
+        'patterns': ['perform', 'deliver', 'complete', 'fulfill'],
+        'explanation': "This requires specific actions to be taken - failure to perform could result in breach of contract."
+    },
+    'risk': {
+        'patterns': ['liability', 'damages', 'loss', 'harm'],
+        'explanation': "This involves risk allocation - it determines who bears responsibility for potential problems."
+    },
+    'confidentiality': {
+        'patterns': ['confidential', 'secret', 'proprietary', 'disclose'],
+        'explanation': "This affects information sharing - unauthorized disclosure could have legal consequences."
+    }
+}
+
+KEYWORD_TABLES = {
+    'document_type': DOCUMENT_TYPE_KEYWORDS,
+    'clause_structure': {name: info['patterns'] for name, info in CLAUSE_STRUCTURE.items()},
+    'interpretation': {name: info['patterns'] for name, info in LEGAL_INTERPRETATIONS.items()},
+    'implication': {name: info['patterns'] for name, info in PRACTICAL_IMPLICATIONS.items()},
+}
+KEYWORDS = KeywordAutomaton(KEYWORD_TABLES, whole_words=('document_type',))
+
+
+@lru_cache(maxsize=None)
+def _import_optional(module_name):
+    """Import an optional dependency once; returns None when it is not installed"""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        return None
+
+
+def ensure_nltk_data(download=None):
+    """Check that the NLTK data used for summarization is installed.
+
+    The check runs once per process and the result is memoized. Missing
+    resources are downloaded at most once (unless NLTK_AUTO_DOWNLOAD is off).
+    Call with download=True at build time to prime the data directory.
+    """
+    global _nltk_ready
+    if _nltk_ready is not None and not download:
+        return _nltk_ready
+
+    with _nltk_lock:
+        if _nltk_ready is not None and not download:
+            return _nltk_ready
+
+        nltk = _import_optional('nltk')
+        if nltk is None:
+            _nltk_ready = False
+            return _nltk_ready
+
+        if download is None:
+            download = NLTK_AUTO_DOWNLOAD
+
+        missing = []
+        for name, path in NLTK_RESOURCES.items():
+            try:
+                nltk.data.find(path)
+            except LookupError:
+                missing.append(name)
+
+        for name in list(missing) if download else []:
+            try:
+                if nltk.download(name, quiet=True):
+                    missing.remove(name)
+            except Exception as e:
+                logging.warning(f"NLTK download warning: {e}")
+
+        if missing:
+            logging.warning(f"NLTK data unavailable, using fallback summarizer: {', '.join(missing)}")
+        _nltk_ready = not missing
+        return _nltk_ready
+
+
+@lru_cache(maxsize=None)
+def get_summarizer():
+    """Build the LSA summarizer on first use"""
+    from lsa import SparseLsaSummarizer
+    from sumy.nlp.stemmers import Stemmer
+    from sumy.utils import get_stop_words
+
+    summarizer = SparseLsaSummarizer(Stemmer(LANGUAGE), min_sentences=LSA_SPARSE_MIN_SENTENCES)
+    summarizer.stop_words = get_stop_words(LANGUAGE)
+    return summarizer
 
 def extract_text_from_file(filepath):
     """Extract text from PDF, DOCX, or TXT files"""
@@ -59,32 +257,101 @@ def extract_text_from_file(filepath):
     else:
         raise ValueError(f"Unsupported file type: {file_extension}")
 
-def extract_text_from_image(image_data):
-    """Extract text from image using OCR (Optical Character Recognition)"""
+def extract_text_from_bytes(data, filename):
+    """Extract text from an in-memory PDF, DOCX or TXT upload (no temporary file)"""
+    file_extension = filename.lower().split('.')[-1]
+
+    if file_extension == 'txt':
+        return decode_text_bytes(data)
+    elif file_extension == 'pdf':
+        return extract_text_from_pdf(data)
+    elif file_extension == 'docx':
+        return extract_text_from_docx(BytesIO(data))
+    else:
+        raise ValueError(f"Unsupported file type: {file_extension}")
+
+def extract_document(source, filename):
+    """Extract an upload (file path or in-memory bytes) for summarize_legal_document()
+
+    Returns a dict of summarize_legal_document() arguments: 'text',
+    'page_offsets' and 'key_clauses'. PDF pages, and TXT files on disk
+    chunk by chunk, go through the clause matcher as they are extracted
+    (identify_key_clauses_from_pages), so the clauses are found in the
+    extraction pass and not searched for again. PDF page start offsets let
+    chunked summaries cite page numbers. For other formats both are None
+    and the summarizer finds the clauses.
+    """
+    file_extension = filename.lower().split('.')[-1]
+    if file_extension == 'pdf':
+        pages, key_clauses = _extract_streamed(iter_pdf_text(source))
+        return {'text': ''.join(pages), 'page_offsets': page_start_offsets(pages), 'key_clauses': key_clauses}
+
+    if file_extension == 'txt' and isinstance(source, str):
+        chunks, key_clauses = _extract_streamed(iter_text_chunks(source))
+        return {'text': ''.join(chunks), 'page_offsets': None, 'key_clauses': key_clauses}
+
+    if isinstance(source, str):
+        text = extract_text_from_file(source)
+    else:
+        text = extract_text_from_bytes(source, filename)
+    return {'text': text, 'page_offsets': None, 'key_clauses': None}
+
+def _extract_streamed(pieces):
+    """(list of the pieces, key clauses found in them while they were read)"""
+    read = []
+
+    def recorded():
+        for piece in pieces:
+            read.append(piece)
+            yield piece
+
+    key_clauses = identify_key_clauses_from_pages(recorded())
+    return read, key_clauses
+
+def page_start_offsets(pages, separator=''):
+    """Character offset at which each page starts in separator.join(pages)"""
+    offsets = []
+    position = 0
+    for page in pages:
+        offsets.append(position)
+        position += len(page) + len(separator)
+    return offsets
+
+def extract_text_from_image(image_data, ocr_cache=None, cache_scope=None):
+    """Extract text from image using OCR (Optical Character Recognition)
+
+    With an ocr.OcrCache, text of an identical or near-identical image
+    (by perceptual hash) is returned without running OCR again.
+    """
+    Image = _import_optional('PIL.Image')
+    pytesseract = _import_optional('pytesseract')
     if Image is None or pytesseract is None:
         raise ImportError("PIL and pytesseract are required for image processing")
     
     try:
-        # Handle base64 image data
         if isinstance(image_data, str):
-            # Remove data URL prefix if present
-            if image_data.startswith('data:image'):
-                image_data = image_data.split(',')[1]
-            
-            # Decode base64
-            image_bytes = base64.b64decode(image_data)
-            image = Image.open(BytesIO(image_bytes))
-        else:
-            # Handle file path
-            image = Image.open(image_data)
+            # Handle base64 image data (legacy data URL form field)
+            image_data = BytesIO(decode_image_data(image_data))
+        elif isinstance(image_data, (bytes, bytearray)):
+            # Raw image bytes; BytesIO shares a bytes object instead of copying it
+            image_data = BytesIO(image_data)
+        # otherwise a file path or a seekable binary stream, handed to PIL as is
+        
+        def open_image():
+            if hasattr(image_data, 'seek'):
+                image_data.seek(0)
+            return Image.open(image_data)
         
-        # Convert to RGB if necessary
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
+        image_hash = None
+        if ocr_cache is not None:
+            image_hash = perceptual_hash(open_image())
+            cached_text = ocr_cache.get(image_hash, cache_scope)
+            if cached_text is not None:
+                return cached_text
+        image = open_image()
         
-        # Extract text using OCR with enhanced settings for legal documents
-        custom_config = r'--oem 3 --psm 6 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz.,;:!?()[]{}"-' + "'"
-        text = pytesseract.image_to_string(image, config=custom_config)
+        # Preprocess and OCR with enhanced settings for legal documents (see ocr.py)
+        text = recognize(image, target_dpi=OCR_TARGET_DPI, tile_height=OCR_TILE_HEIGHT, workers=OCR_WORKERS)
         
         # Clean up the extracted text
         text = re.sub(r'\n\s*\n', '\n\n', text)  # Remove excessive line breaks
@@ -94,44 +361,164 @@ def extract_text_from_image(image_data):
         if not text:
             raise Exception("No text could be extracted from the image")
         
+        if ocr_cache is not None:
+            ocr_cache.set(image_hash, text, cache_scope)
+        
         return text
         
     except Exception as e:
         raise Exception(f"Error extracting text from image: {str(e)}")
 
+def decode_image_data(image_data):
+    """Bytes of a base64 image string, with or without a data URL prefix"""
+    # decode from a view of the ASCII bytes instead of slicing off the prefix,
+    # which would copy the whole payload once more
+    raw = image_data.encode('ascii')
+    start = raw.find(b',') + 1 if image_data.startswith('data:') else 0
+    return binascii.a2b_base64(memoryview(raw)[start:])
+
+def image_data_size(image_data):
+    """Decoded size in bytes of a camera capture: raw bytes, a seekable stream or a base64 string"""
+    if isinstance(image_data, str):
+        start = image_data.find(',') + 1 if image_data.startswith('data:') else 0
+        return (len(image_data) - start) * 3 // 4 - image_data[-2:].count('=')
+    if isinstance(image_data, (bytes, bytearray)):
+        return len(image_data)
+    position = image_data.tell()
+    size = image_data.seek(0, os.SEEK_END)
+    image_data.seek(position)
+    return size
+
 def extract_text_from_txt(filepath):
-    """Extract text from TXT file"""
+    """Extract text from TXT file (UTF-8, UTF-16/32 or latin-1, sniffed once; see text_decoding.py)"""
+    with open_text(filepath) as file:
+        return file.read()
+
+def decode_text_bytes(data):
+    """Decode an in-memory TXT upload the same way as extract_text_from_txt"""
+    return decode_text(data)
+
+def _open_pdf(fitz, source):
+    """Open a PDF from a path or from in-memory bytes"""
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype='pdf')
+    return fitz.open(source)
+
+def iter_pdf_pages(source):
+    """Yield (page_number, text) for each page of a PDF (path or bytes), one page at a time"""
+    fitz = _import_optional('fitz')
+    if fitz is None:
+        raise ImportError("PyMuPDF is required for PDF processing")
+
     try:
-        with open(filepath, 'r', encoding='utf-8') as file:
-            return file.read()
-    except UnicodeDecodeError:
-        # Try with different encoding
-        with open(filepath, 'r', encoding='latin-1') as file:
-            return file.read()
-
-def extract_text_from_pdf(filepath):
-    """Extract text from PDF file using PyMuPDF"""
+        with _open_pdf(fitz, source) as doc:
+            for page in doc:
+                yield page.number + 1, page.get_text()
+    except Exception as e:
+        raise Exception(f"Error extracting text from PDF: {str(e)}")
+
+# bytes of the in-memory PDF a pool worker extracts from, set once per worker by _init_pdf_worker
+_worker_pdf = None
+
+def _init_pdf_worker(data):
+    global _worker_pdf
+    _worker_pdf = data
+
+def _extract_pdf_page_range(filepath, start, stop):
+    """Worker for parallel extraction: text of pages [start, stop) of a PDF
+    (filepath None means the in-memory PDF this worker was started with)"""
+    fitz = _import_optional('fitz')
+    with _open_pdf(fitz, _worker_pdf if filepath is None else filepath) as doc:
+        return [doc.load_page(page_num).get_text() for page_num in range(start, stop)]
+
+def _pdf_page_count(source):
+    fitz = _import_optional('fitz')
     if fitz is None:
         raise ImportError("PyMuPDF is required for PDF processing")
-    
-    text = ""
     try:
-        doc = fitz.open(filepath)
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text += page.get_text()
-        doc.close()
-        return text
+        with _open_pdf(fitz, source) as doc:
+            return doc.page_count
+    except Exception as e:
+        raise Exception(f"Error extracting text from PDF: {str(e)}")
+
+def extract_text_from_pdf(filepath, workers=None, min_pages=None):
+    """Extract text from PDF file (path or bytes) using PyMuPDF, see iter_pdf_text()"""
+    return ''.join(iter_pdf_text(filepath, workers, min_pages))
+
+def iter_pdf_text(source, workers=None, min_pages=None):
+    """Yield the text of every page of a PDF (path or bytes), in page order
+
+    Large documents are extracted in parallel across a process pool and
+    pages are yielded as their range completes; in-memory ones are sent to
+    each worker once, not with every page range. Smaller ones, or
+    workers=1, are read serially, one page at a time.
+    """
+    workers = PDF_PARALLEL_WORKERS if workers is None else workers
+    min_pages = PDF_PARALLEL_MIN_PAGES if min_pages is None else min_pages
+    workers = workers or os.cpu_count() or 1
+
+    if workers > 1:
+        page_count = _pdf_page_count(source)
+        if page_count >= min_pages:
+            yield from _iter_pdf_parallel(source, page_count, workers)
+            return
+
+    for _, text in iter_pdf_pages(source):
+        yield text
+
+def _process_pool(workers, initializer=None, initargs=()):
+    """Process pool whose workers do not inherit this process' threads.
+
+    Forking a gunicorn worker that already runs threads (audit log writer,
+    job and batch pools) can deadlock a child on a lock held by one of
+    them, so workers are started by a fork server (spawned on platforms
+    without one).
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method),
+                               initializer=initializer, initargs=initargs)
+
+def _iter_pdf_parallel(source, page_count, workers):
+    # a few ranges per worker keeps the pool busy when pages differ in cost
+    range_size = max(1, -(-page_count // (workers * 4)))
+    starts = list(range(0, page_count, range_size))
+    stops = [min(start + range_size, page_count) for start in starts]
+
+    if isinstance(source, str):
+        filepath, initializer, initargs = source, None, ()
+    else:
+        filepath, initializer, initargs = None, _init_pdf_worker, (bytes(source),)
+
+    try:
+        with _process_pool(min(workers, len(starts)), initializer, initargs) as pool:
+            # map() returns results in submission order, so pages stay in order
+            for page_texts in pool.map(_extract_pdf_page_range, [filepath] * len(starts), starts, stops):
+                yield from page_texts
     except Exception as e:
         raise Exception(f"Error extracting text from PDF: {str(e)}")
 
 def extract_text_from_docx(filepath):
-    """Extract text from DOCX file using python-docx"""
-    if Document is None:
+    """Extract text from DOCX file (path or file-like object), including tables, headers and footers
+
+    The XML parts are streamed straight out of the zip (docx_text); the
+    python-docx object model is only built if that fails.
+    """
+    try:
+        return docx_text(filepath)
+    except Exception as e:
+        logging.warning(f"Streaming DOCX extraction failed, falling back to python-docx: {str(e)}")
+        if hasattr(filepath, 'seek'):
+            filepath.seek(0)
+    
+    docx = _import_optional('docx')
+    if docx is None:
         raise ImportError("python-docx is required for DOCX processing")
     
     try:
-        doc = Document(filepath)
+        doc = docx.Document(filepath)
         text = ""
         for paragraph in doc.paragraphs:
             text += paragraph.text + "\n"
@@ -139,37 +526,54 @@ def extract_text_from_docx(filepath):
     except Exception as e:
         raise Exception(f"Error extracting text from DOCX: {str(e)}")
 
-def summarize_legal_document(text):
-    """Summarize legal document using enhanced extractive summarization"""
+def summarize_legal_document(text, page_offsets=None, key_clauses=None):
+    """Summarize legal document using enhanced extractive summarization
+
+    The text is parsed once (parsed_document.ParsedDocument) and the split is
+    shared by the summary, the document type and the key clause detection.
+    Key clauses already found while extracting (see extract_document) are
+    used as they are. Very long documents (SUMMARY_CHUNK_MIN_CHARS) are
+    summarized section by section, see summarize_legal_document_chunked().
+    """
+    document = parse_document(text)
+    text = document.text
     if not text.strip():
         raise Exception("No text provided for summarization")
+
+    if len(text) >= SUMMARY_CHUNK_MIN_CHARS:
+        try:
+            return summarize_legal_document_chunked(document, page_offsets=page_offsets, key_clauses=key_clauses)
+        except Exception as e:
+            logging.warning(f"Chunked summarization failed, summarizing in one pass: {e}")
     
     try:
         # Try advanced summarization first
         try:
-            nltk.download('punkt', quiet=True)
-            nltk.download('punkt_tab', quiet=True)
-            nltk.download('stopwords', quiet=True)
-            
+            if not ensure_nltk_data():
+                raise LookupError("NLTK tokenizer data is not installed")
+
+            from sumy.parsers.plaintext import PlaintextParser
+            from sumy.nlp.tokenizers import Tokenizer
+
             # Parse the text
             parser = PlaintextParser.from_string(text, Tokenizer(LANGUAGE))
             
             # Calculate appropriate sentence count based on document length
-            word_count = len(text.split())
-            sentence_count = max(3, min(8, word_count // 100))  # More precise scaling
+            sentence_count = summary_sentence_count(document)
             
-            summary_sentences = summarizer(parser.document, sentence_count)
+            summary_sentences = get_summarizer()(parser.document, sentence_count)
             summary_text = ' '.join([str(sentence) for sentence in summary_sentences])
             
             # Enhance summary with document type detection
-            summary_text = enhance_summary_with_context(summary_text, text)
+            summary_text = enhance_summary_with_context(summary_text, document)
             
         except Exception as e:
             logging.warning(f"SUMY summarization failed: {e}")
-            summary_text = create_intelligent_summary(text)
+            summary_text = create_intelligent_summary(document)
         
         # Identify key clauses with enhanced detection
-        key_clauses = identify_key_clauses_enhanced(text)
+        if key_clauses is None:
+            key_clauses = identify_key_clauses_enhanced(document)
         
         return {
             'summary': summary_text,
@@ -177,7 +581,149 @@ def summarize_legal_document(text):
         }
         
     except Exception as e:
-        return fallback_summarize(text)
+        return fallback_summarize(document, key_clauses)
+
+def summary_sentence_count(text):
+    """Number of summary sentences for a text (or ParsedDocument), scaled by its length"""
+    return max(3, min(8, parse_document(text).word_count // 100))  # More precise scaling
+
+def summary_sentences(text, sentence_count):
+    """Extract the best sentences of a text with sumy's LSA, or the keyword scorer without NLTK data"""
+    if not ensure_nltk_data():
+        return intelligent_summary_sentences(text, sentence_count)
+
+    from sumy.parsers.plaintext import PlaintextParser
+    from sumy.nlp.tokenizers import Tokenizer
+
+    parser = PlaintextParser.from_string(parse_document(text).text, Tokenizer(LANGUAGE))
+    return [str(sentence) for sentence in get_summarizer()(parser.document, sentence_count)]
+
+def split_sections(text, max_chars=None, page_offsets=None):
+    """Split a document into sections of at most about max_chars characters.
+
+    Sections start at headings (SECTION_HEADING); consecutive short sections
+    are merged and long ones are cut at paragraph breaks (or, failing that,
+    at whitespace). Each section is a dict with its index, first heading,
+    [start, end) character range and, when page_offsets (character offset at
+    which each page starts) is given, its first and last page number.
+    """
+    max_chars = max_chars or SUMMARY_CHUNK_CHARS
+
+    starts = [0] + [m.start() for m in SECTION_HEADING.finditer(text) if m.start() > 0] + [len(text)]
+    pieces = []
+    for start, end in zip(starts, starts[1:]):
+        line_end = text.find('\n', start, end)
+        title = text[start:line_end if line_end >= 0 else end].strip()
+        # long sections are cut at paragraph breaks, then at whitespace
+        while end - start > max_chars:
+            cut = text.rfind('\n\n', start + 1, start + max_chars)
+            if cut <= start:
+                cut = text.rfind(' ', start + 1, start + max_chars)
+            if cut <= start:
+                cut = start + max_chars
+            pieces.append((start, cut, title))
+            start = cut
+        pieces.append((start, end, title))
+
+    sections = []
+    for start, end, title in pieces:
+        if sections and end - sections[-1]['start'] <= max_chars:
+            sections[-1]['end'] = end
+            continue
+        sections.append({'index': len(sections), 'title': title or None, 'start': start, 'end': end})
+
+    if page_offsets:
+        for section in sections:
+            section['pages'] = [bisect_right(page_offsets, section['start']),
+                                bisect_right(page_offsets, max(section['end'] - 1, section['start']))]
+    return sections
+
+def _summarize_section(text):
+    """Worker for chunked summarization: summary sentences of one section"""
+    document = parse_document(text)
+    return summary_sentences(document, summary_sentence_count(document))
+
+def _init_summary_worker(nltk_ready):
+    """Pool initializer: take the parent's NLTK check instead of checking (and
+    possibly downloading, once per worker) again"""
+    global _nltk_ready
+    _nltk_ready = nltk_ready
+
+def _map_sections(texts, workers):
+    if workers <= 1 or len(texts) < 2:
+        return [_summarize_section(text) for text in texts]
+
+    with _process_pool(min(workers, len(texts)), _init_summary_worker, (ensure_nltk_data(),)) as pool:
+        # map() keeps section order
+        return list(pool.map(_summarize_section, texts))
+
+def _sentence_key(sentence):
+    """A sentence compared by its words: case, whitespace and the final full stop do not matter"""
+    return ' '.join(sentence.split()).rstrip('.').casefold()
+
+def _source(section):
+    source = {'section': section['index'], 'title': section['title'], 'start': section['start'], 'end': section['end']}
+    if 'pages' in section:
+        source['pages'] = section['pages']
+    return source
+
+def summarize_legal_document_chunked(text, page_offsets=None, max_chars=None, workers=None, key_clauses=None):
+    """Hierarchical (map-reduce) summary of a long document with section provenance.
+
+    The text is split into sections (split_sections), every section is
+    summarized on a process pool, and the concatenated section summaries are
+    summarized again. Besides 'summary' and 'key_clauses' (each clause gets a
+    'source'), the result has 'sections' and 'summary_sources', which tie
+    every summary sentence to the section it came from.
+    """
+    workers = SUMMARY_CHUNK_WORKERS if workers is None else workers
+    workers = workers or os.cpu_count() or 1
+    document = parse_document(text)
+    text = document.text
+
+    sections = split_sections(text, max_chars=max_chars, page_offsets=page_offsets)
+    section_sentences = _map_sections([text[s['start']:s['end']] for s in sections], workers)
+
+    # boilerplate repeated in many sections (page headers, recurring notices)
+    # is picked by each of them; it goes into the reduce step only once
+    origin = {}
+    for section, sentences in zip(sections, section_sentences):
+        for sentence in sentences:
+            origin.setdefault(_sentence_key(sentence), (section, sentence))
+
+    # reduce: summarize the section summaries down to the document's sentence count
+    nltk_ready = ensure_nltk_data()
+    separator = ' ' if nltk_ready else '. '
+    combined = separator.join(sentence for _, sentence in origin.values())
+    final_sentences = summary_sentences(combined, summary_sentence_count(document)) if combined else []
+
+    if not final_sentences:
+        summary_text = "Unable to generate summary from the provided text."
+    elif nltk_ready:
+        summary_text = enhance_summary_with_context(' '.join(final_sentences), document)
+    else:
+        summary_text = improve_readability('. '.join(final_sentences) + '.')
+
+    summary_sources = []
+    for sentence in final_sentences:
+        section, _ = origin.get(_sentence_key(sentence), (None, None))
+        summary_sources.append({'sentence': sentence, 'source': _source(section) if section else None})
+
+    section_starts = [section['start'] for section in sections]
+    if key_clauses is None:
+        key_clauses = identify_key_clauses_enhanced(document)
+    for clause in key_clauses:
+        first_sentence = clause['content'].split('. ', 1)[0].rstrip('.')
+        position = text.find(first_sentence)
+        if position >= 0:
+            clause['source'] = _source(sections[bisect_right(section_starts, position) - 1])
+
+    return {
+        'summary': summary_text,
+        'key_clauses': key_clauses,
+        'sections': [_source(section) for section in sections],
+        'summary_sources': summary_sources
+    }
 
 def identify_key_clauses(text):
     """Identify key legal clauses using pattern matching"""
@@ -245,26 +791,19 @@ def enhance_summary_with_context(summary_text, full_text):
     
     return summary_text
 
+def keyword_hits(text):
+    """Keyword counts per (table, category) of KEYWORD_TABLES, from one scan of text (or ParsedDocument)"""
+    return KEYWORDS.scan(parse_document(text).lowered)
+
 def detect_document_type(text):
-    """Detect the type of legal document"""
-    text_lower = text.lower()
-    
-    document_types = {
-        'Non-Disclosure Agreement': ['non-disclosure', 'nda', 'confidential', 'proprietary information'],
-        'Employment Agreement': ['employment', 'employee', 'employer', 'job', 'salary', 'benefits'],
-        'Service Agreement': ['service', 'services', 'provider', 'client', 'deliverables'],
-        'Purchase Agreement': ['purchase', 'buyer', 'seller', 'goods', 'merchandise'],
-        'License Agreement': ['license', 'licensing', 'intellectual property', 'software', 'patent'],
-        'Lease Agreement': ['lease', 'rent', 'tenant', 'landlord', 'property'],
-        'Partnership Agreement': ['partnership', 'partner', 'joint venture', 'collaboration'],
-        'Terms of Service': ['terms of service', 'terms and conditions', 'user agreement', 'website']
-    }
-    
-    for doc_type, keywords in document_types.items():
-        if any(keyword in text_lower for keyword in keywords):
-            return doc_type
-    
-    return "Legal Document"
+    """Detect the type of legal document (text or ParsedDocument)
+
+    The type whose keywords occur most often as whole words wins; ties go
+    to the type listed first in DOCUMENT_TYPE_KEYWORDS.
+    """
+    hits = keyword_hits(text)
+    best = max(DOCUMENT_TYPE_KEYWORDS, key=lambda doc_type: hits['document_type', doc_type])
+    return best if hits['document_type', best] else "Legal Document"
 
 def improve_readability(text):
     """Improve text readability and structure"""
@@ -281,198 +820,99 @@ def improve_readability(text):
     
     return text
 
-def create_intelligent_summary(text):
-    """Create an intelligent summary when SUMY fails"""
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
+def create_intelligent_summary(text, max_sentences=5, weights=None):
+    """Create an intelligent summary when SUMY fails
+
+    All sentences are scored in one batch (sentence_scorer); the best
+    `max_sentences` are kept in their original document order.
+    """
+    top_sentences = intelligent_summary_sentences(text, max_sentences, weights)
     
-    if not sentences:
+    if not top_sentences:
         return "Unable to generate summary from the provided text."
     
-    # Score sentences based on legal importance
-    scored_sentences = []
-    for sentence in sentences:
-        score = calculate_sentence_importance(sentence)
-        scored_sentences.append((sentence, score))
-    
-    # Sort by score and take top sentences
-    scored_sentences.sort(key=lambda x: x[1], reverse=True)
-    top_sentences = [sentence for sentence, score in scored_sentences[:5]]
-    
-    # Arrange in logical order if possible
     summary_text = '. '.join(top_sentences) + '.'
     
     return improve_readability(summary_text)
 
-def calculate_sentence_importance(sentence):
+def intelligent_summary_sentences(text, max_sentences=5, weights=None):
+    """The best-scoring sentences of a text (or ParsedDocument), in document order"""
+    document = parse_document(text)
+    sentences = document.sentence_texts(min_length=20)
+    
+    # Score sentences based on legal importance and take the top ones
+    scores = score_sentences(sentences, weights, lowered=document.lowered_sentence_texts(min_length=20))
+    return [sentences[i] for i in top_sentence_indexes(scores, max_sentences)]
+
+def calculate_sentence_importance(sentence, weights=None):
     """Calculate the importance score of a sentence for legal documents"""
-    importance_keywords = {
-        'high': ['agreement', 'party', 'shall', 'must', 'required', 'obligation', 'rights', 'liability'],
-        'medium': ['may', 'payment', 'termination', 'confidential', 'breach', 'damages'],
-        'low': ['including', 'such', 'other', 'any', 'all', 'each']
-    }
-    
-    sentence_lower = sentence.lower()
-    score = 0
-    
-    # High importance keywords
-    for keyword in importance_keywords['high']:
-        if keyword in sentence_lower:
-            score += 3
-    
-    # Medium importance keywords
-    for keyword in importance_keywords['medium']:
-        if keyword in sentence_lower:
-            score += 2
-    
-    # Low importance keywords (negative scoring)
-    for keyword in importance_keywords['low']:
-        if keyword in sentence_lower:
-            score -= 1
-    
-    # Bonus for sentence length (moderate length preferred)
-    word_count = len(sentence.split())
-    if 10 <= word_count <= 30:
-        score += 2
-    elif word_count < 5:
-        score -= 2
-    
-    return score
+    return float(score_sentences([sentence], weights)[0])
 
 def identify_key_clauses_enhanced(text):
-    """Enhanced key clause identification with better accuracy"""
-    clauses = []
-    
-    # More specific and comprehensive clause patterns
-    clause_patterns = {
-        'Termination': {
-            'patterns': [
-                r'terminat[ei].*?(?:agreement|contract)',
-                r'end.*?(?:agreement|contract)',
-                r'expir[ye].*?(?:agreement|contract)',
-                r'dissolution.*?(?:agreement|contract)'
-            ],
-            'description': 'Specifies conditions under which the agreement can be ended'
-        },
-        'Confidentiality': {
-            'patterns': [
-                r'confidential.*?information',
-                r'non-disclosure',
-                r'proprietary.*?information',
-                r'trade.*?secret',
-                r'disclose.*?information'
-            ],
-            'description': 'Protects sensitive information from being shared'
-        },
-        'Payment Terms': {
-            'patterns': [
-                r'payment.*?(?:due|terms|schedule)',
-                r'invoice.*?(?:payment|terms)',
-                r'compensation.*?(?:amount|terms)',
-                r'fee.*?(?:payment|schedule)',
-                r'remuneration'
-            ],
-            'description': 'Outlines payment obligations and schedules'
-        },
-        'Liability': {
-            'patterns': [
-                r'liability.*?(?:limited|excluded|damages)',
-                r'damages.*?(?:liable|responsible)',
-                r'indemnif[yi].*?(?:party|damages)',
-                r'responsible.*?(?:damages|loss)'
-            ],
-            'description': 'Defines responsibility for damages or losses'
-        },
-        'Governing Law': {
-            'patterns': [
-                r'governing.*?law',
-                r'jurisdiction.*?(?:court|law)',
-                r'laws.*?of.*?(?:state|country)',
-                r'legal.*?system'
-            ],
-            'description': 'Specifies which laws and courts have authority'
-        },
-        'Intellectual Property': {
-            'patterns': [
-                r'intellectual.*?property',
-                r'copyright.*?(?:ownership|rights)',
-                r'patent.*?(?:rights|ownership)',
-                r'trademark.*?(?:rights|ownership)',
-                r'proprietary.*?rights'
-            ],
-            'description': 'Addresses ownership of ideas and creative works'
-        }
-    }
-    
-    # Split text into paragraphs for better context
-    paragraphs = re.split(r'\n\s*\n', text)
-    
-    for clause_type, clause_info in clause_patterns.items():
-        for paragraph in paragraphs:
-            paragraph = paragraph.strip()
-            if len(paragraph) > 50:  # Ignore very short paragraphs
-                for pattern in clause_info['patterns']:
-                    if re.search(pattern, paragraph, re.IGNORECASE):
-                        # Extract relevant sentences from the paragraph
-                        sentences = re.split(r'[.!?]+', paragraph)
-                        relevant_sentences = []
-                        
-                        for sentence in sentences:
-                            sentence = sentence.strip()
-                            if len(sentence) > 20 and re.search(pattern, sentence, re.IGNORECASE):
-                                relevant_sentences.append(sentence)
-                        
-                        if relevant_sentences:
-                            clause_content = '. '.join(relevant_sentences[:2]) + '.'
-                            clauses.append({
-                                'type': clause_type,
-                                'content': clause_content,
-                                'explanation': clause_info['description']
-                            })
-                            break
-        
-        # Limit clauses to avoid overwhelming the user
-        if len(clauses) >= 8:
-            break
-    
-    return clauses
+    """Enhanced key clause identification with better accuracy
 
-def fallback_summarize(text):
+    Patterns live in clause_matcher.CLAUSE_PATTERNS and are compiled once at
+    import; the text is scanned in a single pass and split into sentences once.
+    """
+    return find_key_clauses(text)
+
+def identify_key_clauses_from_pages(pages):
+    """Key clause identification over streamed text, e.g. the output of iter_pdf_pages() or iter_text_chunks()"""
+    return find_key_clauses_in_chunks(
+        page[1] if isinstance(page, tuple) else page for page in pages
+    )
+
+def fallback_summarize(text, key_clauses=None):
     """Fallback summarization when all else fails"""
+    document = parse_document(text)
     try:
         return {
-            'summary': create_intelligent_summary(text),
-            'key_clauses': identify_key_clauses_enhanced(text)
+            'summary': create_intelligent_summary(document),
+            'key_clauses': identify_key_clauses_enhanced(document) if key_clauses is None else key_clauses
         }
     except Exception as e:
-        word_count = len(text.split())
+        word_count = document.word_count
         return {
             'summary': f"This legal document contains {word_count} words and appears to cover standard legal provisions. The document includes various clauses and terms that would benefit from professional legal review.",
             'key_clauses': []
         }
 
-def explain_legal_clause(clause_text):
-    """Provide intelligent, context-aware explanation of legal clauses"""
+def normalize_clause_text(clause_text):
+    """Lowercased clause text with whitespace runs collapsed; cached explanations are keyed on it"""
+    return ' '.join(clause_text.lower().split())
+
+def clause_analysis(clause_text):
+    """The part of a clause explanation that depends only on the normalized clause text"""
+    # One keyword scan shared by the three analyses below
+    hits = KEYWORDS.scan(normalize_clause_text(clause_text))
+    
+    # Analyze the clause structure and content
+    explanation = analyze_clause_structure(clause_text, hits)
+    
+    # Add specific interpretations based on legal patterns
+    specific_explanation = get_specific_legal_interpretation(clause_text, hits)
+    
+    # Combine general and specific explanations
+    if specific_explanation:
+        explanation = f"{specific_explanation}\n\n{explanation}"
+    
+    # Add practical implications
+    practical_impact = get_practical_implications(clause_text, hits)
+    if practical_impact:
+        explanation += f"\n\nPractical Impact: {practical_impact}"
+    
+    return explanation
+
+def explain_legal_clause(clause_text, analysis=None):
+    """Provide intelligent, context-aware explanation of legal clauses
+
+    `analysis` may pass a cached clause_analysis() result for this clause.
+    """
     if not clause_text.strip():
         raise Exception("No clause text provided")
     
     try:
-        clause_lower = clause_text.lower()
-        
-        # Analyze the clause structure and content
-        explanation = analyze_clause_structure(clause_text)
-        
-        # Add specific interpretations based on legal patterns
-        specific_explanation = get_specific_legal_interpretation(clause_text)
-        
-        # Combine general and specific explanations
-        if specific_explanation:
-            explanation = f"{specific_explanation}\n\n{explanation}"
-        
-        # Add practical implications
-        practical_impact = get_practical_implications(clause_text)
-        if practical_impact:
-            explanation += f"\n\nPractical Impact: {practical_impact}"
+        explanation = analysis if analysis is not None else clause_analysis(clause_text)
         
         # Add context about the clause content
         explanation += f"\n\nSpecific Clause Content: \"{clause_text[:300]}{'...' if len(clause_text) > 300 else ''}\""
@@ -485,117 +925,31 @@ def explain_legal_clause(clause_text):
     except Exception as e:
         raise Exception(f"Error explaining clause: {str(e)}")
 
-def analyze_clause_structure(clause_text):
+def analyze_clause_structure(clause_text, hits=None):
     """Analyze the structure and components of a legal clause"""
-    clause_lower = clause_text.lower()
-    
-    # Detect obligation words
-    obligation_words = ['shall', 'must', 'required', 'obligation', 'duty']
-    permission_words = ['may', 'can', 'permitted', 'allowed']
-    prohibition_words = ['shall not', 'cannot', 'prohibited', 'forbidden']
-    
-    analysis = []
+    hits = hits if hits is not None else keyword_hits(clause_text)
     
-    if any(word in clause_lower for word in obligation_words):
-        analysis.append("This clause creates binding obligations - someone must do something.")
-    
-    if any(word in clause_lower for word in permission_words):
-        analysis.append("This clause grants permissions - someone is allowed to do something.")
-    
-    if any(word in clause_lower for word in prohibition_words):
-        analysis.append("This clause contains prohibitions - someone is forbidden from doing something.")
-    
-    # Detect conditions
-    if any(word in clause_lower for word in ['if', 'when', 'unless', 'provided that']):
-        analysis.append("This clause is conditional - it only applies under certain circumstances.")
-    
-    # Detect time elements
-    if any(word in clause_lower for word in ['within', 'days', 'months', 'years', 'immediately']):
-        analysis.append("This clause has time-sensitive elements - specific deadlines or time periods apply.")
+    analysis = [info['explanation'] for component, info in CLAUSE_STRUCTURE.items() if hits['clause_structure', component]]
     
     if not analysis:
         return "This clause establishes terms and conditions that parties must follow."
     
     return ' '.join(analysis)
 
-def get_specific_legal_interpretation(clause_text):
+def get_specific_legal_interpretation(clause_text, hits=None):
     """Provide specific interpretations based on legal clause patterns"""
-    clause_lower = clause_text.lower()
-    
-    # Comprehensive legal term interpretations
-    interpretations = {
-        'termination': {
-            'patterns': ['terminat', 'end', 'expir', 'dissolution'],
-            'explanation': "Termination Clause: This defines when and how the agreement can be ended. It typically specifies notice periods, conditions that trigger termination, and what happens to obligations after termination."
-        },
-        'confidentiality': {
-            'patterns': ['confidential', 'non-disclosure', 'proprietary', 'trade secret'],
-            'explanation': "Confidentiality Clause: This protects sensitive information by legally requiring parties to keep certain information secret and not share it with unauthorized parties."
-        },
-        'indemnification': {
-            'patterns': ['indemnif', 'hold harmless', 'defend'],
-            'explanation': "Indemnification Clause: This means one party agrees to protect and compensate the other party for certain types of losses, damages, or legal claims."
-        },
-        'liability': {
-            'patterns': ['liability', 'damages', 'responsible', 'liable'],
-            'explanation': "Liability Clause: This defines who is responsible for damages, losses, or injuries, and may limit or exclude certain types of liability."
-        },
-        'governing law': {
-            'patterns': ['governing law', 'jurisdiction', 'laws of'],
-            'explanation': "Governing Law Clause: This specifies which state's or country's laws will be used to interpret the agreement and which courts will handle disputes."
-        },
-        'force majeure': {
-            'patterns': ['force majeure', 'act of god', 'unforeseeable'],
-            'explanation': "Force Majeure Clause: This excuses performance when extraordinary circumstances beyond anyone's control (like natural disasters or wars) make it impossible to fulfill obligations."
-        },
-        'assignment': {
-            'patterns': ['assign', 'transfer', 'delegate'],
-            'explanation': "Assignment Clause: This controls whether and how the rights and obligations under the agreement can be transferred to another party."
-        },
-        'severability': {
-            'patterns': ['severab', 'invalid', 'unenforceable'],
-            'explanation': "Severability Clause: This ensures that if one part of the agreement is found to be invalid or unenforceable, the rest of the agreement remains in effect."
-        },
-        'amendment': {
-            'patterns': ['amend', 'modify', 'change'],
-            'explanation': "Amendment Clause: This specifies how changes to the agreement can be made, typically requiring written consent from all parties."
-        },
-        'dispute resolution': {
-            'patterns': ['dispute', 'arbitration', 'mediation', 'litigation'],
-            'explanation': "Dispute Resolution Clause: This establishes the process for resolving disagreements, which may include negotiation, mediation, arbitration, or court proceedings."
-        }
-    }
+    hits = hits if hits is not None else keyword_hits(clause_text)
     
-    for term, info in interpretations.items():
-        if any(pattern in clause_lower for pattern in info['patterns']):
+    for term, info in LEGAL_INTERPRETATIONS.items():
+        if hits['interpretation', term]:
             return info['explanation']
     
     return None
 
-def get_practical_implications(clause_text):
+def get_practical_implications(clause_text, hits=None):
     """Explain the practical implications of a legal clause"""
-    clause_lower = clause_text.lower()
-    
-    implications = []
-    
-    # Financial implications
-    if any(word in clause_lower for word in ['payment', 'fee', 'cost', 'expense', 'penalty']):
-        implications.append("This may have financial implications - money may need to be paid or penalties may apply.")
-    
-    # Time implications
-    if any(word in clause_lower for word in ['within', 'days', 'deadline', 'immediately']):
-        implications.append("This has time-sensitive requirements - failing to meet deadlines could have consequences.")
-    
-    # Performance implications
-    if any(word in clause_lower for word in ['perform', 'deliver', 'complete', 'fulfill']):
-        implications.append("This requires specific actions to be taken - failure to perform could result in breach of contract.")
-    
-    # Risk implications
-    if any(word in clause_lower for word in ['liability', 'damages', 'loss', 'harm']):
-        implications.append("This involves risk allocation - it determines who bears responsibility for potential problems.")
+    hits = hits if hits is not None else keyword_hits(clause_text)
     
-    # Confidentiality implications
-    if any(word in clause_lower for word in ['confidential', 'secret', 'proprietary', 'disclose']):
-        implications.append("This affects information sharing - unauthorized disclosure could have legal consequences.")
+    implications = [info['explanation'] for kind, info in PRACTICAL_IMPLICATIONS.items() if hits['implication', kind]]
     
     return ' '.join(implications) if implications else None